@@ -7,10 +7,13 @@ for generating documentation for multiple AppDaemon automation files at once.
 
 import os
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterable
 
 from server.generators.doc_generator import AppDaemonDocGenerator
-from server.parsers.appdaemon_parser import parse_appdaemon_file
+from server.parsers.appdaemon_parser import AppDaemonParser, ParsedFile, default_parse_cache_dir, parse_appdaemon_file
+
+# Batches smaller than this are parsed in-process; worker start-up would outweigh the gain
+PARALLEL_PARSE_MIN_FILES = 8
 
 # NOTE: Shell-like paths (e.g., ~/appdaemon/apps) require expansion via os.path.expanduser()
 # or pathlib.Path.expanduser(). The server and dev runner should expand ~ and environment
@@ -32,6 +35,13 @@ class BatchDocGenerator:
         self.apps_dir = Path(apps_dir)
         self.docs_dir = Path(docs_dir)
         self.doc_generator = AppDaemonDocGenerator(str(self.docs_dir))
+        # Parse results persist across restarts so unchanged files skip AST analysis
+        self.parse_cache_dir = default_parse_cache_dir()
+        # Worker processes for parsing large batches: 0 = one per CPU, 1 = parse in-process only
+        try:
+            self.parse_workers = max(0, int(os.getenv("PARSE_WORKERS", "0")))
+        except ValueError:
+            self.parse_workers = 0
 
         # Ensure docs directory exists
         self.docs_dir.mkdir(parents=True, exist_ok=True)
@@ -80,19 +90,25 @@ class BatchDocGenerator:
 
         return sorted(automation_files)
 
-    def generate_single_file_docs(self, file_path: Path) -> tuple[str, bool]:
+    def generate_single_file_docs(self, file_path: Path, parser: AppDaemonParser | None = None) -> tuple[str, bool]:
         """
         Generate documentation for a single automation file.
 
         Args:
             file_path: Path to the Python automation file
+            parser: Optional parser to reuse (keeps apps.yaml and constant maps loaded)
 
         Returns:
             Tuple of (documentation_content, success_flag)
         """
         try:
             # Parse the file with apps.yaml context
-            parsed_file = parse_appdaemon_file(file_path, apps_yaml_path=self.apps_yaml_path)
+            if parser is None:
+                parsed_file = parse_appdaemon_file(
+                    file_path, apps_yaml_path=self.apps_yaml_path, cache_dir=self.parse_cache_dir
+                )
+            else:
+                parsed_file = parser.parse_file(file_path)
 
             # Generate documentation
             docs = self.doc_generator.generate_documentation(parsed_file)
@@ -107,6 +123,67 @@ class BatchDocGenerator:
 
             return error_msg, False
 
+    def prefetch_parses(self, file_paths: list[Path]) -> None:
+        """
+        Parse a large batch in worker processes ahead of generation.
+
+        Workers persist their results in the on-disk parse cache, so the
+        per-file generation that follows loads them instead of parsing each
+        file serially. This is best effort: any failure leaves the files to be
+        parsed in-process as usual.
+
+        Args:
+            file_paths: Paths to the Python automation files about to be generated
+        """
+        if self.parse_cache_dir is None or self.parse_workers == 1 or len(file_paths) < PARALLEL_PARSE_MIN_FILES:
+            return
+        try:
+            AppDaemonParser.parse_many(
+                file_paths,
+                apps_yaml_path=self.apps_yaml_path,
+                cache_dir=self.parse_cache_dir,
+                max_workers=self.parse_workers or None,
+            )
+        except Exception as e:
+            print(f"⚠️  Parallel parsing unavailable, parsing sequentially: {e}")
+
+    def parse_files(self, file_paths: list[Path]) -> dict[Path, ParsedFile | Exception]:
+        """
+        Parse a batch of files once, in worker processes when the batch is large.
+
+        Args:
+            file_paths: Paths to the Python automation files
+
+        Returns:
+            Dictionary mapping each file path to its parse result or the exception it raised
+        """
+        workers = self.parse_workers if len(file_paths) >= PARALLEL_PARSE_MIN_FILES else 1
+        options = {"apps_yaml_path": self.apps_yaml_path, "cache_dir": self.parse_cache_dir}
+        try:
+            results = AppDaemonParser.parse_many(file_paths, **options, max_workers=workers or None)
+        except Exception as e:
+            print(f"⚠️  Parallel parsing unavailable, parsing sequentially: {e}")
+            results = AppDaemonParser.parse_many(file_paths, **options, max_workers=1)
+        return dict(zip(file_paths, results, strict=True))
+
+    def generate_docs_for_files(self, file_paths: Iterable[Path]) -> dict[Path, tuple[str, bool]]:
+        """
+        Generate documentation for several automation files in one pass.
+
+        A single parser is shared across the batch so apps.yaml and imported
+        constant modules are loaded once instead of once per file.
+
+        Args:
+            file_paths: Paths to the Python automation files
+
+        Returns:
+            Dictionary mapping each file path to (documentation_content, success_flag)
+        """
+        file_paths = list(file_paths)
+        self.prefetch_parses(file_paths)
+        parser = AppDaemonParser(apps_yaml_path=self.apps_yaml_path, cache_dir=self.parse_cache_dir)
+        return {file_path: self.generate_single_file_docs(file_path, parser) for file_path in file_paths}
+
     def generate_all_docs(
         self, force_regenerate: bool = False, progress_callback: Callable[[int, int, str, str], None] | None = None
     ) -> dict[str, Any]:
@@ -133,6 +210,11 @@ class BatchDocGenerator:
 
         print(f"Found {len(automation_files)} automation files to process...")
 
+        if force_regenerate:
+            self.prefetch_parses(automation_files)
+        else:
+            self.prefetch_parses([f for f in automation_files if not (self.docs_dir / f"{f.stem}.md").exists()])
+
         for idx, file_path in enumerate(automation_files, 1):
             output_file = self.docs_dir / f"{file_path.stem}.md"
 
@@ -196,20 +278,19 @@ class BatchDocGenerator:
         index_content += "## Statistics\n\n"
         index_content += f"- **Total Automation Files**: {len(automation_files)}\n"
 
-        # Parse files to get statistics
+        # Parse every file once; the statistics and the file listing both read these results
+        parsed_files = self.parse_files(automation_files)
         total_classes = 0
         total_listeners = 0
         total_methods = 0
 
-        for file_path in automation_files:
-            try:
-                parsed_file = parse_appdaemon_file(file_path, apps_yaml_path=self.apps_yaml_path)
-                total_classes += len(parsed_file.classes)
-                for class_info in parsed_file.classes:
-                    total_listeners += len(class_info.state_listeners)
-                    total_methods += len([m for m in class_info.methods if m.name != "initialize"])
-            except Exception:
+        for parsed_file in parsed_files.values():
+            if isinstance(parsed_file, Exception):
                 continue
+            total_classes += len(parsed_file.classes)
+            for class_info in parsed_file.classes:
+                total_listeners += len(class_info.state_listeners)
+                total_methods += len([m for m in class_info.methods if m.name != "initialize"])
 
         index_content += f"- **Total Classes**: {total_classes}\n"
         index_content += f"- **Total State Listeners**: {total_listeners}\n"
@@ -263,14 +344,13 @@ class BatchDocGenerator:
                 title = self._format_title(file_path.stem)
 
                 # Try to get a brief description
-                try:
-                    parsed_file = parse_appdaemon_file(file_path, apps_yaml_path=self.apps_yaml_path)
-                    if parsed_file.classes and parsed_file.classes[0].docstring:
-                        description = parsed_file.classes[0].docstring.split("\n")[0]
-                    else:
-                        description = f"Automation for {title.lower()}"
-                except Exception:
+                parsed = parsed_files[file_path]
+                if isinstance(parsed, Exception):
                     description = "Automation module"
+                elif parsed.classes and parsed.classes[0].docstring:
+                    description = parsed.classes[0].docstring.split("\n")[0]
+                else:
+                    description = f"Automation for {title.lower()}"
 
                 index_content += f"- **[{title}]({doc_file})**: {description}\n"
 
@@ -6,33 +6,39 @@ markdown rendering, syntax highlighting, and responsive UI.
 """
 
 import asyncio
+import gzip
+import hashlib
 import html
-import json
 import logging
 import os
 import re
 import shutil
 import time
-from collections.abc import AsyncGenerator
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Callable, Iterator
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
+import orjson
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect, Query
-from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi_mcp import FastApiMCP
 from pygments import highlight
 from pygments.formatters import HtmlFormatter
 from pygments.lexers import PythonLexer
 from pydantic import BaseModel
-from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from starlette_compress import CompressMiddleware
 
 from server.generators.batch_doc_generator import BatchDocGenerator
 from server.processors.markdown import MarkdownProcessor
 from server.services.docs import DocumentationService
+from server.services.search_index import SearchIndex
 from server.utils.progress_callbacks import ProgressCallbackManager
 from server.utils.utils import (
     DirectoryStatus,
@@ -41,7 +47,7 @@ from server.utils.utils import (
     get_server_config,
     print_startup_info,
 )
-from server.watchers.file_watcher import FileWatcher, WatchConfig
+from server.watchers.file_watcher import FileWatcher, GenerationResult, WatchConfig
 from server.websocket.websocket_manager import EventType, WebSocketEvent, websocket_manager
 
 # Import resource module with Windows compatibility
@@ -58,39 +64,25 @@ load_dotenv()
 # Configure logging with environment variable support
 log_level = os.getenv("LOG_LEVEL", "info").upper()
 logging.basicConfig(level=getattr(logging, log_level, logging.INFO))
+# Log records never render thread/process fields, so skip looking them up per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-def validate_safe_path(user_input: str, base_dir: Path) -> Path | None:
-    """Validate that user input results in a safe path within base_dir.
 
-    Prevents path traversal attacks by using strict regex validation.
-    Only allows alphanumeric characters and underscores in filenames.
+# Whitelist for user-supplied module/file names; anchored and length-capped
+_SAFE_NAME_RE = re.compile(r"\A[A-Za-z0-9_]{1,128}\Z")
 
-    Args:
-        user_input: User-provided filename/path
-        base_dir: Base directory that file must be within
 
-    Returns:
-        Safe path if valid, None if potentially malicious
-    """
-    try:
-        # Strict validation: only allow alphanumeric characters and underscores
-        # This prevents all forms of path traversal including encoded attacks
-        if not re.fullmatch(r"[A-Za-z0-9_]+", user_input):
-            logger.warning(f"Invalid path input rejected: {user_input!r}")
-            return None
-
-        # Construct and resolve path within base directory
-        safe_path = (base_dir / user_input).resolve()
-        base_dir_resolved = base_dir.resolve()
-
-        # Ensure the path is within the base directory
-        safe_path.relative_to(base_dir_resolved)
-        return safe_path
-    except (ValueError, OSError) as e:
-        logger.warning(f"Path validation error for {user_input!r}: {e}")
-        return None
+def is_safe_name(user_input: str) -> bool:
+    """Return True if user input is a whitelisted module/file name; logs and returns False otherwise."""
+    if _SAFE_NAME_RE.match(user_input):
+        return True
+    logger.warning("Invalid path input rejected: %r", user_input)
+    return False
 
 
 def configure_resource_limits() -> dict[str, Any]:
@@ -122,7 +114,7 @@ def configure_resource_limits() -> dict[str, Any]:
                     "hard_limit": hard_limit,
                 }
             except OSError as e:
-                logger.warning(f"Could not increase file descriptor limit: {e}")
+                logger.warning("Could not increase file descriptor limit: %s", e)
                 limits_info["file_descriptors"] = {"current": soft_limit, "hard_limit": hard_limit, "error": str(e)}
         else:
             limits_info["file_descriptors"] = {"current": soft_limit, "hard_limit": hard_limit}
@@ -135,7 +127,7 @@ def configure_resource_limits() -> dict[str, Any]:
             limits_info["memory"] = "not_available"
 
     except Exception as e:
-        logger.error(f"Error configuring resource limits: {e}")
+        logger.error("Error configuring resource limits: %s", e)
         limits_info["error"] = str(e)
 
     return limits_info
@@ -160,7 +152,7 @@ def get_resource_usage() -> dict[str, Any]:
             "context_switches": getattr(usage, "ru_nvcsw", 0) + getattr(usage, "ru_nivcsw", 0),
         }
     except Exception as e:
-        logger.error(f"Error getting resource usage: {e}")
+        logger.error("Error getting resource usage: %s", e)
         return {"error": str(e)}
 
 
@@ -206,6 +198,9 @@ _is_development_env = os.getenv("APP_ENV", "production").lower() in {
 }
 EXPOSE_ABS_PATHS_IN_API: bool = _expose_paths_env and _is_development_env
 
+# Mirror app sources with shutil.copy2 (keeps source mtimes) instead of the hardlink/copyfile fast path
+MIRROR_PRESERVE_METADATA: bool = os.getenv("MIRROR_PRESERVE_METADATA", "false").lower() in {"1", "true", "yes", "on"}
+
 # Global components for startup integration
 file_watcher: FileWatcher | None = None
 startup_generation_completed = False
@@ -219,14 +214,182 @@ markdown_processor = MarkdownProcessor()
 
 # Documentation service instance
 docs_service = DocumentationService(DOCS_DIR, markdown_processor)
+search_index = SearchIndex()
 
 # Monotonic start timestamp for accurate uptime calculations
 START_TS: float = time.monotonic()
 
 
+# Pygments lexers carry no per-highlight state, so one instance serves every request
+_PY_LEXER = PythonLexer()
+APP_SOURCE_VIEWER_ID = "app-source-viewer"
+
+
+@lru_cache(maxsize=8)
+def _get_formatter(style_name: str) -> tuple[HtmlFormatter[str], str]:
+    """Return a cached HTML formatter for a Pygments style and its CSS scoped to the source viewer."""
+    formatter = HtmlFormatter(noclasses=False, style=style_name)
+    return formatter, formatter.get_style_defs(f"#{APP_SOURCE_VIEWER_ID} .highlight")
+
+
+# UI theme -> Pygments style, with the viewer-scoped CSS of each computed once at import
+_THEME_STYLES = {"light": "default", "dark": "monokai"}
+_SCOPED_CSS = {style_name: _get_formatter(style_name)[1] for style_name in _THEME_STYLES.values()}
+# Document page highlighting CSS is a fixed string, so build it (and its ETag) once
+_PYGMENTS_CSS = HtmlFormatter(style="default", noclasses=False).get_style_defs(".highlight").encode()
+_PYGMENTS_ETAG = f'"{hashlib.blake2b(_PYGMENTS_CSS, digest_size=8).hexdigest()}"'
+_PYGMENTS_CSS_GZ = gzip.compress(_PYGMENTS_CSS, 9)
+
+
+@lru_cache(maxsize=64)
+def _read_source(path_str: str, mtime_ns: int, size: int) -> bytes:
+    """Read a mirrored source file as raw bytes; keyed on mtime/size so edits produce a fresh entry."""
+    return Path(path_str).read_bytes()
+
+
+@lru_cache(maxsize=256)
+def _render_html(path_str: str, mtime_ns: int, size: int, style_name: str) -> str:
+    """Return the highlighted viewer HTML (without CSS) for a mirrored source file."""
+    formatter, _ = _get_formatter(style_name)
+    highlighted = highlight(_read_source(path_str, mtime_ns, size).decode("utf-8"), _PY_LEXER, formatter)
+    return f'<div id="{APP_SOURCE_VIEWER_ID}">{highlighted}</div>'
+
+
+def _iter_py(root: Path) -> Iterator[tuple[str, os.DirEntry[str]]]:
+    """Yield (relative path, DirEntry) for every .py file under root using a single scandir walk."""
+    stack: list[tuple[str, str]] = [(str(root), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{prefix}{entry.name}{os.sep}"))
+                    elif entry.name.endswith(".py") and entry.is_file():
+                        yield f"{prefix}{entry.name}", entry
+        except OSError:
+            continue
+
+
+# Module stem -> mirrored source path, rebuilt at startup and after file watcher callbacks
+MODULE_INDEX: dict[str, Path] = {}
+# Module stem -> [(relative path, size)] for every mirrored copy, in walk order
+APP_INDEX: dict[str, list[tuple[str, int]]] = {}
+# Rebuild at least this often so changes the watcher never reports (deletions, disabled watcher) show up
+MODULE_INDEX_TTL = 10.0
+_module_index_root: Path | None = None
+_module_index_built_at = 0.0
+# Bumped whenever a rebuild actually changes the index; keys caches derived from it
+_module_index_version = 0
+
+
+def rebuild_module_index() -> None:
+    """Rebuild MODULE_INDEX and APP_INDEX from a single walk of the mirrored apps directory."""
+    global _module_index_root, _module_index_built_at, _module_index_version
+
+    index: dict[str, Path] = {}
+    app_index: dict[str, list[tuple[str, int]]] = {}
+    root = MIRRORED_APPS_DIR
+    for rel, entry in _iter_py(root):
+        try:
+            size = entry.stat().st_size
+        except OSError:
+            continue
+        stem = entry.name[:-3]
+        app_index.setdefault(stem, []).append((rel, size))
+        current = index.get(stem)
+        # Prefer the shallowest file when the same stem exists at several depths
+        py = Path(entry.path)
+        if current is None or len(py.parts) < len(current.parts):
+            index[stem] = py
+
+    if index != MODULE_INDEX or app_index != APP_INDEX:
+        MODULE_INDEX.clear()
+        MODULE_INDEX.update(index)
+        APP_INDEX.clear()
+        APP_INDEX.update(app_index)
+        _module_index_version += 1
+    _module_index_root = root
+    _module_index_built_at = time.monotonic()
+
+
+def invalidate_module_index() -> None:
+    """Mark the module index stale so the next lookup rebuilds it."""
+    global _module_index_root
+    _module_index_root = None
+
+
+def _ensure_module_index() -> None:
+    """Rebuild the module index if it is stale, was built for another root, or is older than the TTL."""
+    if _module_index_root != MIRRORED_APPS_DIR or time.monotonic() - _module_index_built_at > MODULE_INDEX_TTL:
+        rebuild_module_index()
+
+
+def _find_shallowest(root: Path, filename: str) -> Path | None:
+    """Breadth-first scandir search for filename under root, stopping at the first level that has it."""
+    level = [str(root)]
+    while level:
+        next_level: list[str] = []
+        for directory in level:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            next_level.append(entry.path)
+                        elif entry.name == filename and entry.is_file():
+                            return Path(entry.path)
+            except OSError:
+                continue
+        level = next_level
+    return None
+
+
+def _find_module_source(safe_module: str) -> Path:
+    """Return the mirrored source path for a validated module stem."""
+    _ensure_module_index()
+    found = MODULE_INDEX.get(safe_module)
+    if found is not None:
+        return found
+    # Files mirrored after the last rebuild are found by a walk that stops at the shallowest match
+    filename = f"{safe_module}.py"
+    return _find_shallowest(MIRRORED_APPS_DIR, filename) or MIRRORED_APPS_DIR / filename
+
+
+SEARCH_INDEX_TTL = 5.0
+_search_index_root: Path | None = None
+_search_index_refreshed_at = 0.0
+
+
+def invalidate_search_index() -> None:
+    """Mark the search index stale so the next search rescans the docs directory."""
+    global _search_index_root
+    _search_index_root = None
+
+
+def _ensure_search_index() -> None:
+    """Refresh the search index if it is stale, was built for another root, or is older than the TTL."""
+    global _search_index_root, _search_index_refreshed_at
+    if _search_index_root != DOCS_DIR or time.monotonic() - _search_index_refreshed_at > SEARCH_INDEX_TTL:
+        search_index.refresh(DOCS_DIR)
+        _search_index_root = DOCS_DIR
+        _search_index_refreshed_at = time.monotonic()
+
+
+def _on_generation_result(result: GenerationResult) -> None:
+    """Keep the module index, app sources listing and search index in sync with files the watcher wrote."""
+    invalidate_module_index()
+    invalidate_app_sources_snapshot()
+    invalidate_search_index()
+
+
 def _format_elapsed(seconds: float) -> str:
     """Return a compact human-readable duration like '1d 2h 3m 4s'."""
-    total = int(seconds)
+    return _fmt_elapsed_int(int(seconds))
+
+
+@lru_cache(maxsize=1)
+def _fmt_elapsed_int(total: int) -> str:
+    """Format whole seconds; the string only changes once per second, so repeat polls hit the cache."""
     days, rem = divmod(total, 86400)
     hours, rem = divmod(rem, 3600)
     minutes, secs = divmod(rem, 60)
@@ -348,6 +511,7 @@ async def start_file_watcher(dir_status: DirectoryStatus, config: dict[str, Any]
 
         # Initialize and start file watcher
         watcher = FileWatcher(watch_config)
+        watcher.add_generation_callback(_on_generation_result)
         await watcher.start_watching()
 
         logger.info(
@@ -400,13 +564,88 @@ async def broadcast_startup_completion(
 
     # Log completion status
     if startup_errors:
-        logger.warning(f"⚠️ Server started with {len(startup_errors)} errors:")
+        logger.warning("⚠️ Server started with %s errors:", len(startup_errors))
         for error in startup_errors:
-            logger.warning(f"  - {error}")
+            logger.warning("  - %s", error)
     else:
         logger.info("🎉 Documentation server startup completed successfully")
 
 
+# Upper bound on concurrent mirror file operations (keeps open file descriptors in check)
+MIRROR_COPY_CONCURRENCY = 32
+
+
+def _fast_mirror(src: Path, dest: Path) -> None:
+    """Mirror src to dest with a hardlink on the same filesystem, else a content-only copy (sendfile)."""
+    dest.unlink(missing_ok=True)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
+
+def _copy_one(src: Path, dest: Path) -> bool:
+    """Copy a source file into the mirror; return True if copied."""
+    try:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if MIRROR_PRESERVE_METADATA:
+            shutil.copy2(src, dest)
+        else:
+            _fast_mirror(src, dest)
+        return True
+    except Exception as ce:
+        logger.debug(f"Skip copying {src}: {ce}")
+    return False
+
+
+def _py_mtimes(root: Path) -> dict[str, float]:
+    """Map relative path -> mtime for every .py file under root (one scandir walk)."""
+    mtimes: dict[str, float] = {}
+    for rel, entry in _iter_py(root):
+        try:
+            mtimes[rel] = entry.stat().st_mtime
+        except OSError:
+            continue
+    return mtimes
+
+
+def _plan_mirror_sync(source_root: Path, mirror_root: Path) -> tuple[list[Path], list[tuple[Path, Path]]]:
+    """Compare source and mirror mtimes in memory.
+
+    Returns:
+        Tuple of (stale mirror files to delete, (src, dest) pairs to copy). Files whose
+        mirrored copy is at least as new as the source are skipped entirely.
+    """
+    source_mtimes = _py_mtimes(source_root)
+    dest_mtimes = _py_mtimes(mirror_root)
+    stale = [mirror_root / rel for rel in dest_mtimes if rel not in source_mtimes]
+    pairs = [
+        (source_root / rel, mirror_root / rel)
+        for rel, src_mtime in source_mtimes.items()
+        if src_mtime > dest_mtimes.get(rel, float("-inf"))
+    ]
+    return stale, pairs
+
+
+def _unlink_stale(existing: Path) -> None:
+    """Remove a mirrored file whose source no longer exists."""
+    try:
+        existing.unlink()
+    except Exception as de:
+        logger.debug(f"Skip deleting stale mirror file {existing}: {de}")
+
+
+async def _run_in_threads(func: Callable[..., T], args_list: list[tuple[Any, ...]]) -> list[T]:
+    """Run func over each argument tuple in worker threads, at most MIRROR_COPY_CONCURRENCY at a time."""
+    semaphore = asyncio.Semaphore(MIRROR_COPY_CONCURRENCY)
+
+    async def run(args: tuple[Any, ...]) -> T:
+        async with semaphore:
+            return await asyncio.to_thread(func, *args)
+
+    return await asyncio.gather(*(run(args) for args in args_list))
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
@@ -454,122 +693,24 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
         # Copy AppDaemon source files for read-only viewing
         try:
-            # Performance optimization: quick mtime check on directory roots for large trees
-            skip_sync = False
-            try:
-                if REAL_APPS_DIR.exists() and MIRRORED_APPS_DIR.exists():
-                    # Get the newest mtime from the source directory (including subdirectories)
-                    source_newest_mtime = 0.0
-                    for root, dirs, files in os.walk(REAL_APPS_DIR):
-                        root_path = Path(root)
-                        try:
-                            root_mtime = root_path.stat().st_mtime
-                            source_newest_mtime = max(source_newest_mtime, root_mtime)
-                            # Check all Python files in this directory
-                            for file in files:
-                                if file.endswith(".py"):
-                                    file_path = root_path / file
-                                    try:
-                                        file_mtime = file_path.stat().st_mtime
-                                        source_newest_mtime = max(source_newest_mtime, file_mtime)
-                                    except (OSError, IOError):
-                                        # If we can't stat a file, force full sync
-                                        source_newest_mtime = float("inf")
-                                        break
-                        except (OSError, IOError):
-                            # If we can't stat the directory, force full sync
-                            source_newest_mtime = float("inf")
-                            break
-
-                        if source_newest_mtime == float("inf"):
-                            break
-
-                    # Get the oldest mtime from the mirrored directory (including subdirectories)
-                    mirror_oldest_mtime = float("inf")
-                    if source_newest_mtime != float("inf"):
-                        for root, dirs, files in os.walk(MIRRORED_APPS_DIR):
-                            root_path = Path(root)
-                            try:
-                                root_mtime = root_path.stat().st_mtime
-                                mirror_oldest_mtime = min(mirror_oldest_mtime, root_mtime)
-                                # Check all Python files in this directory
-                                for file in files:
-                                    if file.endswith(".py"):
-                                        file_path = root_path / file
-                                        try:
-                                            file_mtime = file_path.stat().st_mtime
-                                            mirror_oldest_mtime = min(mirror_oldest_mtime, file_mtime)
-                                        except (OSError, IOError):
-                                            # If we can't stat a file, force full sync
-                                            mirror_oldest_mtime = 0.0
-                                            break
-                            except (OSError, IOError):
-                                # If we can't stat the directory, force full sync
-                                mirror_oldest_mtime = 0.0
-                                break
-
-                            if mirror_oldest_mtime == 0.0:
-                                break
-
-                    # If mirror is newer than or equal to source, skip expensive recursive operations
-                    if (
-                        source_newest_mtime != float("inf")
-                        and mirror_oldest_mtime != float("inf")
-                        and mirror_oldest_mtime >= source_newest_mtime
-                    ):
-                        skip_sync = True
-                        logger.debug(
-                            f"Skipping app source sync - mirror is up to date (source: {source_newest_mtime}, mirror: {mirror_oldest_mtime})"
-                        )
-            except Exception as mtime_check_err:
-                logger.debug(f"Mtime optimization check failed, proceeding with full sync: {mtime_check_err}")
-                skip_sync = False
-
-            copied = 0
-            if not skip_sync:
-                # Create a clean mirror: remove files in APP_SOURCES_DIR that no longer exist in APPS_DIR
-                try:
-                    source_rel_paths = set()
-                    for s in REAL_APPS_DIR.rglob("*.py"):
-                        try:
-                            source_rel_paths.add(str(s.relative_to(REAL_APPS_DIR)))
-                        except ValueError:
-                            source_rel_paths.add(s.name)
-
-                    if MIRRORED_APPS_DIR.exists():
-                        for existing in MIRRORED_APPS_DIR.rglob("*.py"):
-                            rel_existing = str(existing.relative_to(MIRRORED_APPS_DIR))
-                            if rel_existing not in source_rel_paths:
-                                try:
-                                    existing.unlink()
-                                except Exception as de:
-                                    logger.debug(f"Skip deleting stale mirror file {existing}: {de}")
-                except Exception as cleanup_err:
-                    logger.debug(f"Mirror cleanup skipped due to error: {cleanup_err}")
-
-                for src in REAL_APPS_DIR.rglob("*.py"):
-                    # Preserve relative structure
-                    try:
-                        rel = src.relative_to(REAL_APPS_DIR)
-                    except ValueError:
-                        # If outside APPS_DIR (shouldn't happen), flatten
-                        rel = Path(src.name)
-                    dest = MIRRORED_APPS_DIR / rel
-                    dest.parent.mkdir(parents=True, exist_ok=True)
-                    # Always copy latest (overwrite if equal or newer)
-                    try:
-                        if not dest.exists() or src.stat().st_mtime >= dest.stat().st_mtime:
-                            shutil.copy2(src, dest)
-                            copied += 1
-                    except Exception as ce:
-                        logger.debug(f"Skip copying {src}: {ce}")
+            # One scandir walk per tree; unchanged files are skipped without touching them
+            stale, pairs = await asyncio.to_thread(_plan_mirror_sync, REAL_APPS_DIR, MIRRORED_APPS_DIR)
+
+            # Create a clean mirror: remove files in APP_SOURCES_DIR that no longer exist in APPS_DIR
+            await _run_in_threads(_unlink_stale, [(path,) for path in stale])
+
+            # Copies are I/O bound, so fan them out across worker threads
+            copied = sum(await _run_in_threads(_copy_one, pairs))
 
             status_msg = f"📄 Prepared {copied} AppDaemon source file(s) for read-only viewing"
-            if skip_sync:
+            if not stale and not pairs:
                 status_msg += " (optimized - no changes detected)"
             logger.info(status_msg)
         except Exception as copy_err:
-            logger.warning(f"Failed to prepare app sources for viewing: {copy_err}")
+            logger.warning("Failed to prepare app sources for viewing: %s", copy_err)
+
+        rebuild_module_index()
+        rebuild_app_sources_snapshot()
 
         # Run initial documentation generation
         startup_generation_completed = await run_initial_documentation_generation(dir_status, config)
@@ -586,7 +727,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         cleanup_task = asyncio.create_task(websocket_manager.periodic_cleanup_loop())
 
     except Exception as e:
-        logger.error(f"Critical startup error: {e}")
+        logger.error("Critical startup error: %s", e)
         startup_errors.append(f"Critical startup error: {str(e)}")
         raise
 
@@ -632,7 +773,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.info("Documentation server shutdown complete")
 
     except Exception as e:
-        logger.error(f"Error during shutdown: {e}")
+        logger.error("Error during shutdown: %s", e)
 
 
 # Initialize FastAPI app with proper configuration and lifespan
@@ -642,28 +783,58 @@ app = FastAPI(
     version=APP_VERSION,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
-# Add GZip compression for large responses
-app.add_middleware(GZipMiddleware, minimum_size=500)
+# Compress large responses, negotiating zstd/Brotli/gzip from Accept-Encoding.
+# Small payloads such as /health skip compression and gzip uses its fastest level.
+COMPRESS_MINIMUM_SIZE = 1000
+app.add_middleware(CompressMiddleware, minimum_size=COMPRESS_MINIMUM_SIZE, zstd_level=4, brotli_quality=4, gzip_level=1)
 
 
-# Basic security headers middleware (CSP allows CDN and inline for current templates)
-@app.middleware("http")  # type: ignore[misc]
-async def add_security_headers(request: Request, call_next: Any) -> Response:
-    response: Response = await call_next(request)
-    response.headers.setdefault(
-        "Content-Security-Policy",
-        "default-src 'self' https:; script-src 'self' 'unsafe-inline' https:; "
-        "style-src 'self' 'unsafe-inline' https:; img-src 'self' data: https:; connect-src 'self' ws: wss:",
-    )
-    response.headers.setdefault("X-Content-Type-Options", "nosniff")
-    response.headers.setdefault("X-Frame-Options", "DENY")
-    response.headers.setdefault("Referrer-Policy", "no-referrer")
-    return response
+# Basic security headers (CSP allows CDN and inline for current templates), pre-encoded for raw ASGI headers
+_SEC_HEADERS: list[tuple[bytes, bytes]] = [
+    (
+        b"content-security-policy",
+        b"default-src 'self' https:; script-src 'self' 'unsafe-inline' https:; "
+        b"style-src 'self' 'unsafe-inline' https:; img-src 'self' data: https:; connect-src 'self' ws: wss:",
+    ),
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"referrer-policy", b"no-referrer"),
+]
+
+
+class SecurityHeadersASGIMiddleware:
+    """Append security headers to every HTTP response unless the endpoint already set them.
+
+    Plain ASGI (no BaseHTTPMiddleware task/stream wrapping): it only touches the
+    http.response.start message.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                present = {name.lower() for name, _ in headers}
+                headers.extend(header for header in _SEC_HEADERS if header[0] not in present)
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+app.add_middleware(SecurityHeadersASGIMiddleware)
 
 
 # ----------------------
@@ -733,6 +904,25 @@ async def root() -> RedirectResponse:
     return RedirectResponse(url="/docs/", status_code=307)
 
 
+# Seconds a /health docs count is reused; monitors poll far less often than this
+HEALTH_DOCS_COUNT_TTL = 5.0
+# (timestamp, docs directory, count) of the last /health docs scan
+_health_cache: tuple[float, Path, int] | None = None
+
+
+def _count_docs() -> int:
+    """Count markdown files in DOCS_DIR, reusing the last count for HEALTH_DOCS_COUNT_TTL seconds."""
+    global _health_cache
+    now = time.monotonic()
+    if _health_cache is not None and _health_cache[1] == DOCS_DIR and now - _health_cache[0] < HEALTH_DOCS_COUNT_TTL:
+        return _health_cache[2]
+    # scandir name filter: no per-file stat and no intermediate list
+    with os.scandir(DOCS_DIR) as entries:
+        count = sum(1 for entry in entries if entry.name.endswith(".md"))
+    _health_cache = (now, DOCS_DIR, count)
+    return count
+
+
 @app.get("/health", operation_id="health", response_model=HealthResponse)  # type: ignore[misc]
 async def health_check() -> HealthResponse:
     """
@@ -749,9 +939,9 @@ async def health_check() -> HealthResponse:
 
     if docs_exists:
         try:
-            docs_count = len(list(DOCS_DIR.glob("*.md")))
+            docs_count = _count_docs()
         except Exception as e:
-            logger.warning(f"Error counting docs files: {e}")
+            logger.warning("Error counting docs files: %s", e)
 
     # Determine overall health status
     status = "healthy"
@@ -779,22 +969,127 @@ async def health_check() -> HealthResponse:
     )
 
 
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Return True when the request's If-None-Match header already names this ETag (weak comparison)."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def _gzip_variant(body: bytes) -> bytes | None:
+    """Precompress a cached body once; small bodies are left for the middleware to send as-is."""
+    return gzip.compress(body, 9) if len(body) >= COMPRESS_MINIMUM_SIZE else None
+
+
+def _accepts_gzip(request: Request) -> bool:
+    """Return True when the request's Accept-Encoding allows gzip."""
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _cached_body_response(
+    request: Request, body: bytes, body_gz: bytes | None, media_type: str, headers: dict[str, str]
+) -> Response:
+    """Send a cached body, using its precompressed gzip copy when the client accepts gzip."""
+    if body_gz is not None and _accepts_gzip(request):
+        return Response(
+            content=body_gz,
+            media_type=media_type,
+            headers={**headers, "Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def _doc_stems(files: list[dict[str, str | int]]) -> list[str]:
+    """Module stems of listed docs; the Path fallback is only built for entries without a stem."""
+    return [str(file.get("stem") or Path(str(file["name"])).stem) for file in files]
+
+
+# Last module categorization, keyed by (apps dir, apps.yaml mtime_ns, size, doc stems)
+_module_categories_cache: (
+    tuple[tuple[Path, int, int, tuple[str, ...]], tuple[frozenset[str], list[str], list[str], list[str]]] | None
+) = None
+
+
+def _module_categories(files: list[dict[str, str | int]]) -> tuple[frozenset[str], list[str], list[str], list[str]]:
+    """
+    Categorize listed docs into active/inactive modules, shared by the index page and the app-sources partial.
+
+    Args:
+        files: Documentation file listing
+
+    Returns:
+        Tuple of (active module set, sorted active, sorted inactive, sorted all module names)
+    """
+    global _module_categories_cache
+    stems = tuple(_doc_stems(files))
+    key: tuple[Path, int, int, tuple[str, ...]] | None
+    try:
+        stat = os.stat(REAL_APPS_DIR / "apps.yaml")
+        key = (REAL_APPS_DIR, stat.st_mtime_ns, stat.st_size, stems)
+    except OSError:
+        key = None
+    cached = _module_categories_cache
+    if key is not None and cached is not None and cached[0] == key:
+        return cached[1]
+
+    app_counts = count_active_apps(REAL_APPS_DIR, doc_stems=list(stems))
+    # Ensure we have valid lists
+    active = app_counts.get("active_modules", [])
+    inactive = app_counts.get("inactive_modules", [])
+    all_modules = app_counts.get("all_modules", [])
+    active = active if isinstance(active, list) else []
+    inactive = inactive if isinstance(inactive, list) else []
+    all_modules = all_modules if isinstance(all_modules, list) else []
+
+    result = (frozenset(active), sorted(active), sorted(inactive), sorted(all_modules))
+    if key is not None:
+        _module_categories_cache = (key, result)
+    return result
+
+
+def _docs_signature() -> str | None:
+    """Weak ETag for /api/files: docs directory signature plus apps.yaml mtime (module categorization)."""
+    docs_signature = docs_service.get_signature()
+    if docs_signature is None:
+        return None
+    try:
+        apps_yaml_mtime = (REAL_APPS_DIR / "apps.yaml").stat().st_mtime_ns
+    except OSError:
+        apps_yaml_mtime = 0
+    return f'W/"{docs_signature}-{apps_yaml_mtime:x}"'
+
+
 @app.get("/api/files", operation_id="list_files", response_model=FilesResponse)  # type: ignore[misc]
 async def list_documentation_files(
-    limit: int | None = Query(None, ge=1, le=1000), offset: int | None = Query(None, ge=0, le=100000)
-) -> FilesResponse:
+    request: Request,
+    limit: int | None = Query(None, ge=1, le=1000),
+    offset: int | None = Query(None, ge=0, le=100000),
+) -> Response:
     """
     List all available documentation files with metadata.
 
     Returns:
-        Dictionary containing file list and metadata
+        Dictionary containing file list and metadata (304 when the client's ETag is current)
     """
     try:
+        headers: dict[str, str] = {}
+        etag = _docs_signature()
+        if etag is not None:
+            headers = {"ETag": etag, "Cache-Control": "max-age=5"}
+            if _etag_matches(request, etag):
+                return Response(status_code=304, headers=headers)
+
         files = await docs_service.get_file_list()
         total = len(files)
 
         # Get module categorization for filtering
-        doc_stems = [str(file.get("stem", Path(str(file["name"])).stem)) for file in files]
+        doc_stems = _doc_stems(files)
         app_counts = count_active_apps(REAL_APPS_DIR, doc_stems=doc_stems)
 
         if offset is not None or limit is not None:
@@ -803,9 +1098,12 @@ async def list_documentation_files(
             files = files[start:end]
 
         # Ensure clients do not receive unexpected fields when optional ones are None
+        # (only the requested page is copied, never the whole listing)
         sanitized_files = [{k: v for k, v in f.items() if v is not None} for f in files]
 
-        return FilesResponse(
+        # The model is already built here, so hand orjson its dump instead of letting
+        # FastAPI re-validate it against response_model (which still documents the schema)
+        files_response = FilesResponse(
             files=sanitized_files,
             total_count=total,
             docs_available=DOCS_DIR.exists(),
@@ -822,8 +1120,9 @@ async def list_documentation_files(
                 "total_count": app_counts.get("total", 0),
             },
         )
+        return ORJSONResponse(content=files_response.model_dump(), headers=headers)
     except Exception as e:
-        logger.error(f"Error listing files: {e}")
+        logger.error("Error listing files: %s", e)
         raise HTTPException(status_code=500, detail="Error listing documentation files") from e
 
 
@@ -844,91 +1143,132 @@ async def get_file_content(filename: str) -> FileContentResponse:
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting file content for {filename}: {e}")
+        logger.error("Error getting file content for %s: %s", filename, e)
         raise HTTPException(status_code=500, detail="Error processing file content") from e
 
 
 @app.get("/api/app-source/{module}", operation_id="get_app_source")  # type: ignore[misc]
-async def get_app_source(module: str, fmt: str = Query("text"), theme: str = Query("light")) -> Response:
+async def get_app_source(
+    module: str, fmt: str = Query("text"), theme: str = Query("light"), css: str = Query("inline")
+) -> Response:
     """
     Return the read-only Python source file for a given module name (stem).
 
     Args:
         module: The module stem (without .py)
+        fmt: "text" for the raw source, "html" for a highlighted fragment
+        theme: "light" or "dark" highlighting for the html fragment
+        css: "inline" embeds the scoped CSS; "link" references the cacheable /static/pygments-{theme}.css
 
     Returns:
         Plain text response with the source code
     """
     try:
-        # Validate path to prevent traversal attacks
-        safe_path = validate_safe_path(module, MIRRORED_APPS_DIR)
-        if not safe_path:
+        # Validate the name to prevent traversal attacks; a whitelisted name is its own stem
+        if not is_safe_name(module):
             raise HTTPException(status_code=400, detail="Invalid module name")
 
-        # Construct path directly since validate_safe_path restricts to simple stems
-        safe_module = safe_path.stem
-        source_path = MIRRORED_APPS_DIR / f"{safe_module}.py"
-        if not source_path.exists():
-            raise HTTPException(status_code=404, detail=f"Source for '{module}' not found")
-
-        with open(source_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        safe_module = module
+        source_path = _find_module_source(safe_module)
+        try:
+            stat = source_path.stat()
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail=f"Source for '{module}' not found") from None
 
+        # Rendered output is cached per (file, mtime, size), so edits invalidate it implicitly
         if fmt == "html":
-            style_name = "default" if theme != "dark" else "monokai"
-            container_id = "app-source-viewer"
-            formatter = HtmlFormatter(noclasses=False, style=style_name)
-            # Scope style to this viewer only
-            scoped_css = formatter.get_style_defs(f"#{container_id} .highlight")
-            highlighted = highlight(content, PythonLexer(), formatter)
-            html_content = f'<style>{scoped_css}</style><div id="{container_id}">{highlighted}</div>'
-            return HTMLResponse(content=html_content)
-
-        return Response(content=content, media_type="text/plain; charset=utf-8")
+            theme = "dark" if theme == "dark" else "light"
+            style_name = _THEME_STYLES[theme]
+            html_content = _render_html(str(source_path), stat.st_mtime_ns, stat.st_size, style_name)
+            if css == "link":
+                css_tag = f'<link rel="stylesheet" href="/static/pygments-{theme}.css">'
+            else:
+                css_tag = f"<style>{_SCOPED_CSS[style_name]}</style>"
+            return HTMLResponse(content=css_tag + html_content)
+
+        # Plain text goes out as the file's bytes: no decode/encode round trip
+        raw = _read_source(str(source_path), stat.st_mtime_ns, stat.st_size)
+        return Response(content=raw, media_type="text/plain; charset=utf-8")
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error reading app source for {module}: {e}")
+        logger.error("Error reading app source for %s: %s", module, e)
         raise HTTPException(status_code=500, detail="Error reading app source") from e
 
 
-@app.get("/api/app-sources", operation_id="list_app_sources", response_model=AppSourceListResponse)  # type: ignore[misc]
-async def list_app_sources() -> AppSourceListResponse:
-    """List mirrored AppDaemon source files available for AI analysis."""
+# Cached /api/app-sources response; the mirror only changes at startup and through the file watcher
+_snapshot_lock = asyncio.Lock()
+_app_sources_snapshot: AppSourceListResponse | None = None
+_app_sources_snapshot_root: Path | None = None
+_app_sources_etag = ""
+_app_sources_body = b""
+
+
+def rebuild_app_sources_snapshot() -> AppSourceListResponse:
+    """Rebuild the cached app sources listing and its ETag from one walk of the mirror."""
+    global _app_sources_snapshot, _app_sources_snapshot_root, _app_sources_etag, _app_sources_body
+
+    root = MIRRORED_APPS_DIR
     apps: list[AppSourceInfo] = []
+    newest_mtime_ns = 0
     try:
-        if MIRRORED_APPS_DIR.exists():
-            for py in MIRRORED_APPS_DIR.rglob("*.py"):
-                rel = str(py.relative_to(MIRRORED_APPS_DIR))
-                info_kwargs: dict[str, Any] = {
-                    "module": py.stem,
-                    "rel_path": rel,
-                    "size": py.stat().st_size,
-                    "modified": py.stat().st_mtime,
-                }
-                if EXPOSE_ABS_PATHS_IN_API:
-                    info_kwargs["abs_path"] = str(py.resolve())
-                apps.append(AppSourceInfo(**info_kwargs))
+        for rel, entry in _iter_py(root):
+            # DirEntry caches its stat result, so size and mtime cost one syscall
+            stat = entry.stat()
+            newest_mtime_ns = max(newest_mtime_ns, stat.st_mtime_ns)
+            info_kwargs: dict[str, Any] = {
+                "module": entry.name[:-3],
+                "rel_path": rel,
+                "size": stat.st_size,
+                "modified": stat.st_mtime,
+            }
+            if EXPOSE_ABS_PATHS_IN_API:
+                info_kwargs["abs_path"] = str(Path(entry.path).resolve())
+            apps.append(AppSourceInfo(**info_kwargs))
 
         # Sort apps by module name for deterministic ordering
         apps.sort(key=lambda app: app.module)
     except Exception as e:
-        logger.warning(f"Error listing app sources: {e}")
-    return AppSourceListResponse(apps=apps, total_count=len(apps))
+        logger.warning("Error listing app sources: %s", e)
+
+    _app_sources_snapshot = AppSourceListResponse(apps=apps, total_count=len(apps))
+    _app_sources_snapshot_root = root
+    _app_sources_etag = f'W/"{len(apps):x}-{newest_mtime_ns:x}"'
+    # Serialize once per rebuild; requests send these bytes as-is
+    _app_sources_body = orjson.dumps(_app_sources_snapshot.model_dump())
+    return _app_sources_snapshot
+
+
+def invalidate_app_sources_snapshot() -> None:
+    """Drop the cached app sources listing so the next request rebuilds it."""
+    global _app_sources_snapshot
+    _app_sources_snapshot = None
+
+
+@app.get("/api/app-sources", operation_id="list_app_sources", response_model=AppSourceListResponse)  # type: ignore[misc]
+async def list_app_sources(request: Request) -> Response:
+    """List mirrored AppDaemon source files available for AI analysis."""
+    async with _snapshot_lock:
+        if _app_sources_snapshot is None or _app_sources_snapshot_root != MIRRORED_APPS_DIR:
+            await asyncio.to_thread(rebuild_app_sources_snapshot)
+        etag = _app_sources_etag
+        body = _app_sources_body
+
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @app.get("/api/app-source/raw/{module}", operation_id="get_app_source_raw", response_model=AppSourceContentResponse)  # type: ignore[misc]
 async def get_app_source_raw(module: str) -> AppSourceContentResponse:
     """Return raw app source content for AI/MCP consumption."""
     try:
-        # Validate path to prevent traversal attacks
-        safe_path = validate_safe_path(module, MIRRORED_APPS_DIR)
-        if not safe_path:
+        # Validate the name to prevent traversal attacks; a whitelisted name is its own stem
+        if not is_safe_name(module):
             raise HTTPException(status_code=400, detail="Invalid module name")
 
-        # Construct path directly since validate_safe_path restricts to simple stems
-        safe_module = safe_path.stem
-        source_path = MIRRORED_APPS_DIR / f"{safe_module}.py"
+        safe_module = module
+        source_path = _find_module_source(safe_module)
         if not source_path.exists():
             raise HTTPException(status_code=404, detail=f"Source for '{module}' not found")
         content = source_path.read_text(encoding="utf-8")
@@ -943,58 +1283,76 @@ async def get_app_source_raw(module: str) -> AppSourceContentResponse:
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error reading app source (raw) for {module}: {e}")
+        logger.error("Error reading app source (raw) for %s: %s", module, e)
         raise HTTPException(status_code=500, detail="Error reading app source") from e
 
 
+# (module index version, active modules) -> rendered fragment and its ETag
+_APP_SOURCES_HTML_CACHE: tuple[tuple[int, frozenset[str]], bytes, str, bytes | None] | None = None
+
+
+_APP_SOURCE_ROW = (
+    '<li class="py-2"><button class="text-left w-full hover:underline" onclick="window.openSourceViewer(\'{mod}\')">'
+    '<strong>{mod}.py</strong><div class="text-xs text-gray-500">{rel} • {size_kb} KB</div></button></li>'
+)
+
+
+def _render_app_sources_partial(active_modules: frozenset[str]) -> bytes:
+    """Render the configured app sources list fragment from the module index."""
+    apps = [
+        (mod, rel, f"{size / 1024:.1f}")
+        for mod, entries in APP_INDEX.items()
+        if not active_modules or mod in active_modules
+        for rel, size in entries
+    ]
+
+    apps.sort(key=lambda x: x[1])
+
+    # Simple HTML list fragment
+    html_parts = [
+        '<div class="p-2">',
+        '<div class="text-sm text-gray-500 mb-2">Configured Apps</div>',
+        '<ul class="divide-y divide-gray-200">',
+    ]
+    # Escape HTML content to prevent XSS attacks
+    html_parts.extend(
+        _APP_SOURCE_ROW.format(mod=html.escape(mod), rel=html.escape(rel), size_kb=size_kb)
+        for mod, rel, size_kb in apps
+    )
+    if not apps:
+        html_parts.append('<li class="py-2 text-sm text-gray-500">No configured apps found</li>')
+    html_parts.append("</ul></div>")
+    return "".join(html_parts).encode("utf-8")
+
+
 @app.get("/partials/app-sources", response_class=HTMLResponse)  # type: ignore[misc]
-async def partial_app_sources() -> HTMLResponse:
+async def partial_app_sources(request: Request) -> Response:
     """Return HTML fragment listing configured app sources (for HTMX)."""
+    global _APP_SOURCES_HTML_CACHE
     try:
-        active_modules = set()
+        active_modules: frozenset[str] = frozenset()
         try:
             files = await docs_service.get_file_list()
-            doc_stems = [str(file.get("stem", Path(str(file["name"])).stem)) for file in files]
-            app_counts = count_active_apps(REAL_APPS_DIR, doc_stems=doc_stems)
-            active_modules_value = app_counts.get("active_modules", [])
-            active_modules = set(active_modules_value if isinstance(active_modules_value, list) else [])
+            active_modules = _module_categories(files)[0]
         except Exception:
-            active_modules = set()
-
-        apps = []
-        if MIRRORED_APPS_DIR.exists():
-            for py in MIRRORED_APPS_DIR.rglob("*.py"):
-                try:
-                    mod = py.stem
-                    if active_modules and mod not in active_modules:
-                        continue
-                    rel = str(py.relative_to(MIRRORED_APPS_DIR))
-                    size_kb = f"{py.stat().st_size / 1024:.1f}"
-                    apps.append((mod, rel, size_kb))
-                except Exception:
-                    continue
-
-        apps.sort(key=lambda x: x[1])
-
-        # Simple HTML list fragment
-        html_parts = [
-            '<div class="p-2">',
-            '<div class="text-sm text-gray-500 mb-2">Configured Apps</div>',
-            '<ul class="divide-y divide-gray-200">',
-        ]
-        for mod, rel, size_kb in apps:
-            # Escape HTML content to prevent XSS attacks
-            escaped_mod = html.escape(mod)
-            escaped_rel = html.escape(rel)
-            html_parts.append(
-                f'<li class="py-2"><button class="text-left w-full hover:underline" onclick="window.openSourceViewer(\'{escaped_mod}\')"><strong>{escaped_mod}.py</strong><div class="text-xs text-gray-500">{escaped_rel} • {size_kb} KB</div></button></li>'
-            )
-        if not apps:
-            html_parts.append('<li class="py-2 text-sm text-gray-500">No configured apps found</li>')
-        html_parts.append("</ul></div>")
-        return HTMLResponse("".join(html_parts))
+            active_modules = frozenset()
+
+        # Served from the module index: no directory walk or per-file stat per request
+        _ensure_module_index()
+        key = (_module_index_version, active_modules)
+        cached = _APP_SOURCES_HTML_CACHE
+        if cached is None or cached[0] != key:
+            body = _render_app_sources_partial(active_modules)
+            etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            cached = _APP_SOURCES_HTML_CACHE = (key, body, etag, _gzip_variant(body))
+
+        _, body, etag, body_gz = cached
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=5"}
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return _cached_body_response(request, body, body_gz, "text/html; charset=utf-8", headers)
     except Exception as e:
-        logger.error(f"Error rendering app sources partial: {e}")
+        logger.error("Error rendering app sources partial: %s", e)
         raise HTTPException(status_code=500, detail="Error rendering partial") from e
 
 
@@ -1012,22 +1370,10 @@ async def documentation_index(request: Request) -> HTMLResponse:
     try:
         files = await docs_service.get_file_list()
 
-        # Get module categorization for active/inactive filtering
-        doc_stems = [str(file.get("stem", Path(str(file["name"])).stem)) for file in files]
-        app_counts = count_active_apps(REAL_APPS_DIR, doc_stems=doc_stems)
-
-        # Extract module lists for client-side filtering
-        active_modules = app_counts.get("active_modules", [])
-        inactive_modules = app_counts.get("inactive_modules", [])
-        all_modules = app_counts.get("all_modules", [])
-
-        # Ensure we have valid lists
-        active_modules = active_modules if isinstance(active_modules, list) else []
-        inactive_modules = inactive_modules if isinstance(inactive_modules, list) else []
-        all_modules = all_modules if isinstance(all_modules, list) else []
+        # Module categorization for active/inactive filtering, memoized on the stems and apps.yaml
+        active_modules_set, active_modules, inactive_modules, all_modules = _module_categories(files)
 
         # Default to showing only active modules initially (preserves current behavior)
-        active_modules_set = set(active_modules)
         filtered_files = [f for f in files if str(f.get("stem")) in active_modules_set]
 
         return templates.TemplateResponse(
@@ -1039,9 +1385,9 @@ async def documentation_index(request: Request) -> HTMLResponse:
                 "all_files": files,  # Provide all files for client-side filtering
                 "total_files": len(filtered_files),
                 # Provide module categorization for client-side filtering
-                "active_modules": sorted(active_modules),
-                "inactive_modules": sorted(inactive_modules),
-                "all_modules": sorted(all_modules),
+                "active_modules": active_modules,
+                "inactive_modules": inactive_modules,
+                "all_modules": all_modules,
                 # Provide counts for UI display
                 "active_count": len(active_modules),
                 "inactive_count": len(inactive_modules),
@@ -1049,12 +1395,17 @@ async def documentation_index(request: Request) -> HTMLResponse:
             },
         )
     except Exception as e:
-        logger.error(f"Error rendering documentation index: {e}")
+        logger.error("Error rendering documentation index: %s", e)
         raise HTTPException(status_code=500, detail="Error loading documentation index") from e
 
 
+# Rendered document pages keyed by (docs dir, requested name, markdown mtime_ns, size)
+DOC_PAGE_CACHE_SIZE = 32
+_doc_page_cache: OrderedDict[tuple[Path, str, int, int], tuple[bytes, str]] = OrderedDict()
+
+
 @app.get("/docs/{filename}", response_class=HTMLResponse)  # type: ignore[misc]
-async def documentation_file(request: Request, filename: str) -> HTMLResponse:
+async def documentation_file(request: Request, filename: str) -> Response:
     """
     Serve a specific documentation file with rendered markdown.
 
@@ -1066,26 +1417,151 @@ async def documentation_file(request: Request, filename: str) -> HTMLResponse:
         HTML response with rendered documentation
     """
     try:
-        html_content, title = await docs_service.get_file_content(filename)
-
-        return templates.TemplateResponse(
-            "document.html",
-            {
-                "request": request,
-                "title": title,
-                "content": html_content,
-                "filename": filename,
-            },
-        )
+        # Pages depend only on the markdown file and the name it was requested under
+        md_name = filename if filename.endswith(".md") else f"{filename}.md"
+        try:
+            stat = os.stat(DOCS_DIR / md_name)
+            cache_key: tuple[Path, str, int, int] | None = (DOCS_DIR, filename, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            cache_key = None
+
+        cached = _doc_page_cache.get(cache_key) if cache_key is not None else None
+        if cached is not None and cache_key is not None:
+            _doc_page_cache.move_to_end(cache_key)
+            body, etag = cached
+        else:
+            html_content, title = await docs_service.get_file_content(filename)
+            page = templates.TemplateResponse(
+                "document.html",
+                {
+                    "request": request,
+                    "title": title,
+                    "content": html_content,
+                    "filename": filename,
+                },
+            )
+            body = bytes(page.body)
+            etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            if cache_key is not None:
+                _doc_page_cache[cache_key] = (body, etag)
+                if len(_doc_page_cache) > DOC_PAGE_CACHE_SIZE:
+                    _doc_page_cache.popitem(last=False)
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(content=body, headers=headers)
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error rendering documentation file {filename}: {e}")
+        logger.error("Error rendering documentation file %s: %s", filename, e)
         raise HTTPException(status_code=500, detail="Error rendering documentation") from e
 
 
+SEARCH_RESULTS_CACHE_SIZE = 64
+_search_results_cache: OrderedDict[tuple[Path, int, str], list[dict[str, Any]]] = OrderedDict()
+
+
+_search_inflight: dict[tuple[Path, int, str], asyncio.Future[list[dict[str, Any]]]] = {}
+
+
+async def _build_search_results(cache_key: tuple[Path, int, str], query: str) -> list[dict[str, Any]]:
+    """Collect results for a query, cache them, and clear the in-flight entry however the build ends."""
+    try:
+        results = await _collect_search_results(query)
+        _search_results_cache[cache_key] = results
+        if len(_search_results_cache) > SEARCH_RESULTS_CACHE_SIZE:
+            _search_results_cache.popitem(last=False)
+        return results
+    finally:
+        _search_inflight.pop(cache_key, None)
+
+
+def _search_snippet(original_content: str, content: str, query: str) -> str:
+    """Escaped context around the first match of ``query``, with the match wrapped in ``<mark>``.
+
+    ``content`` is ``original_content`` lowercased. Its match offset is reused when lowering kept
+    the length; otherwise (e.g. "İ" lowers to two characters) the offsets would drift, so the
+    match is located case-insensitively in the original text instead.
+    """
+    if len(content) == len(original_content):
+        start_pos = content.find(query)
+        match_end = start_pos + len(query)
+    else:
+        found = re.search(re.escape(query), original_content, re.IGNORECASE)
+        if found is None:
+            return ""
+        start_pos, match_end = found.span()
+    if start_pos == -1:
+        return ""
+    context_start = max(0, start_pos - 100)
+    context_end = min(len(original_content), match_end + 100)
+    # Slice the original content to preserve case, escape each piece to prevent
+    # injection in the UI, and wrap the known match position instead of re-searching
+    # the escaped text (which could hit inside an entity such as "&amp;")
+    before = html.escape(original_content[context_start:start_pos].lstrip())
+    match = html.escape(original_content[start_pos:match_end])
+    after = html.escape(original_content[match_end:context_end].rstrip())
+    return f"{before}<mark>{match}</mark>{after}"
+
+
+async def _collect_search_results(query: str) -> list[dict[str, Any]]:
+    """
+    Match a lowercased query against the search index and build ranked results with context snippets.
+
+    Args:
+        query: Lowercased, stripped search query
+
+    Returns:
+        Result dictionaries sorted by relevance
+    """
+    results: list[dict[str, Any]] = []
+    candidates = {doc.path.name: doc for doc in search_index.candidates(query)}
+    # Title matches do not depend on the content, so check every indexed stem
+    for doc in search_index.documents():
+        if doc.path.name not in candidates and query in doc.path.stem.lower().replace("_", " ").replace("-", " "):
+            candidates[doc.path.name] = doc
+
+    for doc in candidates.values():
+        file_path = doc.path
+        try:
+            original_content = doc.content
+            content = doc.lowered
+
+            # Calculate relevance score
+            title_match = query in file_path.stem.lower().replace("_", " ").replace("-", " ")
+            content_matches = content.count(query)
+
+            if title_match or content_matches > 0:
+                # Extract context around matches
+                context = _search_snippet(original_content, content, query) if content_matches > 0 else ""
+
+                title = await docs_service.extract_title(file_path)
+
+                # Calculate relevance score
+                relevance = (10 if title_match else 0) + content_matches
+
+                results.append({
+                    "filename": file_path.name,
+                    "stem": file_path.stem,
+                    "title": title,
+                    "matches": content_matches,
+                    "relevance": relevance,
+                    "context": context[:200] + "..." if len(context) > 200 else context,
+                    "url": f"/docs/{file_path.stem}",
+                })
+
+        except Exception as e:
+            logger.warning("Error searching file %s: %s", file_path, e)
+            continue
+
+    # Sort by relevance (title matches first, then by number of content matches)
+    results.sort(key=lambda x: int(x["relevance"]) if isinstance(x["relevance"], (int, float)) else 0, reverse=True)
+    return results
+
+
 @app.get("/api/search", operation_id="search_docs")  # type: ignore[misc]
-async def search_documentation(q: str = Query("", max_length=500)) -> dict[str, list[dict[str, Any]] | str | int]:
+async def search_documentation(q: str = Query("", max_length=500)) -> Response:
     """
     Search through documentation content for matching files.
 
@@ -1093,106 +1569,88 @@ async def search_documentation(q: str = Query("", max_length=500)) -> dict[str,
         q: Search query string
 
     Returns:
-        Dictionary containing search results and metadata
+        JSON response containing search results and metadata
     """
     if not q or len(q.strip()) < 2:
-        return {
+        return ORJSONResponse({
             "query": q,
             "results": [],
             "total_results": 0,
             "message": "Search query must be at least 2 characters long",
-        }
+        })
 
     try:
         query = q.strip().lower()
-        results = []
 
         if not DOCS_DIR.exists():
-            return {"query": q, "results": [], "total_results": 0, "message": "Documentation directory not found"}
-
-        for file_path in DOCS_DIR.glob("*.md"):
-            try:
-                with open(file_path, encoding="utf-8") as f:
-                    original_content = f.read()
-                    content = original_content.lower()
-
-                # Calculate relevance score
-                title_match = query in file_path.stem.lower().replace("_", " ").replace("-", " ")
-                content_matches = content.count(query)
-
-                if title_match or content_matches > 0:
-                    # Extract context around matches
-                    context = ""
-                    if content_matches > 0:
-                        # Find first occurrence and extract surrounding context
-                        start_pos = content.find(query)
-                        if start_pos != -1:
-                            context_start = max(0, start_pos - 100)
-                            context_end = min(len(content), start_pos + len(query) + 100)
-                            # Extract from original content to preserve case
-                            raw = original_content[context_start:context_end].strip()
-                            # Escape HTML to prevent injection in UI
-                            escaped = html.escape(raw)
-                            # Highlight the search term using case-insensitive regex on first occurrence
-                            pattern = re.escape(query)
-                            context = re.sub(
-                                f"({pattern})",
-                                r"<mark>\1</mark>",
-                                escaped,
-                                count=1,  # Only highlight first occurrence
-                                flags=re.IGNORECASE,
-                            )
-
-                    title = await docs_service.extract_title(file_path)
-
-                    # Calculate relevance score
-                    relevance = (10 if title_match else 0) + content_matches
-
-                    results.append({
-                        "filename": file_path.name,
-                        "stem": file_path.stem,
-                        "title": title,
-                        "matches": content_matches,
-                        "relevance": relevance,
-                        "context": context[:200] + "..." if len(context) > 200 else context,
-                        "url": f"/docs/{file_path.stem}",
-                    })
-
-            except Exception as e:
-                logger.warning(f"Error searching file {file_path}: {e}")
-                continue
-
-        # Sort by relevance (title matches first, then by number of content matches)
-        results.sort(key=lambda x: int(x["relevance"]) if isinstance(x["relevance"], (int, float)) else 0, reverse=True)
+            return ORJSONResponse({
+                "query": q,
+                "results": [],
+                "total_results": 0,
+                "message": "Documentation directory not found",
+            })
+
+        _ensure_search_index()
+        # Snippets and titles only change with the indexed files, so repeat queries reuse the built results
+        cache_key = (DOCS_DIR, search_index.version, query)
+        results = _search_results_cache.get(cache_key)
+        if results is None:
+            # Concurrent identical queries share one in-flight build
+            task = _search_inflight.get(cache_key)
+            if task is None:
+                task = asyncio.ensure_future(_build_search_results(cache_key, query))
+                _search_inflight[cache_key] = task
+            # Shielded so a disconnecting client does not cancel the build for the others
+            results = await asyncio.shield(task)
+        else:
+            _search_results_cache.move_to_end(cache_key)
 
-        return {
+        return ORJSONResponse({
             "query": q,
             "results": results,
             "total_results": len(results),
             "message": f"Found {len(results)} result(s) for '{q}'",
-        }
+        })
 
     except Exception as e:
-        logger.error(f"Error performing search: {e}")
+        logger.error("Error performing search: %s", e)
         raise HTTPException(status_code=500, detail="Error performing search") from e
 
 
 @app.get("/api/css/pygments.css")  # type: ignore[misc]
-async def pygments_css() -> Response:
+async def pygments_css(request: Request) -> Response:
     """
-    Generate Pygments CSS for syntax highlighting.
+    Serve the precomputed Pygments CSS for syntax highlighting.
+
+    Args:
+        request: FastAPI request object
 
     Returns:
-        CSS response with syntax highlighting styles
+        CSS response with syntax highlighting styles, or 304 if the client copy is current
     """
-    try:
-        formatter = HtmlFormatter(style="default", noclasses=False)
-        css_content = formatter.get_style_defs(".highlight")
+    headers = {"ETag": _PYGMENTS_ETAG, "Cache-Control": "public, max-age=86400"}
+    if _etag_matches(request, _PYGMENTS_ETAG):
+        return Response(status_code=304, headers=headers)
+    return _cached_body_response(request, _PYGMENTS_CSS, _PYGMENTS_CSS_GZ, "text/css; charset=utf-8", headers)
 
-        return Response(content=css_content, media_type="text/css", headers={"Cache-Control": "public, max-age=3600"})
-    except Exception as e:
-        logger.error(f"Error generating Pygments CSS: {e}")
-        raise HTTPException(status_code=500, detail="Error generating CSS") from e
+
+@app.get("/static/pygments-{theme}.css")  # type: ignore[misc]
+async def pygments_theme_css(theme: str) -> Response:
+    """
+    Serve the source-viewer highlighting CSS for a theme so browsers can cache it.
+
+    Args:
+        theme: "light" or "dark"
+
+    Returns:
+        CSS response scoped to the app source viewer
+    """
+    style_name = _THEME_STYLES.get(theme)
+    if style_name is None:
+        raise HTTPException(status_code=404, detail=f"Unknown theme '{theme}'")
+    return Response(
+        content=_SCOPED_CSS[style_name], media_type="text/css", headers={"Cache-Control": "public, max-age=86400"}
+    )
 
 
 # WebSocket Routes
@@ -1223,11 +1681,40 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
     except WebSocketDisconnect:
         logger.debug("WebSocket client disconnected")
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
     finally:
         await websocket_manager.disconnect(websocket)
 
 
+SSE_BATCH_SIZE = 32
+
+
+async def _next_sse_chunk(queue: asyncio.Queue[dict[str, Any]]) -> bytes:
+    """
+    Wait for the next event, then coalesce whatever else is already queued into one write.
+
+    Args:
+        queue: SSE subscriber queue
+
+    Returns:
+        Up to SSE_BATCH_SIZE framed events as a single chunk
+    """
+    batch = [await queue.get()]
+    while len(batch) < SSE_BATCH_SIZE:
+        try:
+            batch.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    return b"".join(
+        b"event: "
+        + event.get("event_type", "message").encode()
+        + b"\ndata: "
+        + orjson.dumps(event, option=orjson.OPT_NON_STR_KEYS)
+        + b"\n\n"
+        for event in batch
+    )
+
+
 @app.get("/sse", include_in_schema=False)  # type: ignore[misc]
 async def sse_endpoint() -> StreamingResponse:
     """
@@ -1240,15 +1727,10 @@ async def sse_endpoint() -> StreamingResponse:
     async def event_stream() -> AsyncGenerator[bytes, None]:
         try:
             # Initial hello
-            yield b"event: system_status\n"
-            yield b'data: {"message": "SSE connected"}\n\n'
+            yield b'event: system_status\ndata: {"message": "SSE connected"}\n\n'
 
             while True:
-                event = await queue.get()
-                data = json.dumps(event).encode()
-                # Optional: include event name
-                yield b"event: " + event.get("event_type", "message").encode() + b"\n"
-                yield b"data: " + data + b"\n\n"
+                yield await _next_sse_chunk(queue)
         except asyncio.CancelledError:
             pass
         finally:
@@ -1274,51 +1756,51 @@ async def sse_head() -> Response:
 
 
 @app.get("/api/ws/status", operation_id="ws_status")  # type: ignore[misc]
-async def websocket_status() -> dict[str, Any]:
+async def websocket_status() -> Response:
     """
     Get WebSocket connection status and statistics.
 
     Returns:
-        Dictionary containing connection information and statistics
+        JSON response containing connection information and statistics
     """
     try:
         connection_info = websocket_manager.get_connection_info()
-        return {
+        return ORJSONResponse({
             "status": "active",
             "websocket_enabled": True,
             "connection_info": connection_info,
-        }
+        })
     except Exception as e:
-        logger.error(f"Error getting WebSocket status: {e}")
+        logger.error("Error getting WebSocket status: %s", e)
         raise HTTPException(status_code=500, detail="Error getting WebSocket status") from e
 
 
 @app.get("/api/watcher/status", operation_id="watcher_status")  # type: ignore[misc]
-async def watcher_status() -> dict[str, Any]:
+async def watcher_status() -> Response:
     """
     Get file watcher status and statistics.
 
     Returns:
-        Dictionary containing watcher information and statistics
+        JSON response containing watcher information and statistics
     """
     global file_watcher
 
     try:
         if file_watcher is None:
-            return {
+            return ORJSONResponse({
                 "status": "disabled",
                 "message": "File watcher not initialized",
                 "is_watching": False,
-            }
+            })
 
         status = file_watcher.get_status()
-        return {
+        return ORJSONResponse({
             "status": "active" if status["is_watching"] else "stopped",
             "watcher_info": status,
-        }
+        })
 
     except Exception as e:
-        logger.error(f"Error getting watcher status: {e}")
+        logger.error("Error getting watcher status: %s", e)
         raise HTTPException(status_code=500, detail="Error getting watcher status") from e
 
 
@@ -1382,7 +1864,7 @@ async def trigger_full_generation(force: bool = False) -> dict[str, Any]:
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in manual generation: {e}")
+        logger.error("Error in manual generation: %s", e)
 
         await websocket_manager.broadcast_batch_status(
             EventType.BATCH_ERROR, f"Manual generation failed: {str(e)}", {"error": str(e)}
@@ -1476,7 +1958,7 @@ async def trigger_single_file_generation(filename: str, force: bool = False) ->
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in single file generation: {e}")
+        logger.error("Error in single file generation: %s", e)
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}") from e
 
 
@@ -1526,7 +2008,7 @@ async def broadcast_test_message(message: str = "Test message") -> dict[str, Any
             "total_connections": websocket_manager.get_connection_count(),
         }
     except Exception as e:
-        logger.error(f"Error broadcasting test message: {e}")
+        logger.error("Error broadcasting test message: %s", e)
         raise HTTPException(status_code=500, detail="Error broadcasting message") from e
 
 
@@ -1536,7 +2018,7 @@ try:
     mcp.mount_http()
     logger.info("✅ MCP integration initialized successfully")
 except Exception as e:
-    logger.warning(f"⚠️ MCP integration failed to initialize: {e}")
+    logger.warning("⚠️ MCP integration failed to initialize: %s", e)
     logger.warning("Server will continue without MCP functionality")
     # Continue without MCP - this is not a critical failure
 
@@ -1550,7 +2032,7 @@ def main() -> None:
     Environment Variables:
         HOST: Server host (default: 0.0.0.0)
         PORT: Server port (default: 8080)
-        RELOAD: Enable auto-reload (default: true)
+        RELOAD: Enable auto-reload (default: false)
         LOG_LEVEL: Logging level (default: info)
         DOCS_DIR: Documentation output directory (default: /app/docs)
         APPS_DIR: AppDaemon source directory (default: /app/appdaemon-apps)
@@ -1569,25 +2051,23 @@ def main() -> None:
     # Print comprehensive startup information
     print_startup_info(dir_status, server_config, env_config)
 
-    # Create uvicorn configuration
-    config = uvicorn.Config(
-        "server.main:app",
-        host=server_config["host"],
-        port=server_config["port"],
-        reload=server_config["reload"],
-        log_level=server_config["log_level"],
-        access_log=True,
-        use_colors=True,
-    )
-
-    server = uvicorn.Server(config)
-
+    # uvicorn.run (unlike Server.run) starts the reload supervisor when RELOAD is enabled.
+    # It installs its own SIGINT/SIGTERM handlers and shuts down gracefully.
     try:
-        asyncio.run(server.serve())
-    except KeyboardInterrupt:
-        logger.info("\n👋 Server stopped by user")
+        uvicorn.run(
+            "server.main:app",
+            host=server_config["host"],
+            port=server_config["port"],
+            reload=server_config["reload"],
+            reload_dirs=server_config.get("reload_dirs"),
+            reload_includes=server_config.get("reload_includes"),
+            log_level=server_config["log_level"],
+            ws_per_message_deflate=server_config["ws_per_message_deflate"],
+            access_log=True,
+            use_colors=True,
+        )
     except Exception as e:
-        logger.error(f"❌ Server error: {e}")
+        logger.error("❌ Server error: %s", e)
         raise
 
 
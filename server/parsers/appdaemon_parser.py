@@ -8,16 +8,169 @@ It uses AST parsing to safely analyze code without executing it.
 """
 
 import ast
+import contextlib
+import hashlib
 import os
 import logging
+import multiprocessing
+import pickle
 import re
+import sys
+import tempfile
+import threading
 import yaml  # type: ignore[import-untyped]
+from collections import ChainMap, OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar, TypeGuard
+
+# libyaml-backed loader when PyYAML was built with it; same safe semantics as yaml.safe_load
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _intern(value: Any) -> Any:
+    """Intern strings so entity ids repeated across files and classes share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# Statements whose bodies may hold module-level imports (e.g. try/except ImportError fallbacks)
+_IMPORT_CONTAINERS = frozenset({ast.If, ast.Try, ast.TryStar, ast.ExceptHandler, ast.With})
+_STATEMENT_LIST_FIELDS = ("body", "handlers", "orelse", "finalbody")
+
+# AppDaemon call names recognised while scanning method bodies
+_SERVICE_PATTERNS = frozenset({
+    # AppDaemon service calls
+    "turn_on",
+    "turn_off",
+    "toggle",
+    "set_state",
+    "set_value",
+    "call_service",
+    "notify",
+    "fire_event",
+})
+_TIME_PATTERNS = frozenset({"run_daily", "run_at", "run_every", "run_in", "cancel_timer"})
+_MQTT_PATTERNS = frozenset({"listen_event", "mqtt_send", "mqtt_subscribe"})
+# Calls recorded as device actions in a method's action sequence
+_DEVICE_ACTION_METHODS = frozenset({"turn_on", "turn_off", "toggle", "call_service", "set_state"})
+# Method-name fragments -> inferred trigger, checked in order
+_TRIGGER_NAME_HINTS = (("motion", "motion_sensor"), ("door", "door_sensor"), ("temperature", "temperature_sensor"))
+# Direct service methods -> (service domain, service name)
+_SERVICE_MAPPING = {
+    "turn_on": ("homeassistant", "turn_on"),
+    "turn_off": ("homeassistant", "turn_off"),
+    "toggle": ("homeassistant", "toggle"),
+    "set_state": ("homeassistant", "set_state"),
+    "notify": ("notify", "notify"),
+}
+
+# Root names of project constant references such as Home.Kitchen.Light or Persons.user
+_CONSTANT_NAMESPACES = frozenset({"Home", "Persons", "Actions", "General"})
+
+# Pre-compiled regex patterns for performance analysis, compiled once per process
+_THRESHOLD_PATTERNS = (
+    re.compile(r"perf_time_ms\s*>\s*(\d+)"),
+    re.compile(r"execution_time\s*>\s*(\d+)"),
+    re.compile(r"duration\s*>\s*(\d+)"),
+)
+_LOG_PATTERNS = (
+    re.compile(r"\[Exec:.*perf_time.*\]", re.IGNORECASE),
+    re.compile(r"Execution time:", re.IGNORECASE),
+    re.compile(r"Performance:", re.IGNORECASE),
+)
+# Performance alert markers as (lowercase needle, reported label), checked in order
+_PERFORMANCE_ALERTS = tuple(
+    (alert.lower(), f"⚠️ {alert.upper()}")
+    for alert in ("PERFORMANCE ALERT", "⚠️", "performance warning", "slow execution", "execution exceeded")
+)
+
+# Keywords looked up in lowercased source by the file-level pattern analyzers; plain substring
+# checks beat a combined regex alternation several times over on method-sized sources
+_HELPER_METHOD_NAMES = (
+    "send_notify",
+    "notify_telegram",
+    "log_action",
+    "get_state_with_retry",
+    "wait_for_state",
+    "check_condition",
+    "format_message",
+    "parse_entity",
+)
+_RECOVERY_KEYWORDS = ("retry", "fallback", "recover", "backup", "alternative")
+
+# Operator spellings for the expression printer, keyed by exact operator node type
+_BOOL_OP_TEXT: dict[type[ast.boolop], str] = {ast.And: "and", ast.Or: "or"}
+_UNARY_OP_TEXT: dict[type[ast.unaryop], str] = {ast.Not: "not ", ast.USub: "-", ast.UAdd: "+", ast.Invert: "~"}
+_BIN_OP_TEXT: dict[type[ast.operator], str] = {
+    ast.Add: "+",
+    ast.Sub: "-",
+    ast.Mult: "*",
+    ast.MatMult: "@",
+    ast.Div: "/",
+    ast.Mod: "%",
+    ast.Pow: "**",
+    ast.FloorDiv: "//",
+    ast.BitOr: "|",
+    ast.BitAnd: "&",
+    ast.BitXor: "^",
+    ast.LShift: "<<",
+    ast.RShift: ">>",
+}
+_CMP_OP_TEXT: dict[type[ast.cmpop], str] = {
+    ast.Eq: "==",
+    ast.NotEq: "!=",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.Is: "is",
+    ast.IsNot: "is not",
+    ast.In: "in",
+    ast.NotIn: "not in",
+}
+
+# Constant maps and imports of module files, shared by all parser instances and keyed by resolved path;
+# entries are reused only while the file's (mtime_ns, size) is unchanged
+CONSTANT_MAP_CACHE_SIZE = 256
+_constant_map_cache: OrderedDict[str, tuple[tuple[int, int], dict[str, str], list[str]]] = OrderedDict()
+_constant_map_lock = threading.Lock()
+
+# Bump whenever parsing output changes so stale on-disk cache entries are ignored
+PARSE_CACHE_VERSION = 9
+
+
+# Symbols left in conditions after constant resolution and the words shown instead
+CONDITION_FALLBACKS = {
+    "self.State.ON": "on",
+    "self.State.OFF": "off",
+    "self.Area.HOME": "home",
+    "self.Area.NOT_HOME": "not_home",
+}
+
+
+def default_parse_cache_dir() -> Path | None:
+    """
+    Resolve the on-disk parse cache directory.
+
+    ``PARSER_CACHE_DIR`` overrides the location and an empty value disables the
+    cache; otherwise entries live under ``$XDG_CACHE_HOME`` (or ``~/.cache``).
+
+    Entries are unpickled when read, so the directory must be private to the
+    service user; directories the parser creates are made with mode 0o700.
+
+    Returns:
+        Cache directory, or None when caching is disabled
+    """
+    configured = os.getenv("PARSER_CACHE_DIR")
+    if configured is not None:
+        return Path(os.path.expandvars(os.path.expanduser(configured))) if configured.strip() else None
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "appdaemon-docs-server" / "parsed"
 
 
-@dataclass
+@dataclass(slots=True)
 class MethodAction:
     """Represents a specific action within a method."""
 
@@ -27,7 +180,7 @@ class MethodAction:
     entities_involved: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformancePattern:
     """Information about performance monitoring patterns."""
 
@@ -39,7 +192,7 @@ class PerformancePattern:
     line_number: int
 
 
-@dataclass
+@dataclass(slots=True)
 class MethodInfo:
     """Information about a method in an AppDaemon class."""
 
@@ -59,7 +212,7 @@ class MethodInfo:
     device_action_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class StateListener:
     """Information about a state listener configuration."""
 
@@ -72,7 +225,7 @@ class StateListener:
     line_number: int
 
 
-@dataclass
+@dataclass(slots=True)
 class MQTTListener:
     """Information about an MQTT listener configuration."""
 
@@ -85,7 +238,7 @@ class MQTTListener:
     retain: bool | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceCall:
     """Information about a Home Assistant service call."""
 
@@ -97,7 +250,7 @@ class ServiceCall:
     method_name: str | None = None  # The method making the call
 
 
-@dataclass
+@dataclass(slots=True)
 class TimeSchedule:
     """Information about time-based automation schedules."""
 
@@ -110,7 +263,7 @@ class TimeSchedule:
     delay: int | None = None  # For run_in
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceRelationship:
     """Information about relationships between devices."""
 
@@ -122,7 +275,7 @@ class DeviceRelationship:
     method_name: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AutomationFlow:
     """Information about automation logic flow."""
 
@@ -135,7 +288,7 @@ class AutomationFlow:
     description: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassInfo:
     """Information about an AppDaemon automation class."""
 
@@ -155,7 +308,7 @@ class ClassInfo:
     line_number: int
 
 
-@dataclass
+@dataclass(slots=True)
 class AppDependency:
     """Information about app dependency from apps.yaml."""
 
@@ -165,7 +318,7 @@ class AppDependency:
     dependencies: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class PersonCentricPattern:
     """Information about person-centric automation patterns."""
 
@@ -176,7 +329,7 @@ class PersonCentricPattern:
     personalized_settings: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class HelperInjectionPattern:
     """Information about helper injection patterns."""
 
@@ -186,7 +339,7 @@ class HelperInjectionPattern:
     dependency_injection: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorHandlingPattern:
     """Information about error handling patterns."""
 
@@ -197,7 +350,7 @@ class ErrorHandlingPattern:
     logging_on_error: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ConstantHierarchy:
     """Information about hierarchical constant usage."""
 
@@ -208,7 +361,7 @@ class ConstantHierarchy:
     general_constants: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedFile:
     """Complete parsed information from an AppDaemon file."""
 
@@ -232,19 +385,118 @@ class ParsedFile:
     constant_value_map: dict[str, str] = field(default_factory=dict)
 
 
+@dataclass(slots=True)
+class _MethodScan:
+    """Patterns collected from one method body."""
+
+    state_listeners: list[StateListener] = field(default_factory=list)
+    mqtt_listeners: list[MQTTListener] = field(default_factory=list)
+    time_schedules: list[TimeSchedule] = field(default_factory=list)
+    service_calls: list[ServiceCall] = field(default_factory=list)
+    device_relationships: list[DeviceRelationship] = field(default_factory=list)
+    automation_flows: list[AutomationFlow] = field(default_factory=list)
+    constants_used: set[str] = field(default_factory=set)
+
+
+@dataclass(slots=True)
+class _ClassCtx:
+    """Per-class state handed down while analysing the methods of one class."""
+
+    # Method name -> AST node, for limited inlining of helper methods
+    methods: dict[str, ast.FunctionDef] = field(default_factory=dict)
+    # Method under analysis plus helpers being inlined into it; never expanded again
+    inlining: set[str] = field(default_factory=set)
+    # Constant references under an If test or loop node, shared by the action and flow extractors
+    entity_refs: dict[ast.AST, list[str]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _ModuleNodes:
+    """Nodes the module-wide extractors consume, each list in ast.walk order."""
+
+    classes: list[ast.ClassDef] = field(default_factory=list)
+    # Assign / AnnAssign statements and setattr(...) calls that may define constants
+    constants: list[ast.AST] = field(default_factory=list)
+    imports: list[ast.Import | ast.ImportFrom] = field(default_factory=list)
+
+
+# Childless context and operator nodes (Load, Store, Add, Eq, ...); no extractor looks at them
+_LEAF_NODE_TYPES = frozenset(
+    node_type
+    for base in (ast.expr_context, ast.boolop, ast.operator, ast.unaryop, ast.cmpop)
+    for node_type in base.__subclasses__()
+)
+
+
+def _walk_nodes(node: ast.AST) -> Iterator[ast.AST]:
+    """Yield ``node`` and its descendants in ``ast.walk`` order, skipping context and operator nodes.
+
+    Reads each node's ``_fields`` directly instead of going through the ``iter_child_nodes``
+    and ``iter_fields`` generators, and never queues the leaf nodes that make up roughly a
+    third of a typical tree.
+    """
+    todo = deque((node,))
+    pop = todo.popleft
+    append = todo.append
+    while todo:
+        node = pop()
+        for name in node._fields:
+            value = getattr(node, name, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST) and type(item) not in _LEAF_NODE_TYPES:
+                        append(item)
+            elif isinstance(value, ast.AST) and type(value) not in _LEAF_NODE_TYPES:
+                append(value)
+        yield node
+
+
+def _collect_module_nodes(tree: ast.AST) -> _ModuleNodes:
+    """Bucket the nodes of ``tree`` for the module-wide extractors in a single walk."""
+    nodes = _ModuleNodes()
+    for node in _walk_nodes(tree):
+        if type(node) is ast.Assign or type(node) is ast.AnnAssign:
+            nodes.constants.append(node)
+        elif type(node) is ast.Call:
+            if type(node.func) is ast.Name and node.func.id == "setattr":
+                nodes.constants.append(node)
+        elif type(node) is ast.ClassDef:
+            nodes.classes.append(node)
+        elif type(node) is ast.Import or type(node) is ast.ImportFrom:
+            nodes.imports.append(node)
+    return nodes
+
+
 class AppDaemonParser:
     """Parser for AppDaemon automation Python files."""
 
-    def __init__(self, apps_yaml_path: str | Path | None = None) -> None:
-        """Initialize the parser."""
+    def __init__(self, apps_yaml_path: str | Path | None = None, cache_dir: str | Path | None = None) -> None:
+        """
+        Initialize the parser.
+
+        Args:
+            apps_yaml_path: Optional path to apps.yaml configuration file
+            cache_dir: Optional directory for persisting parse results across runs
+        """
         self.logger = logging.getLogger(__name__)
         self.current_file = ""
         self.source_lines: list[str] = []
         self.apps_yaml_path = Path(apps_yaml_path) if apps_yaml_path else None
         self.apps_config: dict[str, Any] = {}
         self._load_apps_config()
-        # Cache for imported module constant maps to avoid re-parsing
-        self._module_const_cache: dict[str, dict[str, str]] = {}
+        # Merged constant maps of imported modules with the stats of every file they were built from
+        self._module_const_cache: dict[str, tuple[dict[str, tuple[int, int] | None], dict[str, str]]] = {}
+        # On-disk parse cache; entries are validated against the stats of every file they depend on
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+        # (mtime_ns, size) of constant modules at the time they were read, keyed by resolved path
+        self._dep_stats: dict[str, tuple[int, int] | None] = {}
+        # Constant modules consulted by the parse in progress
+        self._parse_deps: set[str] = set()
+        # Constant values used while rendering conditions of the file being parsed
+        self._condition_constants: Mapping[str, str] = CONDITION_FALLBACKS
+        # Compiled alternation over the constant keys, rebuilt when the key set changes
+        self._resolver_keys: frozenset[str] = frozenset()
+        self._resolver_regex: re.Pattern[str] | None = None
         # APPS_DIR root (for locating const.py and other local modules)
         try:
             apps_dir_env = os.getenv("APPS_DIR", "")
@@ -254,35 +506,14 @@ class AppDaemonParser:
             Path(os.path.expandvars(os.path.expanduser(apps_dir_env))).resolve() if apps_dir_env else None
         )
 
-        # Enhanced parsing patterns
-        self.service_patterns = {
-            # AppDaemon service calls
-            "turn_on",
-            "turn_off",
-            "toggle",
-            "set_state",
-            "set_value",
-            "call_service",
-            "notify",
-            "fire_event",
-        }
-
-        self.time_patterns = {"run_daily", "run_at", "run_every", "run_in", "cancel_timer"}
-
-        self.mqtt_patterns = {"listen_event", "mqtt_send", "mqtt_subscribe"}
+        # Enhanced parsing patterns (shared, immutable module constants)
+        self.service_patterns = _SERVICE_PATTERNS
+        self.time_patterns = _TIME_PATTERNS
+        self.mqtt_patterns = _MQTT_PATTERNS
 
         # Pre-compiled regex patterns for performance analysis
-        self.threshold_patterns = [
-            re.compile(r"perf_time_ms\s*>\s*(\d+)"),
-            re.compile(r"execution_time\s*>\s*(\d+)"),
-            re.compile(r"duration\s*>\s*(\d+)"),
-        ]
-
-        self.log_patterns = [
-            re.compile(r"\[Exec:.*perf_time.*\]", re.IGNORECASE),
-            re.compile(r"Execution time:", re.IGNORECASE),
-            re.compile(r"Performance:", re.IGNORECASE),
-        ]
+        self.threshold_patterns = _THRESHOLD_PATTERNS
+        self.log_patterns = _LOG_PATTERNS
 
     def parse_file(self, file_path: str | Path) -> ParsedFile:
         """
@@ -295,14 +526,159 @@ class AppDaemonParser:
             ParsedFile containing all extracted information
         """
         file_path = Path(file_path)
+        cache_dir = self._cache_dir
+        if cache_dir is None:
+            return self._parse_file_uncached(file_path)
+
+        cache_path = self._parse_cache_path(cache_dir, file_path)
+        cached = self._load_cached_parse(cache_path)
+        if cached is not None:
+            self.current_file = str(file_path)
+            return cached
+
+        # Stat before reading so an edit racing the parse invalidates the entry
+        stats: dict[str, tuple[int, int] | None] = {str(file_path): self._stat_key(file_path)}
+        watched: list[Path] = [file_path.parent]
+        if self.apps_yaml_path:
+            watched.append(self.apps_yaml_path)
+        if self._apps_dir:
+            watched.extend((self._apps_dir, self._apps_dir / "const.py"))
+        for path in watched:
+            stats[str(path)] = self._stat_key(path)
+        self._parse_deps = set()
+        parsed = self._parse_file_uncached(file_path)
+        for dep in self._parse_deps:
+            stats[dep] = self._dep_stats.get(dep)
+            # New modules appearing next to a dependency can change how imports resolve
+            parent = str(Path(dep).parent)
+            stats.setdefault(parent, self._stat_key(parent))
+        self._store_cached_parse(cache_dir, cache_path, stats, parsed)
+        return parsed
+
+    @classmethod
+    def parse_many(
+        cls,
+        paths: Iterable[str | Path],
+        apps_yaml_path: str | Path | None = None,
+        cache_dir: str | Path | None = None,
+        max_workers: int | None = None,
+    ) -> list[ParsedFile | Exception]:
+        """
+        Parse several files, spreading them over worker processes.
+
+        Files parse independently and the work is CPU-bound, so each worker
+        process builds one parser and handles chunks of the input. A file that
+        fails to parse yields its exception in place of a result rather than
+        aborting the batch.
+
+        Args:
+            paths: Python files to parse
+            apps_yaml_path: Optional path to apps.yaml configuration file
+            cache_dir: Optional directory for persisting parse results across runs
+            max_workers: Worker process count; defaults to the CPU count, 1 parses in-process
+
+        Returns:
+            One ParsedFile or exception per input path, in input order
+        """
+        file_paths = [Path(p) for p in paths]
+        workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+        if workers <= 1:
+            parser = cls(apps_yaml_path=apps_yaml_path, cache_dir=cache_dir)
+            return [_parse_or_error(parser, path) for path in file_paths]
+
+        chunksize = max(1, len(file_paths) // (4 * workers))
+        # Spawn rather than fork: the server process runs the event loop and file watcher threads
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_parse_worker,
+            initargs=(apps_yaml_path, cache_dir),
+        ) as executor:
+            return list(executor.map(_parse_in_worker, file_paths, chunksize=chunksize))
+
+    def _parse_cache_path(self, cache_dir: Path, file_path: Path) -> Path:
+        """Cache entry location for ``file_path`` under the current parser configuration."""
+        key = f"{PARSE_CACHE_VERSION}\0{file_path.resolve()}\0{self.apps_yaml_path or ''}\0{self._apps_dir or ''}"
+        return cache_dir / f"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.pickle"
+
+    @staticmethod
+    def _stat_key(path: str | Path) -> tuple[int, int] | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load_cached_parse(self, cache_path: Path) -> ParsedFile | None:
+        """Return the cached parse result if every recorded dependency is unchanged."""
+        try:
+            with open(cache_path, "rb") as f:
+                stats, parsed = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.debug(f"Ignoring unreadable parse cache entry {cache_path}: {e}")
+            return None
+        if not isinstance(parsed, ParsedFile) or not isinstance(stats, dict):
+            return None
+        for path, key in stats.items():
+            if self._stat_key(path) != key:
+                return None
+        return parsed
+
+    def _store_cached_parse(
+        self, cache_dir: Path, cache_path: Path, stats: dict[str, tuple[int, int] | None], parsed: Any
+    ) -> None:
+        """Persist a parse result (or module constants) atomically; failures only cost a re-parse next time."""
+        try:
+            # Entries are unpickled on load, so only the service user may write here
+            cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            cache_path.parent.mkdir(mode=0o700, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump((stats, parsed), f, protocol=5)
+                os.replace(tmp_name, cache_path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
+                raise
+        except Exception as e:
+            self.logger.debug(f"Could not write parse cache entry {cache_path}: {e}")
+
+    def _module_cache_path(self, cache_dir: Path, resolved: str) -> Path:
+        """Cache entry location for the constants of the module file at ``resolved``."""
+        key = f"{PARSE_CACHE_VERSION}\0{resolved}"
+        return cache_dir / "modules" / f"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.pickle"
+
+    def _load_cached_module(
+        self, cache_path: Path, resolved: str, stat_key: tuple[int, int]
+    ) -> tuple[dict[str, str], list[str]] | None:
+        """Return persisted module constants if they were recorded for the file's current stat."""
+        try:
+            with open(cache_path, "rb") as f:
+                stats, payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.debug(f"Ignoring unreadable module cache entry {cache_path}: {e}")
+            return None
+        if stats != {resolved: stat_key} or not isinstance(payload, tuple) or len(payload) != 2:
+            return None
+        mapping, modules = payload
+        return {key: _intern(value) for key, value in mapping.items()}, modules
+
+    def _parse_file_uncached(self, file_path: Path) -> ParsedFile:
+        """Parse ``file_path`` from source."""
         self.current_file = str(file_path)
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            self.source_lines = content.splitlines()
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        # Decode once for method source slices; ast.parse takes the bytes directly instead of re-encoding
+        self.source_lines = raw.decode("utf-8").splitlines()
 
         try:
-            tree = ast.parse(content)
+            tree = ast.parse(raw, filename=str(file_path))
         except SyntaxError as e:
             raise ValueError(f"Syntax error in {file_path}: {e}")
 
@@ -312,12 +688,22 @@ class AppDaemonParser:
         classes = []
         constants_used = set()
 
-        # Find all classes in the module
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                class_info = self._parse_class(node)
-                classes.append(class_info)
-                constants_used.update(class_info.constants_used)
+        # Apps are classes: without a "class" keyword in the source there is nothing to resolve constants for
+        has_classes = b"class" in raw
+        # One walk feeds the class search, the constant maps and the import scan
+        module_nodes = _collect_module_nodes(tree) if has_classes else _ModuleNodes()
+        constant_value_map: dict[str, str] = (
+            self._build_constant_value_map(file_path, tree, module_nodes) if has_classes else {}
+        )
+        # Condition text is rendered while parsing classes; leftover self.* symbols fall back to plain words
+        self._condition_constants = ChainMap(constant_value_map, CONDITION_FALLBACKS)
+
+        # Find all classes in the module; nested classes may already have been parsed by their enclosing class
+        parsed_classes: dict[ast.ClassDef, ClassInfo] = {}
+        for node in module_nodes.classes:
+            class_info = parsed_classes.get(node) or self._parse_class(node, parsed_classes)
+            classes.append(class_info)
+            constants_used.update(class_info.constants_used)
 
         # Aggregate information from all classes
         all_mqtt_topics = []
@@ -329,20 +715,20 @@ class AppDaemonParser:
             # Collect MQTT topics
             for mqtt_listener in class_info.mqtt_listeners:
                 if mqtt_listener.topic:
-                    all_mqtt_topics.append(mqtt_listener.topic)
+                    all_mqtt_topics.append(_intern(mqtt_listener.topic))
 
             # Collect entities
             for listener in class_info.state_listeners:
                 if listener.entity:
-                    all_entities.append(listener.entity)
+                    all_entities.append(_intern(listener.entity))
 
             for relationship in class_info.device_relationships:
-                all_entities.extend([relationship.trigger_entity, relationship.target_entity])
+                all_entities.extend([_intern(relationship.trigger_entity), _intern(relationship.target_entity)])
 
             # Collect service calls
             for service_call in class_info.service_calls:
                 service_name = f"{service_call.service_domain}.{service_call.service_name}"
-                all_service_calls.append(service_name)
+                all_service_calls.append(sys.intern(service_name))
 
             # Calculate complexity score
             complexity_score += (
@@ -353,107 +739,8 @@ class AppDaemonParser:
                 + len(class_info.automation_flows) * 5
             )
 
-        # Extract constant value assignments at module scope (e.g., Home.X = "domain.entity")
-        # and class-nested constants (e.g., class Home: class Kitchen: Light = "light.kitchen")
-        # Constants from this module
-        local_map = self._extract_constant_value_map(tree)
-        local_class_map = self._extract_class_constant_value_map(tree)
-        # Constants from imported project modules
-        imported_maps = self._extract_imported_constant_maps(file_path=file_path, tree=tree)
-        # Constants from APPS_DIR/const.py (global project constants)
-        const_map: dict[str, str] = {}
-        if self._apps_dir:
-            const_py = self._apps_dir / "const.py"
-            if const_py.exists():
-                try:
-                    const_map = self._extract_constant_map_from_path(const_py)
-                except Exception:
-                    const_map = {}
-        # Merge precedence: const.py -> imported -> local -> local class
-        merged_map: dict[str, str] = {}
-        merged_map.update(const_map)
-        for m in imported_maps:
-            merged_map.update(m)
-        merged_map.update(local_map)
-        merged_map.update(local_class_map)
-        # Add per-class self.<Nested>.* constants (e.g., self.State.ON -> "on")
-        self_scoped_map = self._extract_self_class_constant_value_map(tree)
-        merged_map.update(self_scoped_map)
-        constant_value_map = merged_map
-
         # Resolve constants in listeners and service calls using the extracted map
-        for class_info in classes:
-            # Resolve state listener entity constants
-            for listener in class_info.state_listeners:
-                if isinstance(listener.entity, str) and listener.entity in constant_value_map:
-                    listener.entity = constant_value_map[listener.entity]
-
-            # Resolve service call entity_id constants
-            for svc in class_info.service_calls:
-                if isinstance(svc.entity_id, str) and svc.entity_id in constant_value_map:
-                    svc.entity_id = constant_value_map[svc.entity_id]
-
-                # Resolve service path constants (e.g., Actions.Cover.close -> cover.close_cover)
-                combined = f"{svc.service_domain}.{svc.service_name}" if svc.service_domain and svc.service_name else ""
-                if combined in constant_value_map:
-                    resolved_path = constant_value_map[combined]
-                    if isinstance(resolved_path, str):
-                        # Accept both "domain.service" and "domain/service"
-                        path = resolved_path.replace("/", ".")
-                        if "." in path:
-                            domain, service = path.split(".", 1)
-                            svc.service_domain = domain
-                            svc.service_name = service
-
-                # Resolve entity_id inside data payload
-                try:
-                    if isinstance(svc.data, dict) and "entity_id" in svc.data:
-                        ent = svc.data["entity_id"]
-                        if isinstance(ent, str) and ent in constant_value_map:
-                            svc.data["entity_id"] = constant_value_map[ent]
-                        elif isinstance(ent, list):
-                            new_list: list[str] = []
-                            for item in ent:
-                                if isinstance(item, str) and item in constant_value_map:
-                                    new_list.append(constant_value_map[item])
-                                else:
-                                    new_list.append(item)
-                            svc.data["entity_id"] = new_list
-                except Exception:
-                    pass
-
-            # Resolve device relationship entity constants
-            for rel in class_info.device_relationships:
-                if isinstance(rel.trigger_entity, str) and rel.trigger_entity in constant_value_map:
-                    rel.trigger_entity = constant_value_map[rel.trigger_entity]
-                if isinstance(rel.target_entity, str) and rel.target_entity in constant_value_map:
-                    rel.target_entity = constant_value_map[rel.target_entity]
-
-            # Resolve automation flow entities
-            for flow in class_info.automation_flows:
-                resolved: list[str] = []
-                for ent in flow.entities_involved:
-                    if isinstance(ent, str) and ent in constant_value_map:
-                        resolved.append(constant_value_map[ent])
-                    else:
-                        resolved.append(ent)
-                flow.entities_involved = resolved
-
-                # Resolve constants inside textual conditions
-                if flow.conditions:
-                    resolved_conditions: list[str] = []
-                    for cond in flow.conditions:
-                        cond_resolved = self._resolve_constants_in_text(cond, constant_value_map)
-                        cond_natural = self._naturalize_condition(cond_resolved)
-                        resolved_conditions.append(cond_natural)
-                    flow.conditions = resolved_conditions
-
-                # Resolve constants inside textual actions
-                if flow.actions:
-                    resolved_actions: list[str] = []
-                    for act in flow.actions:
-                        resolved_actions.append(self._resolve_constants_in_text(act, constant_value_map))
-                    flow.actions = resolved_actions
+        self._resolve_class_constants(classes, constant_value_map)
 
         # Enhanced analysis
         app_dependencies = self._extract_app_dependencies(file_path)
@@ -480,7 +767,43 @@ class AppDaemonParser:
             constant_value_map=constant_value_map,
         )
 
-    def _extract_self_class_constant_value_map(self, tree: ast.Module) -> dict[str, str]:
+    def _build_constant_value_map(
+        self, file_path: Path, tree: ast.Module, module_nodes: _ModuleNodes
+    ) -> dict[str, str]:
+        """Merge the constants visible to ``file_path`` into one name -> value map."""
+        # Extract constant value assignments at module scope (e.g., Home.X = "domain.entity")
+        # and class-nested constants (e.g., class Home: class Kitchen: Light = "light.kitchen")
+        # Constants from this module
+        local_map, local_class_map = self._extract_module_constant_maps(tree, module_nodes)
+        # Constants from imported project modules
+        imported_maps = self._extract_imported_constant_maps(
+            file_path, self._imported_module_names(tree, module_nodes.imports)
+        )
+        # Constants from APPS_DIR/const.py (global project constants)
+        const_map: dict[str, str] = {}
+        if self._apps_dir:
+            const_py = self._apps_dir / "const.py"
+            if const_py.exists():
+                try:
+                    const_map = self._extract_constant_map_from_path(const_py)
+                except Exception:
+                    const_map = {}
+        # Add per-class self.<Nested>.* constants (e.g., self.State.ON -> "on")
+        self_scoped_map = self._extract_self_class_constant_value_map(tree, local_class_map)
+        # Merge precedence: const.py -> imported -> local -> local class -> self-scoped.
+        # Module maps arrive with interned values; only this file's own layers are interned here,
+        # so resolved values stored on listeners and calls share one object per distinct value.
+        constant_value_map: dict[str, str] = dict(const_map)
+        for m in imported_maps:
+            constant_value_map.update(m)
+        for layer in (local_map, local_class_map, self_scoped_map):
+            for key, value in layer.items():
+                constant_value_map[key] = _intern(value)
+        return constant_value_map
+
+    def _extract_self_class_constant_value_map(
+        self, tree: ast.Module, class_map: dict[str, str] | None = None
+    ) -> dict[str, str]:
         """Extract nested class constants defined inside automation classes and expose them
         under a self.* key space so expressions like self.State.ON can be resolved.
 
@@ -489,36 +812,19 @@ class AppDaemonParser:
                 class State:
                     ON = "on"
         -> "self.State.ON": "on"
+
+        The keys are those of ``_extract_class_constant_value_map`` that sit at least one class
+        below a top-level class, with the top-level name replaced by ``self``; pass that map as
+        ``class_map`` when it has already been built for ``tree`` to skip walking the classes again.
         """
+        if class_map is None:
+            class_map = self._extract_class_constant_value_map(tree)
         mapping: dict[str, str] = {}
-
-        def walk_nested(cls: ast.ClassDef, prefix: str) -> None:
-            for item in cls.body:
-                if isinstance(item, ast.Assign):
-                    for target in item.targets:
-                        if (
-                            isinstance(target, ast.Name)
-                            and isinstance(item.value, ast.Constant)
-                            and isinstance(item.value.value, str)
-                        ):
-                            mapping[f"self.{prefix}.{target.id}"] = item.value.value
-                elif isinstance(item, ast.AnnAssign):
-                    if (
-                        isinstance(item.target, ast.Name)
-                        and isinstance(item.value, ast.Constant)
-                        and isinstance(item.value.value, str)
-                    ):
-                        mapping[f"self.{prefix}.{item.target.id}"] = item.value.value
-                elif isinstance(item, ast.ClassDef):
-                    walk_nested(item, f"{prefix}.{item.name}")
-
-        for node in tree.body:
-            if isinstance(node, ast.ClassDef):
-                # Only nested class scopes under automation classes should be considered; start at one level down
-                for inner in node.body:
-                    if isinstance(inner, ast.ClassDef):
-                        walk_nested(inner, inner.name)
-
+        for key, value in class_map.items():
+            # "Outer.Inner.NAME" -> "self.Inner.NAME"; "Outer.NAME" has no nested scope
+            _, _, nested = key.partition(".")
+            if "." in nested:
+                mapping[f"self.{nested}"] = value
         return mapping
 
     def _resolve_constants_in_text(self, text: str, mapping: dict[str, str]) -> str:
@@ -526,128 +832,198 @@ class AppDaemonParser:
 
         Uses regex word-boundary-like guards to avoid replacing inside larger identifiers.
         """
-        try:
-            # Replace longer keys first to avoid partial overlaps
-            for key in sorted(mapping.keys(), key=len, reverse=True):
-                pattern = r"(?<![A-Za-z0-9_])" + re.escape(key) + r"(?![A-Za-z0-9_])"
-                text = re.sub(pattern, mapping[key], text)
+        if not mapping:
             return text
+        try:
+            keys = frozenset(mapping)
+            regex = self._resolver_regex
+            if regex is None or keys != self._resolver_keys:
+                # One alternation for all keys, longest first to avoid partial overlaps
+                alternation = "|".join(re.escape(key) for key in sorted(keys, key=len, reverse=True))
+                regex = re.compile(r"(?<![A-Za-z0-9_])(" + alternation + r")(?![A-Za-z0-9_])")
+                self._resolver_regex = regex
+                self._resolver_keys = keys
+            return regex.sub(lambda m: mapping[m.group(1)], text)
         except Exception:
             return text
 
+    def _resolve_constants_in_texts(self, texts: list[str], mapping: dict[str, str]) -> list[str]:
+        """Resolve constants in many snippets with a single regex pass over their NUL-joined text.
+
+        NUL is not an identifier character, so each snippet keeps the boundaries it
+        would have on its own; snippets containing NUL fall back to one pass each.
+        """
+        if not texts or not mapping:
+            return texts
+        resolved = self._resolve_constants_in_text("\0".join(texts), mapping).split("\0")
+        if len(resolved) != len(texts):
+            return [self._resolve_constants_in_text(text, mapping) for text in texts]
+        return resolved
+
     def _strip_quotes(self, s: str) -> str:
         if len(s) >= 2 and ((s[0] == s[-1] == '"') or (s[0] == s[-1] == "'")):
             return s[1:-1]
         return s
 
-    def _naturalize_condition(self, cond: str) -> str:
-        """Convert a resolved condition string into a simple natural sentence."""
+    def _naturalize_condition(self, test: ast.AST) -> str:
+        """Describe a condition node as a short natural phrase with constants resolved."""
+        mapping = self._condition_constants
         try:
-            c = cond.strip()
-            # Normalize leading keyword
-            lead = ""
-            if c.startswith("if "):
-                c = c[3:]
-                lead = "when "
-            elif c.startswith("elif "):
-                c = c[5:]
-                lead = "or when "
-
-            # For-loops → friendlier phrasing
-            m = re.match(r"^for\s+(.*?)\s+in\s*(.*)$", c)
-            if m:
-                target = m.group(1).strip()
-                source = m.group(2).strip()
-                if target and source:
-                    return f"for each {target} in {source}"
-                if target and not source:
-                    return f"for each {target}"
-                if not target and source:
-                    return f"for each item in {source}"
-                return "for each item"
-            # Edge cases: 'for X in' or 'for  in Y' or just 'for X'
-            if c.startswith("for "):
-                rest = c[4:].strip()
-                if rest.endswith(" in"):
-                    rest = rest[:-3].strip()
-                    return f"for each {rest}" if rest else "for each item"
-                if rest.startswith("in "):
-                    return f"for each item in {rest[3:].strip()}"
-                return f"for each {rest}" if rest else "for each item"
-
-            # Fallback symbol replacements if any leftovers
-            fallback = {
-                "self.State.ON": "on",
-                "self.State.OFF": "off",
-                "self.Area.HOME": "home",
-                "self.Area.NOT_HOME": "not_home",
-            }
-            for k, v in fallback.items():
-                c = c.replace(k, v)
-
-            # Pattern: self.get_state(entity) == value
-            m = re.match(r"self\.get_state\((.+)\)\s*==\s*(.+)$", c)
-            if m:
-                ent = m.group(1).strip()
-                val = self._strip_quotes(m.group(2).strip())
-                return f"{lead}{ent} is {val}"
-
-            m = re.match(r"self\.get_state\((.+)\)\s*!=\s*(.+)$", c)
-            if m:
-                ent = m.group(1).strip()
-                val = self._strip_quotes(m.group(2).strip())
-                return f"{lead}{ent} is not {val}"
-
-            # hasattr(obj, 'Attr')
-            m = re.match(r"hasattr\(([^,]+),\s*'([^']+)'\)", c)
-            if m:
-                obj = m.group(1).strip()
-                attr = m.group(2).strip()
-                return f"{lead}{obj} has {attr}"
-
-            # name equality
-            m = re.match(r"(.+)\s*==\s*(.+)$", c)
-            if m:
-                left = m.group(1).strip()
-                right = self._strip_quotes(m.group(2).strip())
-                if left.endswith(".name"):
-                    subj = left[:-5]
-                    return f"{lead}{subj} is {right}"
-                return f"{lead}{left} equals {right}"
-
-            # membership
-            m = re.match(r"(.+)\s+in\s+(.+)$", c)
-            if m:
-                left = m.group(1).strip()
-                right = m.group(2).strip()
-                return f"{lead}{left} in {right}"
-
-            # negation
-            if c.startswith("not "):
-                return f"{lead}not {c[4:].strip()}"
-
-            # Default: prepend lead if any
-            return (lead + c).strip()
+            if type(test) is ast.BoolOp:
+                joiner = f" {self._bool_op_to_text(test.op)} "
+                return joiner.join(self._naturalize_condition(value) for value in test.values)
+            if type(test) is ast.Compare and len(test.ops) == 1:
+                op, left, right = test.ops[0], test.left, test.comparators[0]
+                if (type(op) is ast.Eq or type(op) is ast.NotEq) and self._is_self_call(left, "get_state"):
+                    ent = ", ".join(self._expr_to_text(arg, mapping) for arg in left.args)
+                    verb = "is" if type(op) is ast.Eq else "is not"
+                    return f"{ent} {verb} {self._condition_value_text(right)}"
+                if type(op) is ast.Eq:
+                    lhs = self._expr_to_text(left, mapping)
+                    rhs = self._condition_value_text(right)
+                    if lhs.endswith(".name"):
+                        return f"{lhs[:-5]} is {rhs}"
+                    return f"{lhs} equals {rhs}"
+                if type(op) is ast.In:
+                    return f"{self._expr_to_text(left, mapping)} in {self._expr_to_text(right, mapping)}"
+            if (
+                type(test) is ast.Call
+                and type(test.func) is ast.Name
+                and test.func.id == "hasattr"
+                and len(test.args) == 2
+                and type(test.args[1]) is ast.Constant
+                and isinstance(test.args[1].value, str)
+            ):
+                return f"{self._expr_to_text(test.args[0], mapping)} has {test.args[1].value}"
+            if type(test) is ast.UnaryOp and type(test.op) is ast.Not:
+                return f"not {self._expr_to_text(test.operand, mapping)}"
         except Exception:
-            return cond
+            pass
+        return self._expr_to_text(test, mapping)
+
+    def _condition_value_text(self, node: ast.AST) -> str:
+        """Right-hand side of a comparison; string literals are shown without quotes."""
+        if type(node) is ast.Constant and isinstance(node.value, str):
+            return node.value
+        return self._strip_quotes(self._expr_to_text(node, self._condition_constants))
+
+    def _is_self_call(self, node: ast.AST, method: str) -> TypeGuard[ast.Call]:
+        return (
+            type(node) is ast.Call
+            and type(node.func) is ast.Attribute
+            and node.func.attr == method
+            and type(node.func.value) is ast.Name
+            and node.func.value.id == "self"
+        )
 
     def _extract_imports(self, tree: ast.AST) -> list[str]:
-        """Extract import statements from the AST."""
+        """Extract module-level import statements from the AST.
+
+        Only module statements and the statement lists of module-level if/try/with
+        blocks (including except handlers) are visited, breadth-first like ast.walk,
+        instead of every node in every function and class; conditions and context
+        managers are never queued.
+        """
         imports = []
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
+        queue = deque(getattr(tree, "body", ()))
+        while queue:
+            node = queue.popleft()
+            if type(node) in _IMPORT_CONTAINERS:
+                for name in _STATEMENT_LIST_FIELDS:
+                    queue.extend(getattr(node, name, ()))
+            elif type(node) is ast.Import:
                 for alias in node.names:
                     imports.append(f"import {alias.name}")
-            elif isinstance(node, ast.ImportFrom):
+            elif type(node) is ast.ImportFrom:
                 module = node.module or ""
                 names = [alias.name for alias in node.names]
                 imports.append(f"from {module} import {', '.join(names)}")
 
         return imports
 
-    def _parse_class(self, class_node: ast.ClassDef) -> ClassInfo:
-        """Parse a class definition and extract all relevant information."""
+    def _resolve_class_constants(self, classes: list[ClassInfo], mapping: dict[str, str]) -> None:
+        """
+        Replace constant references in the extracted patterns with their values.
+
+        This runs over every listener, call, relationship and flow of a file, so
+        the lookups are bound to locals once instead of per item.
+
+        Args:
+            classes: Parsed classes of the file; updated in place
+            mapping: Constant name -> value map of the file
+        """
+        lookup = mapping.get
+        intern = sys.intern
+        # Flows whose action texts are resolved together once every class has been visited
+        text_flows: list[AutomationFlow] = []
+        for class_info in classes:
+            # Resolve state listener entity constants
+            for listener in class_info.state_listeners:
+                entity = listener.entity
+                if isinstance(entity, str):
+                    listener.entity = intern(lookup(entity, entity))
+
+            for svc in class_info.service_calls:
+                # Resolve service call entity_id constants
+                entity = svc.entity_id
+                if isinstance(entity, str):
+                    svc.entity_id = intern(lookup(entity, entity))
+
+                # Resolve service path constants (e.g., Actions.Cover.close -> cover.close_cover)
+                if svc.service_domain and svc.service_name:
+                    resolved_path = lookup(f"{svc.service_domain}.{svc.service_name}")
+                    if resolved_path is not None:
+                        # Accept both "domain.service" and "domain/service"
+                        path = resolved_path.replace("/", ".")
+                        if "." in path:
+                            domain, service = path.split(".", 1)
+                            svc.service_domain = intern(domain)
+                            svc.service_name = intern(service)
+
+                # Resolve entity_id inside data payload (values there may be any literal, not just strings)
+                data = svc.data
+                if isinstance(data, dict):
+                    ent = data.get("entity_id")
+                    if isinstance(ent, str):
+                        data["entity_id"] = intern(lookup(ent, ent))
+                    elif isinstance(ent, list):
+                        data["entity_id"] = [
+                            intern(lookup(item, item)) if isinstance(item, str) else item for item in ent
+                        ]
+
+            # Resolve device relationship entity constants
+            for rel in class_info.device_relationships:
+                if isinstance(rel.trigger_entity, str):
+                    rel.trigger_entity = intern(lookup(rel.trigger_entity, rel.trigger_entity))
+                if isinstance(rel.target_entity, str):
+                    rel.target_entity = intern(lookup(rel.target_entity, rel.target_entity))
+
+            for flow in class_info.automation_flows:
+                # Resolve automation flow entities
+                flow.entities_involved = [intern(lookup(ent, ent)) for ent in flow.entities_involved]
+                if flow.actions:
+                    text_flows.append(flow)
+
+        # Resolve constants inside textual actions as one flat batch, then hand each flow its slice back
+        resolved_texts = self._resolve_constants_in_texts([act for flow in text_flows for act in flow.actions], mapping)
+        start = 0
+        for flow in text_flows:
+            end = start + len(flow.actions)
+            flow.actions = resolved_texts[start:end]
+            start = end
+
+    def _parse_class(
+        self, class_node: ast.ClassDef, parsed_classes: dict[ast.ClassDef, ClassInfo] | None = None
+    ) -> ClassInfo:
+        """
+        Parse a class definition and extract all relevant information.
+
+        Args:
+            class_node: Class to parse
+            parsed_classes: Results of classes parsed so far in this file; nested classes are
+                parsed through it once and their constant references reused
+        """
         # Basic class information
         name = class_node.name
         base_classes = [self._get_name(base) for base in class_node.bases]
@@ -662,49 +1038,45 @@ class AppDaemonParser:
         device_relationships = []
         automation_flows = []
         initialize_code = None
-        constants_used = []
+        constants_used: set[str] = set()
 
-        # Build a map of method name -> AST node to allow limited inlining of helper methods
-        self._current_class_method_nodes: dict[str, ast.FunctionDef] = {
-            n.name: n for n in class_node.body if isinstance(n, ast.FunctionDef)
-        }
+        ctx = _ClassCtx(methods={n.name: n for n in class_node.body if isinstance(n, ast.FunctionDef)})
 
         for node in class_node.body:
             if isinstance(node, ast.FunctionDef):
-                method_info = self._parse_method(node)
+                method_info = self._parse_method(node, ctx)
                 methods.append(method_info)
 
                 # Special handling for initialize method
-                if method_info.name == "initialize":
+                is_initialize = method_info.name == "initialize"
+                if is_initialize:
                     initialize_code = method_info.source_code
-                    # Extract various listeners and patterns from initialize method
-                    listeners = self._extract_state_listeners(node)
-                    state_listeners.extend(listeners)
-
-                    mqtt_list = self._extract_mqtt_listeners(node)
-                    mqtt_listeners.extend(mqtt_list)
-
-                    time_sched = self._extract_time_schedules(node)
-                    time_schedules.extend(time_sched)
-
-                # Extract patterns from all methods
-                method_service_calls = self._extract_service_calls(node)
-                service_calls.extend(method_service_calls)
 
-                method_relationships = self._extract_device_relationships(node)
-                device_relationships.extend(method_relationships)
-
-                method_flows = self._extract_automation_flows(node)
-                automation_flows.extend(method_flows)
-
-        # Find all constant references in the class
-        for node in ast.walk(class_node):  # type: ignore[assignment]
-            if isinstance(node, ast.Attribute):
-                const_ref = self._extract_constant_reference(node)
-                if const_ref:
-                    constants_used.append(const_ref)
+                # One walk per method collects every pattern; listeners and schedules only from initialize
+                scan = self._scan_method(node, include_registrations=is_initialize, ctx=ctx)
+                state_listeners.extend(scan.state_listeners)
+                mqtt_listeners.extend(scan.mqtt_listeners)
+                time_schedules.extend(scan.time_schedules)
+                service_calls.extend(scan.service_calls)
+                device_relationships.extend(scan.device_relationships)
+                automation_flows.extend(scan.automation_flows)
+                constants_used.update(scan.constants_used)
+
+        # Constant references outside methods (class attributes, bases, nested classes)
+        for child in ast.iter_child_nodes(class_node):
+            if isinstance(child, ast.FunctionDef):
+                continue
+            if isinstance(child, ast.ClassDef) and parsed_classes is not None:
+                nested = parsed_classes.get(child) or self._parse_class(child, parsed_classes)
+                constants_used.update(nested.constants_used)
+                continue
+            for node in _walk_nodes(child):  # type: ignore[assignment]
+                if isinstance(node, ast.Attribute):
+                    const_ref = self._extract_constant_reference(node)
+                    if const_ref:
+                        constants_used.add(const_ref)
 
-        return ClassInfo(
+        class_info = ClassInfo(
             name=name,
             base_classes=base_classes,
             docstring=docstring,
@@ -716,12 +1088,15 @@ class AppDaemonParser:
             device_relationships=device_relationships,
             automation_flows=automation_flows,
             imports=[],  # Will be filled at file level
-            constants_used=list(set(constants_used)),
+            constants_used=list(constants_used),
             initialize_code=initialize_code,
             line_number=class_node.lineno,
         )
+        if parsed_classes is not None:
+            parsed_classes[class_node] = class_info
+        return class_info
 
-    def _parse_method(self, method_node: ast.FunctionDef) -> MethodInfo:
+    def _parse_method(self, method_node: ast.FunctionDef, ctx: _ClassCtx | None = None) -> MethodInfo:
         """Parse a method definition with detailed body analysis."""
         name = method_node.name
         args = [arg.arg for arg in method_node.args.args]
@@ -737,14 +1112,21 @@ class AppDaemonParser:
         source_code = "\n".join(self.source_lines[start_line:end_line])
 
         # Enhanced method body analysis
-        actions = self._analyze_method_actions(method_node)
-        performance_pattern = self._analyze_performance_pattern(method_node)
-
-        # Count different types of operations
-        conditional_count = len([a for a in actions if a.action_type == "conditional_logic"])
-        loop_count = len([a for a in actions if a.action_type == "loop_iteration"])
-        notification_count = len([a for a in actions if a.action_type == "notification"])
-        device_action_count = len([a for a in actions if a.action_type == "device_action"])
+        actions = self._analyze_method_actions(method_node, ctx)
+        performance_pattern = self._analyze_performance_pattern(method_node, source_code)
+
+        # Count different types of operations in one pass
+        conditional_count = loop_count = notification_count = device_action_count = 0
+        for action in actions:
+            action_type = action.action_type
+            if action_type == "conditional_logic":
+                conditional_count += 1
+            elif action_type == "loop_iteration":
+                loop_count += 1
+            elif action_type == "notification":
+                notification_count += 1
+            elif action_type == "device_action":
+                device_action_count += 1
 
         return MethodInfo(
             name=name,
@@ -774,33 +1156,114 @@ class AppDaemonParser:
         expected_params = ["entity", "attribute", "old", "new", "kwargs"]
         return args[1:6] == expected_params or args[-5:] == expected_params
 
-    def _extract_state_listeners(self, method_node: ast.FunctionDef) -> list[StateListener]:
-        """Extract listen_state calls from a method (typically initialize)."""
-        listeners = []
-        alias_map = self._build_alias_map(method_node)
+    def _scan_method(
+        self, method_node: ast.FunctionDef, include_registrations: bool, ctx: _ClassCtx | None = None
+    ) -> _MethodScan:
+        """
+        Collect the patterns of a method in a single AST walk.
+
+        The walk keeps ``ast.walk`` order so each result list comes out in the same
+        order the former per-pattern walks produced.
+
+        Args:
+            method_node: Method to scan
+            include_registrations: Also collect listeners and schedules (initialize only)
+            ctx: State of the enclosing class, whose entity references the flows reuse
+
+        Returns:
+            Patterns found in the method
+        """
+        scan = _MethodScan()
+        # Built on the first call that can resolve an alias; most methods have none
+        alias_map: dict[str, str] | None = None
+        trigger_entity: str | None = None
+        trigger_inferred = False
+
+        for node in _walk_nodes(method_node):
+            if type(node) is ast.Attribute:
+                const_ref = self._extract_constant_reference(node)
+                if const_ref:
+                    scan.constants_used.add(const_ref)
+            elif type(node) is ast.If:
+                flow = self._parse_conditional_flow(node, method_node.name, ctx)
+                if flow:
+                    scan.automation_flows.append(flow)
+            elif type(node) is ast.For or type(node) is ast.While:
+                flow = self._parse_loop_flow(node, method_node.name, ctx)
+                if flow:
+                    scan.automation_flows.append(flow)
+            elif type(node) is ast.Call and type(node.func) is ast.Attribute:
+                method_name = node.func.attr
+                if alias_map is None and (
+                    method_name in _SERVICE_PATTERNS or (include_registrations and method_name == "listen_state")
+                ):
+                    alias_map = self._build_alias_map(method_node)
+
+                if include_registrations:
+                    if method_name == "listen_state":
+                        listener = self._parse_listen_state_call(node, alias_map)
+                        if listener:
+                            scan.state_listeners.append(listener)
+                    elif method_name == "listen_event":
+                        # Check if this is an MQTT listener
+                        if self._call_keyword(node, "namespace") == "mqtt" or self._has_mqtt_arg(node.args):
+                            mqtt_listener = self._parse_mqtt_listener_call(node)
+                            if mqtt_listener:
+                                scan.mqtt_listeners.append(mqtt_listener)
+                    elif method_name in _TIME_PATTERNS:
+                        schedule = self._parse_time_schedule_call(node, method_name)
+                        if schedule:
+                            scan.time_schedules.append(schedule)
+
+                # call_service method (handle before generic direct methods)
+                if method_name == "call_service":
+                    service_call = self._parse_call_service_call(node, method_node.name, alias_map)
+                    if service_call:
+                        scan.service_calls.append(service_call)
+
+                # Direct AppDaemon service methods
+                elif method_name in _SERVICE_PATTERNS:
+                    service_call = self._parse_direct_service_call(node, method_name, method_node.name, alias_map)
+                    if service_call:
+                        scan.service_calls.append(service_call)
+
+                # Look for patterns where one entity affects another
+                if method_name in _SERVICE_PATTERNS and node.args:
+                    target_entity = self._get_value(node.args[0])
+                    if not trigger_inferred:
+                        trigger_entity = self._infer_trigger_entity(method_node)
+                        trigger_inferred = True
+                    if trigger_entity and target_entity:
+                        scan.device_relationships.append(
+                            DeviceRelationship(
+                                trigger_entity=trigger_entity,
+                                target_entity=target_entity,
+                                relationship_type="controls",
+                                line_number=node.lineno,
+                                method_name=method_node.name,
+                            )
+                        )
 
-        for node in ast.walk(method_node):
-            if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "listen_state":
-                listener = self._parse_listen_state_call(node, alias_map)
-                if listener:
-                    listeners.append(listener)
+        return scan
 
-        return listeners
+    def _has_mqtt_arg(self, args: list[ast.expr]) -> bool:
+        """Whether a positional argument is a string literal naming MQTT (e.g. the MQTT_MESSAGE event)."""
+        return any(
+            type(arg) is ast.Constant and isinstance(arg.value, str) and "mqtt" in arg.value.lower() for arg in args
+        )
 
     def _parse_listen_state_call(
-        self, call_node: ast.Call, alias_map: dict[str, str] | None = None
+        self, call_node: ast.Call, alias_map: Mapping[str, str] | None = None
     ) -> StateListener | None:
         """Parse a listen_state method call."""
         args = call_node.args
-        kwargs = {kw.arg: self._get_value(kw.value) for kw in call_node.keywords}
-
         if len(args) < 2:
             return None
 
+        kwargs = self._call_kwargs(call_node)
+
         callback_method = self._get_name(args[0])
-        entity = self._get_value(args[1]) if len(args) > 1 else None
-        if isinstance(entity, str) and alias_map and entity in alias_map:
-            entity = alias_map[entity]
+        entity = self._resolve_alias_value(self._get_value(args[1]), alias_map)
 
         return StateListener(
             callback_method=callback_method,
@@ -808,115 +1271,67 @@ class AppDaemonParser:
             old_state=kwargs.get("old"),
             new_state=kwargs.get("new"),
             duration=kwargs.get("duration"),
-            kwargs={k: v for k, v in kwargs.items() if k is not None},
+            kwargs=kwargs,
             line_number=call_node.lineno,
         )
 
-    def _extract_mqtt_listeners(self, method_node: ast.FunctionDef) -> list[MQTTListener]:
-        """Extract MQTT listeners from a method (typically initialize)."""
-        listeners = []
-
-        for node in ast.walk(method_node):
-            if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
-                if node.func.attr == "listen_event":
-                    # Check if this is an MQTT listener
-                    kwargs = {kw.arg: self._get_value(kw.value) for kw in node.keywords}
-                    if kwargs.get("namespace") == "mqtt" or any("mqtt" in str(arg) for arg in node.args):
-                        listener = self._parse_mqtt_listener_call(node)
-                        if listener:
-                            listeners.append(listener)
-
-        return listeners
-
     def _parse_mqtt_listener_call(self, call_node: ast.Call) -> MQTTListener | None:
         """Parse an MQTT listen_event call."""
         args = call_node.args
-        kwargs = {kw.arg: self._get_value(kw.value) for kw in call_node.keywords}
-
         if len(args) < 1:
             return None
 
+        kwargs = self._call_kwargs(call_node)
+
         callback_method = self._get_name(args[0])
-        topic = kwargs.get("topic") or (self._get_value(args[1]) if len(args) > 1 else None)
+        topic = _intern(kwargs.get("topic") or (self._get_value(args[1]) if len(args) > 1 else None))
 
         return MQTTListener(
             callback_method=callback_method,
             topic=topic,
             namespace=kwargs.get("namespace"),
-            kwargs={k: v for k, v in kwargs.items() if k is not None},
+            kwargs=kwargs,
             line_number=call_node.lineno,
             qos=kwargs.get("qos"),
             retain=kwargs.get("retain"),
         )
 
-    def _extract_service_calls(self, method_node: ast.FunctionDef) -> list[ServiceCall]:
-        """Extract Home Assistant service calls from a method."""
-        service_calls = []
-        alias_map = self._build_alias_map(method_node)
-
-        for node in ast.walk(method_node):
-            if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
-                method_name = node.func.attr
-
-                # call_service method (handle before generic direct methods)
-                if method_name == "call_service":
-                    service_call = self._parse_call_service_call(node, method_node.name, alias_map)
-                    if service_call:
-                        service_calls.append(service_call)
-
-                # Direct AppDaemon service methods
-                elif method_name in self.service_patterns:
-                    service_call = self._parse_direct_service_call(node, method_name, method_node.name, alias_map)
-                    if service_call:
-                        service_calls.append(service_call)
-
-        return service_calls
-
     def _parse_direct_service_call(
-        self, call_node: ast.Call, method_name: str, containing_method: str, alias_map: dict[str, str] | None = None
+        self, call_node: ast.Call, method_name: str, containing_method: str, alias_map: Mapping[str, str] | None = None
     ) -> ServiceCall | None:
         """Parse direct service calls like turn_on, turn_off, etc."""
         args = call_node.args
-        kwargs = {kw.arg: self._get_value(kw.value) for kw in call_node.keywords}
+        kwargs = self._call_kwargs(call_node)
 
         # Map method names to service domains
-        service_mapping = {
-            "turn_on": ("homeassistant", "turn_on"),
-            "turn_off": ("homeassistant", "turn_off"),
-            "toggle": ("homeassistant", "toggle"),
-            "set_state": ("homeassistant", "set_state"),
-            "notify": ("notify", "notify"),
-        }
-
-        if method_name not in service_mapping:
+        mapped = _SERVICE_MAPPING.get(method_name)
+        if mapped is None:
             return ServiceCall(
                 service_domain="unknown",
                 service_name=method_name,
                 entity_id=self._resolve_alias_value(self._get_value(args[0]) if args else None, alias_map),
-                data={k: v for k, v in kwargs.items() if k is not None},
+                data=kwargs,
                 line_number=call_node.lineno,
                 method_name=containing_method,
             )
 
-        domain, service = service_mapping[method_name]
+        domain, service = mapped
         entity_id = self._resolve_alias_value(self._get_value(args[0]) if args else kwargs.get("entity_id"), alias_map)
 
         return ServiceCall(
             service_domain=domain,
             service_name=service,
             entity_id=entity_id,
-            data={k: v for k, v in kwargs.items() if k is not None},
+            data=kwargs,
             line_number=call_node.lineno,
             method_name=containing_method,
         )
 
     def _parse_call_service_call(
-        self, call_node: ast.Call, containing_method: str, alias_map: dict[str, str] | None = None
+        self, call_node: ast.Call, containing_method: str, alias_map: Mapping[str, str] | None = None
     ) -> ServiceCall | None:
         """Parse call_service method calls."""
         args = call_node.args
-        kwargs = {kw.arg: self._get_value(kw.value) for kw in call_node.keywords}
-
         if len(args) < 1:
             return None
 
@@ -924,48 +1339,33 @@ class AppDaemonParser:
         if not service_path or "." not in str(service_path):
             return None
 
-        domain, service = str(service_path).split(".", 1)
+        domain, service = map(sys.intern, str(service_path).split(".", 1))
+        kwargs = self._call_kwargs(call_node)
 
         return ServiceCall(
             service_domain=domain,
             service_name=service,
             entity_id=self._resolve_alias_value(kwargs.get("entity_id"), alias_map),
-            data={k: v for k, v in kwargs.items() if k is not None},
+            data=kwargs,
             line_number=call_node.lineno,
             method_name=containing_method,
         )
 
-    def _extract_time_schedules(self, method_node: ast.FunctionDef) -> list[TimeSchedule]:
-        """Extract time-based scheduling calls from a method."""
-        schedules = []
-
-        for node in ast.walk(method_node):
-            if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
-                method_name = node.func.attr
-
-                if method_name in self.time_patterns:
-                    schedule = self._parse_time_schedule_call(node, method_name)
-                    if schedule:
-                        schedules.append(schedule)
-
-        return schedules
-
     def _parse_time_schedule_call(self, call_node: ast.Call, schedule_type: str) -> TimeSchedule | None:
         """Parse time scheduling method calls."""
         args = call_node.args
-        kwargs = {kw.arg: self._get_value(kw.value) for kw in call_node.keywords}
-
         if len(args) < 1:
             return None
 
         callback_method = self._get_name(args[0])
+        kwargs = self._call_kwargs(call_node)
 
         # Extract time specification based on schedule type
         time_spec = None
         interval = None
         delay = None
 
-        if schedule_type in ["run_daily", "run_at"] and len(args) > 1:
+        if schedule_type in ("run_daily", "run_at") and len(args) > 1:
             time_spec = self._get_value(args[1])
         elif schedule_type == "run_every" and len(args) > 2:
             time_spec = self._get_value(args[1])
@@ -977,43 +1377,12 @@ class AppDaemonParser:
             callback_method=callback_method,
             schedule_type=schedule_type,
             time_spec=time_spec,
-            kwargs={k: v for k, v in kwargs.items() if k is not None},
+            kwargs=kwargs,
             line_number=call_node.lineno,
             interval=interval,
             delay=delay,
         )
 
-    def _extract_device_relationships(self, method_node: ast.FunctionDef) -> list[DeviceRelationship]:
-        """Extract device relationships from method logic."""
-        relationships = []
-
-        # Look for patterns where one entity affects another
-        for node in ast.walk(method_node):
-            if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
-                method_name = node.func.attr
-
-                if method_name in self.service_patterns:
-                    # Find entities being controlled
-                    args = node.args if hasattr(node, "args") else []
-                    if args:
-                        target_entity = self._get_value(args[0])
-
-                        # Look for trigger entity in method parameters or context
-                        trigger_entity = self._infer_trigger_entity(method_node)
-
-                        if trigger_entity and target_entity:
-                            relationships.append(
-                                DeviceRelationship(
-                                    trigger_entity=trigger_entity,
-                                    target_entity=target_entity,
-                                    relationship_type="controls",
-                                    line_number=node.lineno,
-                                    method_name=method_node.name,
-                                )
-                            )
-
-        return relationships
-
     def _infer_trigger_entity(self, method_node: ast.FunctionDef) -> str | None:
         """Infer the trigger entity from method signature and context."""
         # Check if method looks like a callback (has entity parameter)
@@ -1023,70 +1392,52 @@ class AppDaemonParser:
 
         # Look for patterns in method name
         method_name = method_node.name.lower()
-        if "motion" in method_name:
-            return "motion_sensor"
-        elif "door" in method_name:
-            return "door_sensor"
-        elif "temperature" in method_name:
-            return "temperature_sensor"
+        for hint, trigger in _TRIGGER_NAME_HINTS:
+            if hint in method_name:
+                return trigger
 
         return None
 
-    def _extract_automation_flows(self, method_node: ast.FunctionDef) -> list[AutomationFlow]:
-        """Extract automation logic flows from method code."""
-        flows = []
-
-        # Look for conditional logic (if statements)
-        for node in ast.walk(method_node):
-            if isinstance(node, ast.If):
-                flow = self._parse_conditional_flow(node, method_node.name)
-                if flow:
-                    flows.append(flow)
-            elif isinstance(node, ast.For) or isinstance(node, ast.While):
-                flow = self._parse_loop_flow(node, method_node.name)
-                if flow:
-                    flows.append(flow)
-
-        return flows
-
-    def _parse_conditional_flow(self, if_node: ast.If, method_name: str) -> AutomationFlow | None:
+    def _parse_conditional_flow(
+        self, if_node: ast.If, method_name: str, ctx: _ClassCtx | None = None
+    ) -> AutomationFlow | None:
         """Parse conditional logic flow from if statement."""
         conditions = []
         actions = []
         entities_involved = []
 
         # Extract condition
-        condition_text = self._extract_condition_text(if_node.test)
+        condition_text = self._naturalize_condition(if_node.test)
         if condition_text:
-            conditions.append(f"if {condition_text}")
+            conditions.append(f"when {condition_text}")
 
         # Extract actions from if body
         for stmt in if_node.body:
-            if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+            if type(stmt) is ast.Expr and type(stmt.value) is ast.Call:
                 action = self._extract_action_text(stmt.value)
                 if action:
                     actions.append(action)
 
         # Handle elif/else blocks
         for stmt in if_node.orelse:
-            if isinstance(stmt, ast.If):
-                elif_text = self._extract_condition_text(stmt.test)
+            if type(stmt) is ast.If:
+                elif_text = self._naturalize_condition(stmt.test)
                 if elif_text:
-                    conditions.append(f"elif {elif_text}")
+                    conditions.append(f"or when {elif_text}")
                 for sub in stmt.body:
-                    if isinstance(sub, ast.Expr) and isinstance(sub.value, ast.Call):
+                    if type(sub) is ast.Expr and type(sub.value) is ast.Call:
                         action = self._extract_action_text(sub.value)
                         if action:
                             actions.append(action)
             else:
                 # Else branch may contain direct calls; collect them as actions
-                if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+                if type(stmt) is ast.Expr and type(stmt.value) is ast.Call:
                     action = self._extract_action_text(stmt.value)
                     if action:
                         actions.append(action)
 
         # Extract entities from conditions and actions
-        entities_involved = self._extract_entities_from_flow(if_node)
+        entities_involved = self._entities_involved(if_node, ctx)
 
         if conditions or actions:
             return AutomationFlow(
@@ -1100,7 +1451,9 @@ class AppDaemonParser:
 
         return None
 
-    def _parse_loop_flow(self, loop_node: ast.For | ast.While, method_name: str) -> AutomationFlow | None:
+    def _parse_loop_flow(
+        self, loop_node: ast.For | ast.While, method_name: str, ctx: _ClassCtx | None = None
+    ) -> AutomationFlow | None:
         """Parse loop logic flow."""
         conditions = []
         actions = []
@@ -1109,24 +1462,29 @@ class AppDaemonParser:
         if isinstance(loop_node, ast.For):
             flow_type = "sequence"
             # Extract iteration target
-            target = self._extract_condition_text(loop_node.target)
-            iter_source = self._extract_condition_text(loop_node.iter)
-            conditions.append(f"for {target} in {iter_source}")
+            target = self._expr_to_text(loop_node.target, self._condition_constants)
+            iter_source = self._expr_to_text(loop_node.iter, self._condition_constants)
+            if target and iter_source:
+                conditions.append(f"for each {target} in {iter_source}")
+            elif iter_source:
+                conditions.append(f"for each item in {iter_source}")
+            else:
+                conditions.append(f"for each {target or 'item'}")
         else:
             flow_type = "loop"
             # Extract while condition
-            condition_text = self._extract_condition_text(loop_node.test)
+            condition_text = self._naturalize_condition(loop_node.test)
             if condition_text:
                 conditions.append(f"while {condition_text}")
 
         # Extract actions from loop body
         for stmt in loop_node.body:
-            if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+            if type(stmt) is ast.Expr and type(stmt.value) is ast.Call:
                 action = self._extract_action_text(stmt.value)
                 if action:
                     actions.append(action)
 
-        entities_involved = self._extract_entities_from_flow(loop_node)
+        entities_involved = self._entities_involved(loop_node, ctx)
 
         if conditions or actions:
             return AutomationFlow(
@@ -1140,39 +1498,46 @@ class AppDaemonParser:
 
         return None
 
-    def _analyze_method_actions(self, method_node: ast.FunctionDef) -> list[MethodAction]:
+    def _analyze_method_actions(self, method_node: ast.FunctionDef, ctx: _ClassCtx | None = None) -> list[MethodAction]:
         """Analyze method body to extract detailed action sequence."""
         actions: list[MethodAction] = []
+        if ctx is not None:
+            ctx.inlining.add(method_node.name)
 
         # Traverse only the direct body of the method to get the main flow
         for stmt in method_node.body:
-            self._analyze_statement_for_actions(stmt, actions)
+            self._analyze_statement_for_actions(stmt, actions, ctx)
+
+        if ctx is not None:
+            ctx.inlining.discard(method_node.name)
 
         return actions
 
-    def _analyze_statement_for_actions(self, stmt: ast.stmt, actions: list[MethodAction]) -> None:
+    def _analyze_statement_for_actions(
+        self, stmt: ast.stmt, actions: list[MethodAction], ctx: _ClassCtx | None = None
+    ) -> None:
         """Recursively analyze statements to extract actions."""
         # Conditional logic (if statements)
-        if isinstance(stmt, ast.If):
+        if type(stmt) is ast.If:
             actions.append(
                 MethodAction(
                     action_type="conditional_logic",
                     description="Conditional logic",
                     line_number=stmt.lineno,
-                    entities_involved=self._extract_entities_from_node(stmt.test),
+                    entities_involved=self._entities_involved(stmt.test, ctx),
                 )
             )
 
             # Analyze the body of the if statement
             for sub_stmt in stmt.body:
-                self._analyze_statement_for_actions(sub_stmt, actions)
+                self._analyze_statement_for_actions(sub_stmt, actions, ctx)
 
             # Analyze else clause if present
             for sub_stmt in stmt.orelse:
-                self._analyze_statement_for_actions(sub_stmt, actions)
+                self._analyze_statement_for_actions(sub_stmt, actions, ctx)
 
         # Loop iterations
-        elif isinstance(stmt, (ast.For, ast.While)):
+        elif type(stmt) is ast.For or type(stmt) is ast.While:
             description = "Loop iteration"
 
             actions.append(
@@ -1180,35 +1545,30 @@ class AppDaemonParser:
                     action_type="loop_iteration",
                     description=description,
                     line_number=stmt.lineno,
-                    entities_involved=self._extract_entities_from_node(stmt),
+                    entities_involved=self._entities_involved(stmt, ctx),
                 )
             )
 
             # Analyze loop body
             for sub_stmt in stmt.body:
-                self._analyze_statement_for_actions(sub_stmt, actions)
+                self._analyze_statement_for_actions(sub_stmt, actions, ctx)
 
         # Expression statements (method calls)
-        elif isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+        elif type(stmt) is ast.Expr and type(stmt.value) is ast.Call:
             call_node = stmt.value
-            if isinstance(call_node.func, ast.Attribute):
+            if type(call_node.func) is ast.Attribute:
                 method_name = call_node.func.attr
 
                 # Inline simple helper method calls inside callbacks to capture downstream actions
                 # e.g., update_sensors() -> _send_request() -> call_service(...)
-                try:
-                    if (
-                        isinstance(call_node.func.value, ast.Name)
-                        and call_node.func.value.id == "self"
-                        and method_name.startswith("_")
-                        and hasattr(self, "_current_class_method_nodes")
-                        and method_name in self._current_class_method_nodes
-                    ):
-                        callee = self._current_class_method_nodes[method_name]
+                if ctx is not None and method_name.startswith("_") and method_name not in ctx.inlining:
+                    callee = ctx.methods.get(method_name)
+                    receiver = call_node.func.value
+                    if callee is not None and type(receiver) is ast.Name and receiver.id == "self":
+                        ctx.inlining.add(method_name)
                         for sub in callee.body:
-                            self._analyze_statement_for_actions(sub, actions)
-                except Exception:
-                    pass
+                            self._analyze_statement_for_actions(sub, actions, ctx)
+                        ctx.inlining.discard(method_name)
 
                 # Detect different types of actions
                 if "notify" in method_name.lower() or "send_notify" in method_name.lower():
@@ -1224,7 +1584,7 @@ class AppDaemonParser:
                 elif method_name == "log":
                     actions.append(MethodAction(action_type="logging", description="Logging", line_number=stmt.lineno))
 
-                elif method_name in {"turn_on", "turn_off", "toggle", "call_service", "set_state"}:
+                elif method_name in _DEVICE_ACTION_METHODS:
                     entities = self._extract_entities_from_call_args(call_node)
                     actions.append(
                         MethodAction(
@@ -1236,7 +1596,7 @@ class AppDaemonParser:
                     )
 
         # Assignment statements (performance timing)
-        elif isinstance(stmt, ast.Assign):
+        elif type(stmt) is ast.Assign:
             for target in stmt.targets:
                 target_name = self._get_name(target)
                 if "perf_start" in target_name:
@@ -1256,28 +1616,57 @@ class AppDaemonParser:
                         )
                     )
 
+    def _collect_constant_references(self, nodes: Iterable[ast.AST]) -> list[str]:
+        """Distinct constant references (see ``_extract_constant_reference``) under ``nodes``.
+
+        References come out in source order, each chain before its shorter prefixes
+        (Home.Kitchen.Light, then Home.Kitchen), so the same code always lists them the same
+        way. Each attribute chain is read once from its outermost node, and the walk then
+        continues below the chain's root.
+        """
+        # Insertion-ordered set: duplicates are dropped as they are found
+        entities: dict[str, None] = {}
+        stack = list(nodes)
+        stack.reverse()
+        while stack:
+            node = stack.pop()
+            if type(node) is ast.Attribute:
+                attrs: list[str] = []
+                while type(node) is ast.Attribute:
+                    attrs.append(node.attr)
+                    node = node.value
+                if type(node) is ast.Name and node.id in _CONSTANT_NAMESPACES:
+                    names = [node.id]
+                    for attr in reversed(attrs):
+                        names.append(sys.intern(f"{names[-1]}.{attr}"))
+                    for name in reversed(names[1:]):
+                        entities.setdefault(name)
+            children = list(ast.iter_child_nodes(node))
+            children.reverse()
+            stack.extend(children)
+        return list(entities)
+
     def _extract_entities_from_node(self, node: ast.AST) -> list[str]:
         """Extract entity references from any AST node."""
-        entities = []
-        for child in ast.walk(node):
-            if isinstance(child, ast.Attribute):
-                entity_ref = self._extract_constant_reference(child)
-                if entity_ref:
-                    entities.append(entity_ref)
-        return list(set(entities))
+        return self._collect_constant_references((node,))
+
+    def _entities_involved(self, node: ast.AST, ctx: _ClassCtx | None = None) -> list[str]:
+        """Entity references under ``node``, collected once per class for nodes seen again.
+
+        A loop is described both as a method action and as an automation flow, and the
+        statements of an inlined helper are analysed again at every call site.
+        """
+        if ctx is None:
+            return self._extract_entities_from_node(node)
+        entities = ctx.entity_refs.get(node)
+        if entities is None:
+            entities = ctx.entity_refs[node] = self._extract_entities_from_node(node)
+        # Each record gets its own list; the cached one stays untouched
+        return list(entities)
 
     def _extract_entities_from_call_args(self, call_node: ast.Call) -> list[str]:
         """Extract entity references from method call arguments."""
-        entities = []
-        for arg in call_node.args:
-            entities.extend(self._extract_entities_from_node(arg))
-        for keyword in call_node.keywords:
-            entities.extend(self._extract_entities_from_node(keyword.value))
-        return list(set(entities))
-
-    def _extract_condition_text(self, test_node: ast.AST) -> str:
-        """Extract readable text from a condition (if/while test) node."""
-        return self._expr_to_text(test_node)
+        return self._collect_constant_references([*call_node.args, *(keyword.value for keyword in call_node.keywords)])
 
     def _extract_action_text(self, call_node: ast.Call) -> str:
         """Extract readable text from action call."""
@@ -1286,157 +1675,176 @@ class AppDaemonParser:
         return f"{func_text}({args_text})"
 
     # --- Expression pretty-printer helpers ---
-    def _expr_to_text(self, node: ast.AST) -> str:
-        """Convert an AST expression into a concise, human-readable string."""
+    def _expr_to_text(self, node: ast.AST, mapping: Mapping[str, str] | None = None) -> str:
+        """Convert an AST expression into a concise, human-readable string.
+
+        When ``mapping`` is given, names and attribute chains found in it are
+        rendered as their resolved values. The renderer is picked by exact node
+        type from ``_EXPR_TEXT_RENDERERS``; other nodes fall back to ``_get_name``.
+        """
+        render = self._EXPR_TEXT_RENDERERS.get(type(node))
         try:
-            if isinstance(node, ast.Constant):
-                return repr(node.value)
-            if isinstance(node, ast.Name):
-                return node.id
-            if isinstance(node, ast.Attribute):
-                return f"{self._expr_to_text(node.value)}.{node.attr}"
-            if isinstance(node, ast.Subscript):
-                base = self._expr_to_text(node.value)
-                sl = getattr(node, "slice", None)
-                sl_text = self._expr_to_text(sl) if sl is not None else ""
-                return f"{base}[{sl_text}]"
-            # ast.Index was removed in Python 3.9, handled by ast.Subscript directly now
-            if isinstance(node, ast.Slice):
-                lower = self._expr_to_text(node.lower) if node.lower else ""
-                upper = self._expr_to_text(node.upper) if node.upper else ""
-                step = self._expr_to_text(node.step) if node.step else ""
-                core = f"{lower}:{upper}"
-                return f"{core}:{step}" if step else core
-            if isinstance(node, ast.Call):
-                func = self._expr_to_text(node.func)
-                args = ", ".join(self._expr_to_text(a) for a in node.args)
-                return f"{func}({args})"
-            if isinstance(node, ast.UnaryOp):
-                op = self._unary_op_to_text(node.op)
-                return f"{op}{self._expr_to_text(node.operand)}"
-            if isinstance(node, ast.BinOp):
-                left = self._expr_to_text(node.left)
-                op = self._bin_op_to_text(node.op)
-                right = self._expr_to_text(node.right)
-                return f"({left} {op} {right})"
-            if isinstance(node, ast.BoolOp):
-                bool_op_text = self._bool_op_to_text(node.op)
-                return f" {bool_op_text} ".join(self._expr_to_text(v) for v in node.values)
-            if isinstance(node, ast.Compare):
-                left = self._expr_to_text(node.left)
-                cmp_parts: list[str] = []
-                for cmp_op, comp in zip(node.ops, node.comparators):
-                    cmp_parts.append(f"{self._cmp_op_to_text(cmp_op)} {self._expr_to_text(comp)}")
-                return f"{left} {' '.join(cmp_parts)}"
-            if isinstance(node, ast.JoinedStr):  # f-string
-                fparts: list[str] = []
-                for v in node.values:
-                    if isinstance(v, ast.Constant) and isinstance(v.value, str):
-                        fparts.append(v.value)
-                    elif isinstance(v, ast.FormattedValue):
-                        fparts.append("{" + self._expr_to_text(v.value) + "}")
-                return "f'" + "".join(fparts) + "'"
+            if render is not None:
+                return render(self, node, mapping)
             return self._get_name(node)
         except Exception:
             return self._get_name(node)
 
+    def _name_to_text(self, node: ast.Name, mapping: Mapping[str, str] | None) -> str:
+        return mapping.get(node.id, node.id) if mapping else node.id
+
+    def _constant_to_text(self, node: ast.Constant, mapping: Mapping[str, str] | None) -> str:
+        return repr(node.value)
+
+    def _subscript_to_text(self, node: ast.Subscript, mapping: Mapping[str, str] | None) -> str:
+        base = self._expr_to_text(node.value, mapping)
+        sl = getattr(node, "slice", None)
+        sl_text = self._expr_to_text(sl, mapping) if sl is not None else ""
+        return f"{base}[{sl_text}]"
+
+    def _slice_to_text(self, node: ast.Slice, mapping: Mapping[str, str] | None) -> str:
+        # ast.Index was removed in Python 3.9, handled by ast.Subscript directly now
+        lower = self._expr_to_text(node.lower, mapping) if node.lower else ""
+        upper = self._expr_to_text(node.upper, mapping) if node.upper else ""
+        step = self._expr_to_text(node.step, mapping) if node.step else ""
+        core = f"{lower}:{upper}"
+        return f"{core}:{step}" if step else core
+
+    def _call_to_text(self, node: ast.Call, mapping: Mapping[str, str] | None) -> str:
+        func = self._expr_to_text(node.func, mapping)
+        args = ", ".join(self._expr_to_text(a, mapping) for a in node.args)
+        return f"{func}({args})"
+
+    def _unary_to_text(self, node: ast.UnaryOp, mapping: Mapping[str, str] | None) -> str:
+        op = self._unary_op_to_text(node.op)
+        return f"{op}{self._expr_to_text(node.operand, mapping)}"
+
+    def _binary_to_text(self, node: ast.BinOp, mapping: Mapping[str, str] | None) -> str:
+        left = self._expr_to_text(node.left, mapping)
+        op = self._bin_op_to_text(node.op)
+        right = self._expr_to_text(node.right, mapping)
+        return f"({left} {op} {right})"
+
+    def _bool_to_text(self, node: ast.BoolOp, mapping: Mapping[str, str] | None) -> str:
+        bool_op_text = self._bool_op_to_text(node.op)
+        return f" {bool_op_text} ".join(self._expr_to_text(v, mapping) for v in node.values)
+
+    def _compare_to_text(self, node: ast.Compare, mapping: Mapping[str, str] | None) -> str:
+        left = self._expr_to_text(node.left, mapping)
+        cmp_parts: list[str] = []
+        for cmp_op, comp in zip(node.ops, node.comparators):
+            cmp_parts.append(f"{self._cmp_op_to_text(cmp_op)} {self._expr_to_text(comp, mapping)}")
+        return f"{left} {' '.join(cmp_parts)}"
+
+    def _fstring_to_text(self, node: ast.JoinedStr, mapping: Mapping[str, str] | None) -> str:
+        fparts: list[str] = []
+        for v in node.values:
+            if type(v) is ast.Constant and isinstance(v.value, str):
+                fparts.append(v.value)
+            elif type(v) is ast.FormattedValue:
+                fparts.append("{" + self._expr_to_text(v.value, mapping) + "}")
+        return "f'" + "".join(fparts) + "'"
+
+    def _attribute_to_text(self, node: ast.Attribute, mapping: Mapping[str, str] | None) -> str:
+        """Render an attribute chain, replacing its longest prefix found in ``mapping``.
+
+        The chain is unrolled once instead of re-rendering every shorter prefix on the way down.
+        """
+        attrs: list[str] = []
+        root: ast.AST = node
+        while type(root) is ast.Attribute:
+            attrs.append(root.attr)
+            root = root.value
+        attrs.reverse()
+        if mapping:
+            # Try Home.Kitchen.Light, then Home.Kitchen, then Home.*; the root itself is handled below
+            prefix = self._expr_to_text(root)
+            names = [prefix]
+            for attr in attrs:
+                names.append(f"{names[-1]}.{attr}")
+            for depth in range(len(attrs), 0, -1):
+                resolved = mapping.get(names[depth])
+                if resolved is not None:
+                    return ".".join([resolved, *attrs[depth:]])
+        return ".".join([self._expr_to_text(root, mapping), *attrs])
+
+    # Expression renderers keyed by exact node type: one dict lookup instead of a cascade of type tests
+    _EXPR_TEXT_RENDERERS: ClassVar[dict[type[ast.AST], Callable[..., str]]] = {
+        ast.Attribute: _attribute_to_text,
+        ast.Name: _name_to_text,
+        ast.Constant: _constant_to_text,
+        ast.Subscript: _subscript_to_text,
+        ast.Slice: _slice_to_text,
+        ast.Call: _call_to_text,
+        ast.UnaryOp: _unary_to_text,
+        ast.BinOp: _binary_to_text,
+        ast.BoolOp: _bool_to_text,
+        ast.Compare: _compare_to_text,
+        ast.JoinedStr: _fstring_to_text,
+    }
+
     def _bool_op_to_text(self, op: ast.boolop) -> str:
-        return "and" if isinstance(op, ast.And) else ("or" if isinstance(op, ast.Or) else type(op).__name__.lower())
+        return _BOOL_OP_TEXT.get(type(op)) or type(op).__name__.lower()
 
     def _unary_op_to_text(self, op: ast.unaryop) -> str:
-        if isinstance(op, ast.Not):
-            return "not "
-        if isinstance(op, ast.USub):
-            return "-"
-        if isinstance(op, ast.UAdd):
-            return "+"
-        if isinstance(op, ast.Invert):
-            return "~"
-        return type(op).__name__
+        return _UNARY_OP_TEXT.get(type(op)) or type(op).__name__
 
     def _bin_op_to_text(self, op: ast.operator) -> str:
-        mapping = {
-            ast.Add: "+",
-            ast.Sub: "-",
-            ast.Mult: "*",
-            ast.MatMult: "@",
-            ast.Div: "/",
-            ast.Mod: "%",
-            ast.Pow: "**",
-            ast.FloorDiv: "//",
-            ast.BitOr: "|",
-            ast.BitAnd: "&",
-            ast.BitXor: "^",
-            ast.LShift: "<<",
-            ast.RShift: ">>",
-        }
-        for k, v in mapping.items():
-            if isinstance(op, k):
-                return v
-        return type(op).__name__
+        return _BIN_OP_TEXT.get(type(op)) or type(op).__name__
 
     def _cmp_op_to_text(self, op: ast.cmpop) -> str:
-        mapping = {
-            ast.Eq: "==",
-            ast.NotEq: "!=",
-            ast.Lt: "<",
-            ast.LtE: "<=",
-            ast.Gt: ">",
-            ast.GtE: ">=",
-            ast.Is: "is",
-            ast.IsNot: "is not",
-            ast.In: "in",
-            ast.NotIn: "not in",
-        }
-        for k, v in mapping.items():
-            if isinstance(op, k):
-                return v
-        return type(op).__name__
+        return _CMP_OP_TEXT.get(type(op)) or type(op).__name__
 
     def _extract_entities_from_flow(self, node: ast.AST) -> list[str]:
         """Extract entity references from flow logic."""
-        entities = []
-
-        for child_node in ast.walk(node):
-            if isinstance(child_node, ast.Attribute):
-                entity_ref = self._extract_constant_reference(child_node)
-                if entity_ref:
-                    entities.append(entity_ref)
-
-        return list(set(entities))
+        return self._collect_constant_references((node,))
 
     def _extract_constant_reference(self, node: ast.Attribute) -> str | None:
         """Extract constant references like Home.Kitchen.Light or Persons.user."""
+        parts: list[str] = []
+        root: ast.AST = node
+        while type(root) is ast.Attribute:
+            parts.append(root.attr)
+            root = root.value
+
+        # Filter for known constant patterns: a dotted name rooted at a known namespace
+        if not parts or type(root) is not ast.Name or root.id not in _CONSTANT_NAMESPACES:
+            return None
+        parts.append(root.id)
+        parts.reverse()
+        return sys.intern(".".join(parts))
 
-        def get_full_attr_name(node: ast.AST) -> str:
-            if isinstance(node, ast.Name):
-                return node.id
-            elif isinstance(node, ast.Attribute):
-                return f"{get_full_attr_name(node.value)}.{node.attr}"
-            return ""
-
-        full_name = get_full_attr_name(node)
-
-        # Filter for known constant patterns
-        if any(full_name.startswith(prefix) for prefix in ["Home.", "Persons.", "Actions.", "General."]):
-            return full_name
+    def _extract_module_constant_maps(
+        self, tree: ast.Module, module_nodes: _ModuleNodes
+    ) -> tuple[dict[str, str], dict[str, str]]:
+        """Attribute-assigned and class-nested constants of a module, in that (merge) order.
 
-        return None
+        Neither re-walks the tree: the attribute assignments come from the nodes bucketed by
+        ``module_nodes`` and the class constants from the bodies of module-level classes.
+        """
+        return (
+            self._extract_constant_value_map(tree, module_nodes.constants),
+            self._extract_class_constant_value_map(tree),
+        )
 
-    def _extract_constant_value_map(self, tree: ast.AST) -> dict[str, str]:
+    def _extract_constant_value_map(self, tree: ast.AST, nodes: list[ast.AST] | None = None) -> dict[str, str]:
         """Extract assignments of the form Namespace.Sub.property = "value" into a map.
 
         This allows resolving code constants like Home.Kitchen.Light to actual entity ids
-        such as light.kitchen, when defined in the same module.
+        such as light.kitchen, when defined in the same module. ``nodes`` may carry the
+        candidate nodes already collected from ``tree`` to avoid another walk.
         """
         mapping: dict[str, str] = {}
 
         def full_attr(n: ast.AST) -> str:
-            if isinstance(n, ast.Name):
-                return n.id
-            if isinstance(n, ast.Attribute):
-                return f"{full_attr(n.value)}.{n.attr}"
-            return ""
+            # Walk down the attribute chain instead of recursing once per segment
+            parts: list[str] = []
+            while type(n) is ast.Attribute:
+                parts.append(n.attr)
+                n = n.value
+            parts.append(n.id if isinstance(n, ast.Name) else "")
+            parts.reverse()
+            return ".".join(parts)
 
         def eval_str(node: ast.AST) -> str | None:
             # Try to statically evaluate a string-like value
@@ -1460,23 +1868,23 @@ class AppDaemonParser:
                     return left + right
             return None
 
-        for node in ast.walk(tree):
+        for node in ast.walk(tree) if nodes is None else nodes:
             # Simple assignments like Home.Kitchen.Light = "light.kitchen"
-            if isinstance(node, ast.Assign):
-                if len(node.targets) == 1 and isinstance(node.targets[0], ast.Attribute):
+            if type(node) is ast.Assign:
+                if len(node.targets) == 1 and type(node.targets[0]) is ast.Attribute:
                     key = full_attr(node.targets[0])
                     sval = eval_str(node.value)
                     if isinstance(sval, str):
                         mapping[key] = sval
             # Annotated assignment: Home.Alarm: str = "alarm_control_panel.home"
-            elif isinstance(node, ast.AnnAssign):
-                if isinstance(node.target, ast.Attribute):
+            elif type(node) is ast.AnnAssign:
+                if type(node.target) is ast.Attribute:
                     sval = eval_str(node.value) if node.value is not None else None
                     if isinstance(sval, str):
                         key = full_attr(node.target)
                         mapping[key] = sval
             # Calls like setattr(Home.Kitchen, "Light", "light.kitchen")
-            elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "setattr":
+            elif type(node) is ast.Call and type(node.func) is ast.Name and node.func.id == "setattr":
                 try:
                     obj, attr_name, value = node.args[0], node.args[1], node.args[2]
                     base = full_attr(obj)
@@ -1498,35 +1906,53 @@ class AppDaemonParser:
         """
         mapping: dict[str, str] = {}
 
-        def walk_class(cls: ast.ClassDef, prefix: str) -> None:
-            current_prefix = f"{prefix}.{cls.name}" if prefix else cls.name
-            for item in cls.body:
-                if isinstance(item, ast.Assign):
-                    for target in item.targets:
-                        if (
-                            isinstance(target, ast.Name)
-                            and isinstance(item.value, ast.Constant)
-                            and isinstance(item.value.value, str)
-                        ):
-                            mapping[f"{current_prefix}.{target.id}"] = item.value.value
-                elif isinstance(item, ast.AnnAssign):
+        # Explicit stack of (remaining body, prefix) instead of one recursive call per nested class;
+        # a nested class is finished before the rest of its parent's body, keeping the recursive key order
+        stack: list[tuple[Iterator[ast.stmt], str]] = [
+            (iter(node.body), node.name) for node in reversed(tree.body) if type(node) is ast.ClassDef
+        ]
+        while stack:
+            body, prefix = stack[-1]
+            for item in body:
+                if type(item) is ast.Assign:
+                    value = item.value
+                    if type(value) is ast.Constant and isinstance(value.value, str):
+                        for target in item.targets:
+                            if type(target) is ast.Name:
+                                mapping[f"{prefix}.{target.id}"] = value.value
+                elif type(item) is ast.AnnAssign:
+                    target, annotated = item.target, item.value
                     if (
-                        isinstance(item.target, ast.Name)
-                        and isinstance(item.value, ast.Constant)
-                        and isinstance(item.value.value, str)
+                        type(target) is ast.Name
+                        and type(annotated) is ast.Constant
+                        and isinstance(annotated.value, str)
                     ):
-                        mapping[f"{current_prefix}.{item.target.id}"] = item.value.value
-                elif isinstance(item, ast.ClassDef):
-                    walk_class(item, current_prefix)
-
-        for node in tree.body:
-            if isinstance(node, ast.ClassDef):
-                walk_class(node, prefix="")
+                        mapping[f"{prefix}.{target.id}"] = annotated.value
+                elif type(item) is ast.ClassDef:
+                    stack.append((iter(item.body), f"{prefix}.{item.name}"))
+                    break
+            else:
+                stack.pop()
 
         return mapping
 
+    def _imported_module_names(
+        self, tree: ast.AST, nodes: list[ast.Import | ast.ImportFrom] | None = None
+    ) -> list[str]:
+        """Names of the modules imported anywhere in ``tree`` (or in its already collected import ``nodes``)."""
+        modules: list[str] = []
+        for node in _collect_module_nodes(tree).imports if nodes is None else nodes:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.name:
+                        modules.append(alias.name)
+            elif isinstance(node, ast.ImportFrom):
+                if node.module:
+                    modules.append(node.module)
+        return modules
+
     def _extract_imported_constant_maps(
-        self, file_path: Path, tree: ast.AST, depth: int = 0, visited: set[str] | None = None
+        self, file_path: Path, modules: list[str], depth: int = 0, visited: set[str] | None = None
     ) -> list[dict[str, str]]:
         """Extract constant maps from imported modules by statically resolving module files.
 
@@ -1540,17 +1966,6 @@ class AppDaemonParser:
             return []
 
         current_dir = Path(file_path).parent
-        modules: list[str] = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    if alias.name:
-                        modules.append(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    modules.append(node.module)
-
         collected: list[dict[str, str]] = []
 
         for mod in modules:
@@ -1558,8 +1973,9 @@ class AppDaemonParser:
                 continue
             visited.add(mod)
 
+            # Every candidate below has just been checked to exist, so it is not stat'ed again
             candidate = self._find_module_file(mod, current_dir)
-            if not candidate or not candidate.exists():
+            if candidate is None:
                 # Heuristic: look for sibling const.py/constants.py
                 if any(tok in mod.lower() for tok in ("const", "constants")):
                     for name in ("const.py", "constants.py"):
@@ -1568,34 +1984,40 @@ class AppDaemonParser:
                             candidate = alt
                             break
             # Try APPS_DIR/const.py for modules named 'const' when not found
-            if (not candidate or not candidate.exists()) and self._apps_dir:
+            if candidate is None and self._apps_dir:
                 if mod.split(".")[-1].lower() in ("const", "constants"):
                     alt = self._apps_dir / "const.py"
                     if alt.exists():
                         candidate = alt
-            if not candidate or not candidate.exists():
+            if candidate is None:
                 continue
 
             key = str(candidate.resolve())
-            if key in self._module_const_cache:
-                collected.append(self._module_const_cache[key])
+            cached = self._module_const_cache.get(key)
+            if cached is not None and all(self._stat_key(path) == st for path, st in cached[0].items()):
+                self._parse_deps.update(cached[0])
+                collected.append(cached[1])
                 continue
 
+            # Collect the files this module's map is built from separately so the entry can be validated later
+            outer_deps = self._parse_deps
+            self._parse_deps = set()
             try:
-                cmap = self._extract_constant_map_from_path(candidate)
+                cmap, submodules = self._load_module_constants(candidate, key)
                 # Recurse into that module's imports (bounded)
-                other_source = candidate.read_text(encoding="utf-8")
-                other_tree = ast.parse(other_source)
-                submaps = self._extract_imported_constant_maps(candidate, other_tree, depth + 1, visited)
+                submaps = self._extract_imported_constant_maps(candidate, submodules, depth + 1, visited)
                 merged: dict[str, str] = {}
                 for sm in submaps:
                     merged.update(sm)
                 merged.update(cmap)
-                self._module_const_cache[key] = merged
+                self._module_const_cache[key] = ({path: self._dep_stats.get(path) for path in self._parse_deps}, merged)
                 collected.append(merged)
             except Exception:
                 # Ignore any issues with imported modules; best-effort resolution
                 continue
+            finally:
+                outer_deps |= self._parse_deps
+                self._parse_deps = outer_deps
 
         return collected
 
@@ -1633,36 +2055,101 @@ class AppDaemonParser:
 
     def _extract_constant_map_from_path(self, path: Path) -> dict[str, str]:
         """Parse a module file and extract constant map using the same AST logic."""
-        source = path.read_text(encoding="utf-8")
-        other_tree = ast.parse(source)
-        mapping = self._extract_constant_value_map(other_tree)
-        class_mapping = self._extract_class_constant_value_map(other_tree)
-        merged: dict[str, str] = {}
-        merged.update(mapping)
-        merged.update(class_mapping)
-        return merged
+        return self._load_module_constants(path)[0]
+
+    def _load_module_constants(self, path: Path, resolved: str | None = None) -> tuple[dict[str, str], list[str]]:
+        """
+        Constant map and imported module names of a module file.
+
+        Results are memoized across parser instances while the file's
+        (mtime_ns, size) is unchanged, so a shared const.py is parsed once
+        rather than once per app file; with a cache directory they are also
+        persisted across restarts. The returned map must not be mutated.
+        ``resolved`` may pass in the already resolved path to skip resolving it again.
+        """
+        if resolved is None:
+            resolved = str(path.resolve())
+        stat_key = self._stat_key(path)
+        self._dep_stats[resolved] = stat_key
+        self._parse_deps.add(resolved)
+        if stat_key is not None:
+            with _constant_map_lock:
+                cached = _constant_map_cache.get(resolved)
+                if cached is not None and cached[0] == stat_key:
+                    _constant_map_cache.move_to_end(resolved)
+                    return cached[1], cached[2]
+
+        # Persisted constants outlive the process, so a restart does not re-parse every constant module
+        cache_dir = self._cache_dir
+        cache_path = self._module_cache_path(cache_dir, resolved) if cache_dir and stat_key is not None else None
+        loaded = self._load_cached_module(cache_path, resolved, stat_key) if cache_path and stat_key else None
+        if loaded is not None:
+            merged, modules = loaded
+        else:
+            source = path.read_bytes()
+            other_tree = ast.parse(source, filename=str(path))
+            module_nodes = _collect_module_nodes(other_tree)
+            mapping, class_mapping = self._extract_module_constant_maps(other_tree, module_nodes)
+            merged = {key: _intern(value) for layer in (mapping, class_mapping) for key, value in layer.items()}
+            modules = self._imported_module_names(other_tree, module_nodes.imports)
+            if cache_dir is not None and cache_path is not None:
+                self._store_cached_parse(cache_dir, cache_path, {resolved: stat_key}, (merged, modules))
+
+        if stat_key is not None:
+            with _constant_map_lock:
+                _constant_map_cache[resolved] = (stat_key, merged, modules)
+                _constant_map_cache.move_to_end(resolved)
+                while len(_constant_map_cache) > CONSTANT_MAP_CACHE_SIZE:
+                    _constant_map_cache.popitem(last=False)
+        return merged, modules
 
     def _get_name(self, node: ast.AST) -> str:
         """Get the name from various AST node types."""
-        if isinstance(node, ast.Name):
+        if type(node) is ast.Name:
             return node.id
-        elif isinstance(node, ast.Attribute):
-            return f"{self._get_name(node.value)}.{node.attr}"
-        elif isinstance(node, ast.Constant):
+        elif type(node) is ast.Attribute:
+            attrs: list[str] = []
+            root: ast.AST = node
+            while type(root) is ast.Attribute:
+                attrs.append(root.attr)
+                root = root.value
+            attrs.append(self._get_name(root))
+            attrs.reverse()
+            # Dotted names (callbacks such as self.on_motion, base classes) recur across classes and files
+            return sys.intern(".".join(attrs))
+        elif type(node) is ast.Constant:
             return str(node.value)
         return ""
 
+    def _call_kwargs(self, call_node: ast.Call) -> dict[str, Any]:
+        """Named keyword arguments of a call as name -> value; ``**`` expansions are skipped unevaluated."""
+        kwargs: dict[str, Any] = {}
+        for kw in call_node.keywords:
+            if kw.arg is None:
+                continue
+            value = kw.value
+            # Literal keywords are by far the most common; skip the _get_value dispatch for them
+            kwargs[kw.arg] = value.value if type(value) is ast.Constant else self._get_value(value)
+        return kwargs
+
+    def _call_keyword(self, call_node: ast.Call, name: str) -> Any:
+        """Value of a single keyword argument, or None, without evaluating the call's other keywords."""
+        for kw in call_node.keywords:
+            if kw.arg == name:
+                return self._get_value(kw.value)
+        return None
+
     def _get_value(self, node: ast.AST) -> Any:
         """Extract value from AST node."""
-        if isinstance(node, ast.Constant):
+        if type(node) is ast.Constant:
             return node.value
-        elif isinstance(node, ast.Name):
+        elif type(node) is ast.Name:
             return node.id
-        elif isinstance(node, ast.Attribute):
+        elif type(node) is ast.Attribute:
             return self._get_name(node)
-        elif isinstance(node, ast.List):
+        elif type(node) is ast.List:
             return [self._get_value(elt) for elt in node.elts]
-        elif isinstance(node, ast.Dict):
+        elif type(node) is ast.Dict:
             return {
                 self._get_value(k) if k is not None else None: self._get_value(v)
                 for k, v in zip(node.keys, node.values)
@@ -1684,12 +2171,12 @@ class AppDaemonParser:
                         key = target.id
                         resolved_value = self._get_value(value)
                         if isinstance(resolved_value, str):
-                            alias_map[key] = resolved_value
+                            alias_map[key] = sys.intern(resolved_value)
         except Exception:
             pass
         return alias_map
 
-    def _resolve_alias_value(self, value: Any, alias_map: dict[str, str] | None) -> Any:
+    def _resolve_alias_value(self, value: Any, alias_map: Mapping[str, str] | None) -> Any:
         if isinstance(value, str) and alias_map and value in alias_map:
             return alias_map[value]
         return value
@@ -1699,7 +2186,7 @@ class AppDaemonParser:
         if self.apps_yaml_path and self.apps_yaml_path.exists():
             try:
                 with open(self.apps_yaml_path, "r", encoding="utf-8") as f:
-                    loaded = yaml.safe_load(f)
+                    loaded = yaml.load(f, Loader=_YAML_LOADER)
                     if isinstance(loaded, dict):
                         self.apps_config = loaded
                     elif loaded is None:
@@ -1811,20 +2298,7 @@ class AppDaemonParser:
                     pattern.has_helpers_injection = True
 
                     # Extract helper methods being used
-                    helper_patterns = [
-                        "send_notify",
-                        "notify_telegram",
-                        "log_action",
-                        "get_state_with_retry",
-                        "wait_for_state",
-                        "check_condition",
-                        "format_message",
-                        "parse_entity",
-                    ]
-
-                    for helper_method in helper_patterns:
-                        if helper_method in source:
-                            helper_methods_set.add(helper_method)
+                    helper_methods_set.update(name for name in _HELPER_METHOD_NAMES if name in source)
 
                 # Look for dependency injection patterns
                 if "dependencies" in source or "self.get_app(" in source:
@@ -1852,17 +2326,17 @@ class AppDaemonParser:
                 if "try:" in source and ("except" in source or "finally" in source):
                     pattern.has_try_catch = True
 
-                # Check for error notifications
-                if "error" in source and ("notify" in source or "telegram" in source):
-                    pattern.error_notification = True
+                if "error" in source:
+                    # Check for error notifications
+                    if "notify" in source or "telegram" in source:
+                        pattern.error_notification = True
 
-                # Check for logging on errors
-                if "error" in source and "log" in source:
-                    pattern.logging_on_error = True
+                    # Check for logging on errors
+                    if "log" in source:
+                        pattern.logging_on_error = True
 
                 # Look for recovery mechanisms
-                recovery_keywords = ["retry", "fallback", "recover", "backup", "alternative"]
-                for keyword in recovery_keywords:
+                for keyword in _RECOVERY_KEYWORDS:
                     if keyword in source:
                         recovery_mechanisms_set.add(f"{keyword} mechanism in {method.name}")
 
@@ -1918,8 +2392,13 @@ class AppDaemonParser:
 
         return hierarchy
 
-    def _analyze_performance_pattern(self, method_node: ast.FunctionDef) -> PerformancePattern | None:
-        """Analyze method for performance monitoring patterns."""
+    def _analyze_performance_pattern(
+        self, method_node: ast.FunctionDef, source_text: str | None = None
+    ) -> PerformancePattern | None:
+        """Analyze method for performance monitoring patterns.
+
+        ``source_text`` is the method source when the caller already sliced it.
+        """
         has_timing = False
         threshold_ms = None
         start_variable = None
@@ -1928,10 +2407,9 @@ class AppDaemonParser:
         line_number = method_node.lineno
 
         # Look for performance timing patterns in method source
-        if method_node.end_lineno:
-            source_text = "\n".join(self.source_lines[method_node.lineno - 1 : method_node.end_lineno])
-        else:
-            source_text = "\n".join(self.source_lines[method_node.lineno - 1 : method_node.lineno + 10])
+        if source_text is None:
+            end_line = method_node.end_lineno or method_node.lineno + 10
+            source_text = "\n".join(self.source_lines[method_node.lineno - 1 : end_line])
 
         # Enhanced performance pattern detection
         if "perf_start" in source_text or "time.time()" in source_text:
@@ -1939,7 +2417,7 @@ class AppDaemonParser:
             start_variable = "perf_start"
 
         # Look for specific threshold patterns (300ms is common in this codebase)
-        for pattern in self.threshold_patterns:
+        for pattern in _THRESHOLD_PATTERNS:
             match = pattern.search(source_text)
             if match:
                 threshold_ms = int(match.group(1))
@@ -1951,15 +2429,14 @@ class AppDaemonParser:
                 threshold_ms = 300
 
         # Check for performance alert patterns
-        alert_patterns = ["PERFORMANCE ALERT", "⚠️", "performance warning", "slow execution", "execution exceeded"]
-
-        for alert in alert_patterns:
-            if alert.lower() in source_text.lower():
-                alert_pattern = f"⚠️ {alert.upper()}"
+        lowered_source = source_text.lower()
+        for needle, label in _PERFORMANCE_ALERTS:
+            if needle in lowered_source:
+                alert_pattern = label
                 break
 
         # Check for execution logging patterns
-        for pattern in self.log_patterns:
+        for pattern in _LOG_PATTERNS:
             if pattern.search(source_text):
                 log_pattern = "[Exec: {perf_time_ms:.1f}ms]"
                 break
@@ -1977,16 +2454,41 @@ class AppDaemonParser:
         return None
 
 
-def parse_appdaemon_file(file_path: str | Path, apps_yaml_path: str | Path | None = None) -> ParsedFile:
+# Parser owned by the current parse_many worker, created once per process by the pool initializer
+_worker_parser: AppDaemonParser | None = None
+
+
+def _init_parse_worker(apps_yaml_path: str | Path | None, cache_dir: str | Path | None) -> None:
+    global _worker_parser
+    _worker_parser = AppDaemonParser(apps_yaml_path=apps_yaml_path, cache_dir=cache_dir)
+
+
+def _parse_or_error(parser: AppDaemonParser, path: Path) -> ParsedFile | Exception:
+    try:
+        return parser.parse_file(path)
+    except Exception as e:
+        return e
+
+
+def _parse_in_worker(path: Path) -> ParsedFile | Exception:
+    if _worker_parser is None:
+        raise RuntimeError("parse worker used before _init_parse_worker ran")
+    return _parse_or_error(_worker_parser, path)
+
+
+def parse_appdaemon_file(
+    file_path: str | Path, apps_yaml_path: str | Path | None = None, cache_dir: str | Path | None = None
+) -> ParsedFile:
     """
     Convenience function to parse an AppDaemon file.
 
     Args:
         file_path: Path to the Python file to parse
         apps_yaml_path: Optional path to apps.yaml configuration file
+        cache_dir: Optional directory for persisting parse results across runs
 
     Returns:
         ParsedFile containing all extracted information
     """
-    parser = AppDaemonParser(apps_yaml_path=apps_yaml_path)
+    parser = AppDaemonParser(apps_yaml_path=apps_yaml_path, cache_dir=cache_dir)
     return parser.parse_file(file_path)
@@ -2,6 +2,8 @@
 
 import hashlib
 import logging
+import os
+from collections import OrderedDict
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -15,6 +17,7 @@ logger = logging.getLogger(__name__)
 # Constants for timeout values
 TITLE_EXTRACTION_MAX_BYTES = 1000
 TITLE_EXTRACTION_MAX_LINES = 10
+TITLE_CACHE_SIZE = 512
 
 
 class DocumentationService:
@@ -30,6 +33,32 @@ class DocumentationService:
         """
         self.docs_dir = docs_dir
         self.markdown_processor = markdown_processor
+        # Last file listing, keyed by the docs directory signature it was built from
+        self._file_list_cache: tuple[str, list[dict[str, str | int]]] | None = None
+        # LRU of extracted titles keyed by (path, mtime_ns, size), so a rewritten file gets a fresh entry
+        self._title_cache: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+
+    def get_signature(self) -> str | None:
+        """
+        Cheap change signature of the documentation directory.
+
+        Uses a single scandir pass: the number of markdown files and the newest
+        mtime among them and the directory itself (which also moves on renames).
+
+        Returns:
+            Hex signature string, or None if the directory does not exist
+        """
+        try:
+            count = 0
+            newest = os.stat(self.docs_dir).st_mtime_ns
+            with os.scandir(self.docs_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".md"):
+                        count += 1
+                        newest = max(newest, entry.stat().st_mtime_ns)
+        except OSError:
+            return None
+        return f"{count:x}-{newest:x}"
 
     async def get_file_list(self) -> list[dict[str, str | int]]:
         """
@@ -38,11 +67,19 @@ class DocumentationService:
         Returns:
             List of file metadata dictionaries
         """
-        if not self.docs_dir.exists():
+        signature = self.get_signature()
+        if signature is None:
             return []
+        if self._file_list_cache is not None and self._file_list_cache[0] == signature:
+            return list(self._file_list_cache[1])
 
         files: list[dict[str, str | int]] = []
+        complete = True
         for file_path in self.docs_dir.glob("*.md"):
+            # The generated index is left out of listings for UX (still accessible directly),
+            # so skip it before paying for its stat and title read
+            if file_path.name == "README.md":
+                continue
             try:
                 stat = file_path.stat()
                 files.append({
@@ -56,13 +93,15 @@ class DocumentationService:
                 logger.warning(f"Error reading file {file_path}: {e}")
                 # Preserve original exception for better debugging
                 logger.debug(f"Full exception details for {file_path}", exc_info=True)
+                complete = False
                 continue
 
-        # Sort by name for consistent ordering
         # Sort case-insensitively by name for consistent ordering
-        # Filter out the generated index from listings for UX (still accessible directly)
-        files = [f for f in files if f.get("name") != "README.md"]
-        return sorted(files, key=lambda x: str(x["name"]).lower())
+        files.sort(key=lambda x: str(x["name"]).lower())
+        # Only memoize complete listings so a transient read error is retried next time
+        if complete:
+            self._file_list_cache = (signature, files)
+        return list(files)
 
     async def extract_title(self, file_path: Path) -> str:
         """
@@ -74,22 +113,42 @@ class DocumentationService:
         Returns:
             Extracted or fallback title
         """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return file_path.stem.replace("_", " ").replace("-", " ").title()
+
+        cache_key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        cached = self._title_cache.get(cache_key)
+        if cached is not None:
+            self._title_cache.move_to_end(cache_key)
+            return cached
+
+        title = None
         try:
             with open(file_path, encoding="utf-8") as f:
                 line_count = 0
                 for line in f:
                     line = line.strip()
                     if line.startswith("# "):
-                        return line[2:].strip()
+                        title = line[2:].strip()
+                        break
                     line_count += 1
                     # Stop after first 10 lines to avoid reading entire file
                     if line_count >= TITLE_EXTRACTION_MAX_LINES:
                         break
         except Exception:
-            pass
+            # Leave read failures uncached so they are retried
+            return file_path.stem.replace("_", " ").replace("-", " ").title()
+
+        if title is None:
+            # Fallback to filename without extension
+            title = file_path.stem.replace("_", " ").replace("-", " ").title()
 
-        # Fallback to filename without extension
-        return file_path.stem.replace("_", " ").replace("-", " ").title()
+        self._title_cache[cache_key] = title
+        if len(self._title_cache) > TITLE_CACHE_SIZE:
+            self._title_cache.popitem(last=False)
+        return title
 
     async def get_file_content(self, filename: str) -> tuple[str, str]:
         """
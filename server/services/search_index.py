@@ -0,0 +1,171 @@
+"""In-memory inverted index over the generated documentation files."""
+
+import bisect
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+@dataclass
+class IndexedDocument:
+    """A single markdown file held by the search index."""
+
+    path: Path
+    mtime_ns: int
+    size: int
+    content: str
+    lowered: str
+    tokens: frozenset[str] = field(default_factory=frozenset)
+
+
+class SearchIndex:
+    """
+    Token postings over the markdown files of a documentation directory.
+
+    The index is refreshed incrementally: each refresh is one scandir pass that
+    only re-reads files whose mtime or size changed, so files rewritten by the
+    watcher are picked up without an explicit invalidation hook. Postings are
+    used to narrow the candidate set; callers still verify matches against the
+    cached lowercased text, so substring semantics are preserved.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._root: Path | None = None
+        # Bumped whenever the indexed documents change; keys caches derived from the index
+        self.version = 0
+        self._docs: dict[str, IndexedDocument] = {}
+        self._postings: dict[str, set[str]] = {}
+        # Newline-joined vocabulary with each token's start offset, rebuilt lazily after postings change
+        self._vocabulary: tuple[str, list[int], list[str]] | None = None
+
+    def __len__(self) -> int:
+        """Return the number of indexed documents."""
+        return len(self._docs)
+
+    def _add_postings(self, doc: IndexedDocument) -> None:
+        self.version += 1
+        self._vocabulary = None
+        for token in doc.tokens:
+            self._postings.setdefault(token, set()).add(doc.path.name)
+
+    def _remove_postings(self, doc: IndexedDocument) -> None:
+        self.version += 1
+        self._vocabulary = None
+        for token in doc.tokens:
+            names = self._postings.get(token)
+            if names is not None:
+                names.discard(doc.path.name)
+                if not names:
+                    del self._postings[token]
+
+    def refresh(self, docs_dir: Path) -> None:
+        """
+        Bring the index in line with the markdown files in ``docs_dir``.
+
+        Args:
+            docs_dir: Documentation directory to index
+        """
+        if self._root != docs_dir:
+            self._root = docs_dir
+            self.version += 1
+            self._docs.clear()
+            self._postings.clear()
+            self._vocabulary = None
+
+        seen: set[str] = set()
+        try:
+            with os.scandir(docs_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".md") or not entry.is_file():
+                        continue
+                    seen.add(entry.name)
+                    st = entry.stat()
+                    current = self._docs.get(entry.name)
+                    if current is not None and current.mtime_ns == st.st_mtime_ns and current.size == st.st_size:
+                        continue
+                    if current is not None:
+                        self._remove_postings(current)
+                        del self._docs[entry.name]
+                    path = docs_dir / entry.name
+                    try:
+                        with open(path, encoding="utf-8") as f:
+                            content = f.read()
+                    except (OSError, UnicodeDecodeError) as e:
+                        logger.warning(f"Error indexing file {path}: {e}")
+                        continue
+                    lowered = content.lower()
+                    doc = IndexedDocument(
+                        path=path,
+                        mtime_ns=st.st_mtime_ns,
+                        size=st.st_size,
+                        content=content,
+                        lowered=lowered,
+                        tokens=frozenset(_TOKEN_RE.findall(lowered)),
+                    )
+                    self._docs[entry.name] = doc
+                    self._add_postings(doc)
+        except OSError as e:
+            logger.warning(f"Error scanning documentation directory {docs_dir}: {e}")
+
+        for name in [name for name in self._docs if name not in seen]:
+            self._remove_postings(self._docs.pop(name))
+
+    def _get_vocabulary(self) -> tuple[str, list[int], list[str]]:
+        if self._vocabulary is None:
+            tokens = list(self._postings)
+            starts = []
+            offset = 0
+            for token in tokens:
+                starts.append(offset)
+                offset += len(token) + 1
+            self._vocabulary = ("\n".join(tokens), starts, tokens)
+        return self._vocabulary
+
+    def candidates(self, query: str) -> list[IndexedDocument]:
+        """
+        Documents that may contain ``query`` as a substring.
+
+        Every word-character run of the query must occur inside some token of a
+        matching document, so each run is searched for in the joined vocabulary
+        and the resulting posting sets are intersected, smallest first.
+
+        Args:
+            query: Lowercased search query
+
+        Returns:
+            Candidate documents; a superset of the documents containing ``query``
+        """
+        terms = set(_TOKEN_RE.findall(query))
+        if not terms:
+            return list(self._docs.values())
+
+        blob, starts, tokens = self._get_vocabulary()
+        matched: list[set[str]] = []
+        for term in terms:
+            names: set[str] = set()
+            # Scan the joined vocabulary once in C and map each hit back to its token
+            hits = {bisect.bisect_right(starts, m.start()) - 1 for m in re.finditer(re.escape(term), blob)}
+            for i in hits:
+                names |= self._postings[tokens[i]]
+            if not names:
+                return []
+            matched.append(names)
+
+        matched.sort(key=len)
+        result = set(matched[0])
+        for names in matched[1:]:
+            result &= names
+            if not result:
+                return []
+        return [self._docs[name] for name in result]
+
+    def documents(self) -> list[IndexedDocument]:
+        """Return all indexed documents."""
+        return list(self._docs.values())
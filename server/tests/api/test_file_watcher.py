@@ -411,6 +411,7 @@ async def test_high_volume_events():
     with patch("server.watchers.file_watcher.BatchDocGenerator") as mock_gen:
         mock_instance = Mock()
         mock_instance.generate_single_file_docs.return_value = ("# Test doc", True)
+        mock_instance.generate_docs_for_files.side_effect = lambda paths: {p: ("# Test doc", True) for p in paths}
         mock_gen.return_value = mock_instance
 
         watcher = FileWatcher(config)
@@ -1,9 +1,11 @@
 import os
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from server.services.docs import DocumentationService
+
 
 @pytest.fixture(autouse=True)
 def mock_env():
@@ -34,6 +36,17 @@ def test_pygments_css(client):
     assert "highlight" in r.text
 
 
+def test_pygments_css_etag_revalidation(client):
+    r = client.get("/api/css/pygments.css")
+    etag = r.headers["etag"]
+    assert "max-age=86400" in r.headers["cache-control"]
+
+    r2 = client.get("/api/css/pygments.css", headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.content == b""
+    assert r2.headers["etag"] == etag
+
+
 def test_search_min_length(client):
     r = client.get("/api/search?q=a")
     assert r.status_code == 200
@@ -99,6 +112,28 @@ def test_documentation_file_success(client):
         assert "Doc Title" in r.text
 
 
+def test_documentation_page_is_cached_until_file_changes(client, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    page = docs / "cached_doc.md"
+    page.write_text("# Cached Title\n\nBody", encoding="utf-8")
+
+    with (
+        patch("server.main.DOCS_DIR", docs),
+        patch("server.main.docs_service.get_file_content", return_value=("<p>Body</p>", "Cached Title")) as render,
+    ):
+        first = client.get("/docs/cached_doc")
+        etag = first.headers["etag"]
+        assert "Cached Title" in first.text
+        assert client.get("/docs/cached_doc").text == first.text
+        assert client.get("/docs/cached_doc", headers={"If-None-Match": etag}).status_code == 304
+        assert render.await_count == 1
+
+        page.write_text("# Cached Title\n\nBody, edited", encoding="utf-8")
+        client.get("/docs/cached_doc")
+        assert render.await_count == 2
+
+
 def test_files_pagination_and_sanitization(client):
     files = [
         {"name": "a.md", "stem": "a", "size": 100, "title": "A", "last_updated": None},
@@ -112,3 +147,67 @@ def test_files_pagination_and_sanitization(client):
         assert len(data["files"]) == 1
         # Ensure optional None fields are stripped
         assert "last_updated" not in data["files"][0]
+
+
+def test_files_etag_short_circuits_with_304(client, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("# A\n", encoding="utf-8")
+    service = DocumentationService(docs, Mock())
+    with patch("server.main.docs_service", service), patch("server.main.REAL_APPS_DIR", tmp_path / "apps"):
+        first = client.get("/api/files")
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "max-age=5"
+        etag = first.headers["etag"]
+
+        with patch.object(service, "get_file_list", side_effect=AssertionError("should not list")):
+            cached = client.get("/api/files", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+
+        (docs / "b.md").write_text("# B\n", encoding="utf-8")
+        refreshed = client.get("/api/files", headers={"If-None-Match": etag})
+        assert refreshed.status_code == 200
+        assert refreshed.json()["total_count"] == 2
+        assert refreshed.headers["etag"] != etag
+
+
+def test_json_endpoints_use_orjson_response(client):
+    from fastapi.responses import ORJSONResponse
+
+    from server.main import app
+
+    assert app.router.default_response_class is ORJSONResponse
+    r = client.get("/api/search?q=a")
+    assert r.headers["content-type"] == "application/json"
+
+
+@pytest.mark.parametrize("encoding", ["zstd", "br", "gzip"])
+def test_large_responses_are_compressed_per_accept_encoding(client, encoding):
+    r = client.get("/api/css/pygments.css", headers={"Accept-Encoding": encoding})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == encoding
+    assert "accept-encoding" in r.headers["vary"].lower()
+
+
+def test_small_responses_skip_compression(client):
+    r = client.get("/api/search?q=a", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert "content-encoding" not in r.headers
+
+
+def test_security_headers_middleware_keeps_endpoint_values():
+    from starlette.applications import Starlette
+    from starlette.responses import PlainTextResponse
+    from starlette.routing import Route
+
+    from server.main import SecurityHeadersASGIMiddleware
+
+    async def framed(request):
+        return PlainTextResponse("ok", headers={"X-Frame-Options": "SAMEORIGIN"})
+
+    inner = Starlette(routes=[Route("/", framed)])
+    r = TestClient(SecurityHeadersASGIMiddleware(inner)).get("/")
+    assert r.headers.get_list("x-frame-options") == ["SAMEORIGIN"]
+    assert r.headers["referrer-policy"] == "no-referrer"
+    assert "content-security-policy" in r.headers
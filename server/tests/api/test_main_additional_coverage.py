@@ -36,6 +36,100 @@ def test_health_check_defaults(client):
     assert "uptime_seconds" in data
 
 
+def test_health_docs_count_is_cached_for_ttl(client, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("# A", encoding="utf-8")
+    with patch("server.main.DOCS_DIR", docs), patch("server.main._health_cache", None):
+        assert client.get("/health").json()["docs_files_count"] == 1
+        (docs / "b.md").write_text("# B", encoding="utf-8")
+        assert client.get("/health").json()["docs_files_count"] == 1
+
+        with patch("server.main.HEALTH_DOCS_COUNT_TTL", 0.0):
+            assert client.get("/health").json()["docs_files_count"] == 2
+
+
+def test_search_index_rescans_only_after_ttl_or_invalidation(client, tmp_path):
+    from server import main
+
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("# A\n\nzigbee", encoding="utf-8")
+    with patch("server.main.DOCS_DIR", docs):
+        assert client.get("/api/search?q=zigbee").json()["total_results"] == 1
+        (docs / "b.md").write_text("# B\n\nzigbee", encoding="utf-8")
+        with patch.object(main.search_index, "refresh", wraps=main.search_index.refresh) as refresh:
+            assert client.get("/api/search?q=zigbee").json()["total_results"] == 1
+            refresh.assert_not_called()
+
+            main._on_generation_result(Mock())
+            assert client.get("/api/search?q=zigbee").json()["total_results"] == 2
+            refresh.assert_called_once_with(docs)
+
+
+def test_search_results_are_reused_until_index_changes(client, tmp_path):
+    from server import main
+
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("# A\n\nSome <zigbee> text", encoding="utf-8")
+    with (
+        patch("server.main.DOCS_DIR", docs),
+        patch("server.main._collect_search_results", wraps=main._collect_search_results) as collect,
+    ):
+        first = client.get("/api/search?q=zigbee").json()
+        assert first["results"][0]["context"] == "# A\n\nSome &lt;<mark>zigbee</mark>&gt; text"
+        assert client.get("/api/search?q=ZIGBEE ").json()["results"] == first["results"]
+        assert collect.call_count == 1
+
+        (docs / "b.md").write_text("# B\n\nzigbee", encoding="utf-8")
+        main.invalidate_search_index()
+        assert client.get("/api/search?q=zigbee").json()["total_results"] == 2
+        assert collect.call_count == 2
+
+
+def test_search_context_highlights_match_not_escaped_entities(client, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("Fish & chips, then AMP stage", encoding="utf-8")
+    with patch("server.main.DOCS_DIR", docs):
+        result = client.get("/api/search?q=amp").json()["results"][0]
+
+    assert result["context"] == "Fish &amp; chips, then <mark>AMP</mark> stage"
+
+
+def test_search_context_highlight_survives_length_changing_lowercase(client, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    # "İ".lower() is two characters, so offsets into the lowered text run one ahead of the original
+    (docs / "a.md").write_text("İstanbul office: Zigbee hub", encoding="utf-8")
+    with patch("server.main.DOCS_DIR", docs):
+        result = client.get("/api/search?q=zigbee").json()["results"][0]
+
+    assert result["context"] == "İstanbul office: <mark>Zigbee</mark> hub"
+
+
+def test_module_categories_shared_between_index_and_partial(client, tmp_path):
+    from server import main
+
+    apps = tmp_path / "apps"
+    apps.mkdir()
+    (apps / "apps.yaml").write_text("a:\n  module: a\n", encoding="utf-8")
+    files = [
+        {"name": "a.md", "stem": "a", "size": 10, "title": "A"},
+        {"name": "b.md", "stem": "b", "size": 10, "title": "B"},
+    ]
+    with (
+        patch("server.main.REAL_APPS_DIR", apps),
+        patch("server.main.docs_service.get_file_list", return_value=files),
+        patch("server.main.count_active_apps", wraps=main.count_active_apps) as count,
+    ):
+        assert client.get("/docs/").status_code == 200
+        assert client.get("/partials/app-sources").status_code == 200
+        assert main._module_categories(files) == (frozenset({"a"}), ["a"], ["b"], ["a", "b"])
+        assert count.call_count == 1
+
+
 def test_generate_index_success(client, tmp_path):
     apps = tmp_path / "apps"
     docs = tmp_path / "docs"
@@ -106,3 +200,119 @@ def test_get_app_source_text_mode(client, tmp_path):
         r = client.get("/api/app-source/mod2?fmt=text")
         assert r.status_code == 200
         assert "print('x')" in r.text
+
+
+@pytest.mark.asyncio
+async def test_mirror_copy_runs_concurrently(tmp_path):
+    from server.main import _copy_one, _run_in_threads
+
+    src_dir = tmp_path / "src"
+    dest_dir = tmp_path / "mirror"
+    (src_dir / "pkg").mkdir(parents=True)
+    sources = [src_dir / "a.py", src_dir / "pkg" / "b.py"]
+    for src in sources:
+        src.write_text(f"# {src.name}", encoding="utf-8")
+
+    pairs = [(src, dest_dir / src.relative_to(src_dir)) for src in sources]
+    assert await _run_in_threads(_copy_one, pairs) == [True, True]
+    assert (dest_dir / "pkg" / "b.py").read_text(encoding="utf-8") == "# b.py"
+
+
+def test_plan_mirror_sync_compares_mtimes_from_one_walk(tmp_path):
+    from server.main import _plan_mirror_sync
+
+    src_dir = tmp_path / "src"
+    dest_dir = tmp_path / "mirror"
+    (src_dir / "pkg").mkdir(parents=True)
+    dest_dir.mkdir()
+    for name in ("a.py", "pkg/b.py", "c.py"):
+        (src_dir / name).write_text(f"# {name}", encoding="utf-8")
+
+    # A freshly created (empty) mirror gets every file, even though its directory is newer
+    stale, pairs = _plan_mirror_sync(src_dir, dest_dir)
+    assert stale == []
+    assert sorted(dest.relative_to(dest_dir).as_posix() for _, dest in pairs) == ["a.py", "c.py", "pkg/b.py"]
+
+    (dest_dir / "a.py").write_text("# up to date", encoding="utf-8")
+    (dest_dir / "c.py").write_text("# outdated", encoding="utf-8")
+    (dest_dir / "gone.py").write_text("# stale", encoding="utf-8")
+    base = (src_dir / "a.py").stat().st_mtime
+    os.utime(dest_dir / "a.py", (base, base))
+    os.utime(dest_dir / "c.py", (base - 10, base - 10))
+    os.utime(src_dir / "c.py", (base, base))
+
+    stale, pairs = _plan_mirror_sync(src_dir, dest_dir)
+    assert stale == [dest_dir / "gone.py"]
+    assert sorted(dest.relative_to(dest_dir).as_posix() for _, dest in pairs) == ["c.py", "pkg/b.py"]
+
+
+def test_copy_one_hardlinks_by_default_and_copy2_when_preserving_metadata(tmp_path):
+    from server.main import _copy_one
+
+    src = tmp_path / "src.py"
+    src.write_text("x = 1\n", encoding="utf-8")
+    old = src.stat().st_mtime - 100
+    os.utime(src, (old, old))
+
+    linked = tmp_path / "mirror" / "linked.py"
+    assert _copy_one(src, linked) is True
+    assert os.path.samefile(src, linked)
+
+    copied = tmp_path / "mirror" / "copied.py"
+    with patch("server.main.MIRROR_PRESERVE_METADATA", True):
+        assert _copy_one(src, copied) is True
+    assert not os.path.samefile(src, copied)
+    assert copied.stat().st_mtime == src.stat().st_mtime
+
+
+def test_is_safe_name_whitelist_and_app_source_rejections(client):
+    from server.main import is_safe_name
+
+    assert is_safe_name("my_app2")
+    for bad in ("", "../etc", "a/b", "a.py", "name\n", "x" * 129):
+        assert not is_safe_name(bad)
+    assert client.get("/api/app-source/bad.name").status_code == 400
+    assert client.get("/api/app-source/raw/bad.name").status_code == 400
+
+
+def test_format_elapsed_reuses_string_within_same_second():
+    from server.main import _fmt_elapsed_int, _format_elapsed
+
+    assert _format_elapsed(93784.9) == "1d 2h 3m 4s"
+    hits = _fmt_elapsed_int.cache_info().hits
+    assert _format_elapsed(93784.1) == "1d 2h 3m 4s"
+    assert _fmt_elapsed_int.cache_info().hits == hits + 1
+    assert _format_elapsed(59) == "59s"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_share_one_build(tmp_path):
+    import asyncio
+
+    from server import main
+
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("# A\n\nzigbee", encoding="utf-8")
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_collect(query):
+        started.set()
+        await release.wait()
+        return [{"stem": "a", "query": query}]
+
+    with (
+        patch("server.main.DOCS_DIR", docs),
+        patch("server.main._collect_search_results", side_effect=slow_collect) as collect,
+    ):
+        first = asyncio.ensure_future(main.search_documentation(q="zigbee"))
+        await started.wait()
+        second = asyncio.ensure_future(main.search_documentation(q="Zigbee"))
+        await asyncio.sleep(0)
+        release.set()
+        responses = await asyncio.gather(first, second)
+
+    assert collect.call_count == 1
+    assert responses[0].body == responses[1].body.replace(b"Zigbee", b"zigbee")
+    assert main._search_inflight == {}
@@ -47,11 +47,12 @@ def test_health_starting_status(client):
         assert response_data["status"] == "starting"
 
 
-def test_pygments_css_error_path(client):
-    # Force HtmlFormatter to raise to hit error branch
+def test_pygments_css_is_precomputed(client):
+    # The CSS is built at import time, so no formatter is constructed per request
     with patch("server.main.HtmlFormatter", side_effect=Exception("boom")):
         r = client.get("/api/css/pygments.css")
-        assert r.status_code == 500
+        assert r.status_code == 200
+        assert ".highlight" in r.text
 
 
 def test_ws_status_error(client):
@@ -162,3 +162,21 @@ def test_partials_app_sources_ok_even_if_list_fails(client, tmp_path):
     ):
         r = client.get("/partials/app-sources")
         assert r.status_code == 200
+
+
+def test_main_starts_reloader_when_reload_enabled():
+    from server import main as main_module
+
+    with (
+        patch.dict(os.environ, {"RELOAD": "true"}),
+        patch("server.main.print_startup_info"),
+        patch("server.main.uvicorn.run") as run,
+    ):
+        main_module.main()
+
+    run.assert_called_once()
+    assert run.call_args.args == ("server.main:app",)
+    kwargs = run.call_args.kwargs
+    assert kwargs["reload"] is True
+    assert kwargs["reload_includes"] == ["*.py"]
+    assert kwargs["reload_dirs"]
@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 import pytest
 from fastapi.testclient import TestClient
 import os
@@ -88,3 +88,270 @@ def y():
         data = r.json()
         assert data["module"] == "rawmod"
         assert "def y()" in data["content"]
+
+
+def test_get_app_source_html_reuses_cached_formatter(client, tmp_path):
+    from server.main import _get_formatter
+
+    mirror = tmp_path / "apps"
+    mirror.mkdir()
+    (mirror / "themed.py").write_text("x = 1\n", encoding="utf-8")
+
+    with patch("server.main.MIRRORED_APPS_DIR", mirror):
+        first = client.get("/api/app-source/themed?fmt=html&theme=dark")
+        second = client.get("/api/app-source/themed?fmt=html&theme=dark")
+
+    assert first.status_code == second.status_code == 200
+    assert first.text == second.text
+    assert _get_formatter("monokai")[0] is _get_formatter("monokai")[0]
+    assert "#app-source-viewer .highlight" in second.text
+
+
+def test_get_app_source_html_can_link_cacheable_theme_css(client, tmp_path):
+    mirror = tmp_path / "apps"
+    mirror.mkdir()
+    (mirror / "linked.py").write_text("x = 1\n", encoding="utf-8")
+
+    with patch("server.main.MIRRORED_APPS_DIR", mirror):
+        r = client.get("/api/app-source/linked?fmt=html&theme=dark&css=link")
+
+    assert r.status_code == 200
+    assert '<link rel="stylesheet" href="/static/pygments-dark.css">' in r.text
+    assert "<style>" not in r.text
+
+    css = client.get("/static/pygments-dark.css")
+    assert css.status_code == 200
+    assert css.headers["content-type"].startswith("text/css")
+    assert "max-age=86400" in css.headers["cache-control"]
+    assert "#app-source-viewer .highlight" in css.text
+    assert client.get("/static/pygments-sepia.css").status_code == 404
+
+
+def test_get_app_source_html_cache_follows_file_changes(client, tmp_path):
+    mirror = tmp_path / "apps"
+    mirror.mkdir()
+    src = mirror / "changing.py"
+    src.write_text("old_name = 1\n", encoding="utf-8")
+
+    with patch("server.main.MIRRORED_APPS_DIR", mirror):
+        first = client.get("/api/app-source/changing?fmt=html")
+        src.write_text("new_name_here = 2\n", encoding="utf-8")
+        st = src.stat()
+        os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        second = client.get("/api/app-source/changing?fmt=html")
+        text = client.get("/api/app-source/changing")
+
+    assert "old_name" in first.text
+    assert "new_name_here" in second.text
+    assert text.text == "new_name_here = 2\n"
+
+
+def test_get_app_source_text_returns_file_bytes_verbatim(client, tmp_path):
+    mirror = tmp_path / "apps"
+    mirror.mkdir()
+    payload = "# caf\u00e9\r\nx = 1\r\n".encode("utf-8")
+    (mirror / "verbatim.py").write_bytes(payload)
+
+    with patch("server.main.MIRRORED_APPS_DIR", mirror):
+        r = client.get("/api/app-source/verbatim?fmt=text")
+
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "text/plain; charset=utf-8"
+    assert r.content == payload
+
+
+def test_get_app_source_missing_module_returns_404(client, tmp_path):
+    with patch("server.main.MIRRORED_APPS_DIR", tmp_path):
+        r = client.get("/api/app-source/missing")
+    assert r.status_code == 404
+
+
+def test_app_source_endpoints_resolve_nested_modules_via_index(client, tmp_path):
+    from server.main import MODULE_INDEX
+
+    mirror = tmp_path / "apps"
+    (mirror / "climate").mkdir(parents=True)
+    (mirror / "climate" / "nested.py").write_text("VALUE = 1\n", encoding="utf-8")
+
+    with patch("server.main.MIRRORED_APPS_DIR", mirror):
+        text = client.get("/api/app-source/nested")
+        raw = client.get("/api/app-source/raw/nested")
+
+        assert MODULE_INDEX["nested"] == mirror / "climate" / "nested.py"
+
+    assert text.status_code == 200
+    assert text.text == "VALUE = 1\n"
+    assert raw.json()["rel_path"] == os.path.join("climate", "nested.py")
+
+
+def test_app_source_finds_nested_module_added_after_index_build(client, tmp_path):
+    from server.main import _find_shallowest
+
+    mirror = tmp_path / "apps"
+    (mirror / "a" / "b").mkdir(parents=True)
+    (mirror / "z").mkdir()
+
+    with patch("server.main.MIRRORED_APPS_DIR", mirror):
+        assert client.get("/api/app-source/late").status_code == 404
+        # Added without a watcher callback, so the index still predates it
+        (mirror / "a" / "b" / "late.py").write_text("deep = 1\n", encoding="utf-8")
+        (mirror / "z" / "late.py").write_text("shallow = 1\n", encoding="utf-8")
+        r = client.get("/api/app-source/late")
+
+    assert r.status_code == 200
+    assert r.text == "shallow = 1\n"
+    assert _find_shallowest(mirror, "missing.py") is None
+
+
+def test_list_app_sources_walks_mirror_once(client, tmp_path):
+    mirror = tmp_path / "apps"
+    (mirror / "sub").mkdir(parents=True)
+    (mirror / "zeta.py").write_text("z = 1\n", encoding="utf-8")
+    (mirror / "sub" / "alpha.py").write_text("a = 1\n", encoding="utf-8")
+    (mirror / "notes.txt").write_text("ignored", encoding="utf-8")
+
+    with patch("server.main.MIRRORED_APPS_DIR", mirror):
+        r = client.get("/api/app-sources")
+
+    assert r.status_code == 200
+    data = r.json()
+    assert data["total_count"] == 2
+    assert [a["module"] for a in data["apps"]] == ["alpha", "zeta"]
+    assert data["apps"][0]["rel_path"] == os.path.join("sub", "alpha.py")
+    assert data["apps"][1]["size"] == len("z = 1\n")
+    assert data["apps"][1]["modified"] == (mirror / "zeta.py").stat().st_mtime
+
+
+def test_list_app_sources_serves_snapshot_with_etag(client, tmp_path):
+    from server.main import invalidate_app_sources_snapshot
+
+    mirror = tmp_path / "apps"
+    mirror.mkdir()
+    (mirror / "one.py").write_text("x = 1\n", encoding="utf-8")
+
+    with patch("server.main.MIRRORED_APPS_DIR", mirror):
+        first = client.get("/api/app-sources")
+        etag = first.headers["etag"]
+
+        # Unchanged snapshot short-circuits with 304
+        cached = client.get("/api/app-sources", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+        # The snapshot is served until the watcher invalidates it
+        (mirror / "two.py").write_text("y = 2\n", encoding="utf-8")
+        assert client.get("/api/app-sources").json()["total_count"] == 1
+        invalidate_app_sources_snapshot()
+        refreshed = client.get("/api/app-sources", headers={"If-None-Match": etag})
+
+    assert first.json()["total_count"] == 1
+    assert refreshed.status_code == 200
+    assert refreshed.json()["total_count"] == 2
+    assert refreshed.headers["etag"] != etag
+
+
+def test_list_app_sources_serializes_snapshot_once(client, tmp_path):
+    import orjson
+
+    mirror = tmp_path / "apps"
+    mirror.mkdir()
+    (mirror / "one.py").write_text("x = 1\n", encoding="utf-8")
+
+    with (
+        patch("server.main.MIRRORED_APPS_DIR", mirror),
+        patch("server.main.orjson.dumps", wraps=orjson.dumps) as dumps,
+    ):
+        first = client.get("/api/app-sources")
+        second = client.get("/api/app-sources")
+
+    assert dumps.call_count == 1
+    assert first.content == second.content
+    assert first.headers["content-type"] == "application/json"
+    assert first.json()["apps"][0]["module"] == "one"
+
+
+def test_partial_app_sources_uses_index_until_invalidated_or_expired(client, tmp_path):
+    from server.main import _on_generation_result
+
+    mirror = tmp_path / "apps"
+    (mirror / "sub").mkdir(parents=True)
+    (mirror / "a.py").write_text("# a", encoding="utf-8")
+    (mirror / "sub" / "b.py").write_text("# b", encoding="utf-8")
+
+    with (
+        patch("server.main.MIRRORED_APPS_DIR", mirror),
+        patch("server.main.docs_service.get_file_list", return_value=[]),
+    ):
+        first = client.get("/partials/app-sources").text
+        assert "a.py" in first
+        assert os.path.join("sub", "b.py") in first
+
+        (mirror / "c.py").write_text("# c", encoding="utf-8")
+        assert "c.py" not in client.get("/partials/app-sources").text
+
+        _on_generation_result(Mock(file_path=mirror / "c.py"))
+        assert "c.py" in client.get("/partials/app-sources").text
+
+        (mirror / "a.py").unlink()
+        with patch("server.main.MODULE_INDEX_TTL", 0.0):
+            assert "a.py" not in client.get("/partials/app-sources").text
+
+
+def test_partial_app_sources_caches_fragment_with_etag(client, tmp_path):
+    import server.main as main_module
+
+    mirror = tmp_path / "apps"
+    mirror.mkdir()
+    (mirror / "cached_mod.py").write_text("# c", encoding="utf-8")
+
+    with (
+        patch("server.main.MIRRORED_APPS_DIR", mirror),
+        patch("server.main.docs_service.get_file_list", return_value=[]),
+        patch("server.main._render_app_sources_partial", wraps=main_module._render_app_sources_partial) as render,
+    ):
+        first = client.get("/partials/app-sources")
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, max-age=5"
+        assert "cached_mod.py" in first.text
+
+        assert client.get("/partials/app-sources").text == first.text
+        revalidated = client.get("/partials/app-sources", headers={"If-None-Match": etag})
+
+    assert revalidated.status_code == 304
+    assert render.call_count == 1
+
+
+def test_render_app_sources_partial_rows_are_escaped():
+    from server.main import _render_app_sources_partial
+
+    index = {"mod_a": [("sub/<b>.py", 2048)], "mod_b": [("mod_b.py", 512)]}
+    with patch("server.main.APP_INDEX", index):
+        body = _render_app_sources_partial(frozenset({"mod_a"})).decode("utf-8")
+
+    assert "window.openSourceViewer('mod_a')" in body
+    assert "<strong>mod_a.py</strong>" in body
+    assert "sub/&lt;b&gt;.py • 2.0 KB" in body
+    assert "mod_b" not in body
+
+
+def test_partial_app_sources_serves_precompressed_gzip(client, tmp_path):
+    import gzip
+
+    mirror = tmp_path / "apps"
+    mirror.mkdir()
+    for i in range(40):
+        (mirror / f"module_{i}.py").write_text("# m", encoding="utf-8")
+
+    with (
+        patch("server.main.MIRRORED_APPS_DIR", mirror),
+        patch("server.main.docs_service.get_file_list", return_value=[]),
+        patch("server.main.gzip.compress", wraps=gzip.compress) as compress,
+    ):
+        plain = client.get("/partials/app-sources", headers={"Accept-Encoding": "identity"})
+        raw = client.get("/partials/app-sources", headers={"Accept-Encoding": "gzip"})
+        client.get("/partials/app-sources", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in plain.headers
+    assert raw.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in raw.headers["vary"].lower()
+    assert raw.text == plain.text
+    assert compress.call_count == 1
@@ -71,3 +71,23 @@ async def test_sse_broker_publish_receive():
         assert received["data"]["message"] == "hello"
     finally:
         await broker.unsubscribe(q)
+
+
+@pytest.mark.asyncio
+async def test_next_sse_chunk_coalesces_queued_events():
+    import asyncio
+
+    from server.main import SSE_BATCH_SIZE, _next_sse_chunk
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(SSE_BATCH_SIZE + 2):
+        queue.put_nowait({"event_type": "file_changed", "data": {"i": i}})
+
+    chunk = await _next_sse_chunk(queue)
+    assert chunk.count(b"event: file_changed\ndata: ") == SSE_BATCH_SIZE
+    assert chunk.startswith(b'event: file_changed\ndata: {"event_type":"file_changed","data":{"i":0}}\n\n')
+    assert queue.qsize() == 2
+
+    rest = await _next_sse_chunk(queue)
+    assert rest.count(b"\n\n") == 2
+    assert queue.empty()
@@ -0,0 +1,17 @@
+"""Shared fixtures for the server test suite."""
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _disable_default_parse_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep parsers from writing to the developer's real ``~/.cache``; tests pass ``cache_dir`` explicitly."""
+    monkeypatch.setenv("PARSER_CACHE_DIR", "")
+
+
+@pytest.fixture(autouse=True)
+def _isolate_app_sources_mirror(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Mirror synced app sources under ``tmp_path`` instead of the default ``data/app-sources`` in the cwd."""
+    monkeypatch.setenv("APP_SOURCES_DIR", str(tmp_path / "app-sources"))
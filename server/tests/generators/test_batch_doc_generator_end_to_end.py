@@ -1,7 +1,9 @@
 """End-to-end tests for BatchDocGenerator to improve coverage."""
 
-from server.generators.batch_doc_generator import BatchDocGenerator
+from unittest.mock import patch
 
+from server.generators.batch_doc_generator import PARALLEL_PARSE_MIN_FILES, BatchDocGenerator
+from server.parsers.appdaemon_parser import AppDaemonParser
 
 APP_CODE_OK = """
 class MyApp:
@@ -85,3 +87,97 @@ def test_generate_index_file_contains_sections(tmp_path):
     index = gen.generate_index_file()
     assert "## Statistics" in index
     assert "## Available Documentation" in index
+
+
+def test_generate_docs_for_files_shares_one_parse_pass(tmp_path):
+    apps = tmp_path / "apps"
+    docs = tmp_path / "docs"
+    apps.mkdir()
+    docs.mkdir()
+
+    ok = apps / "ok.py"
+    ok.write_text(APP_CODE_OK)
+    bad = apps / "bad.py"
+    bad.write_text(APP_CODE_BAD)
+
+    gen = BatchDocGenerator(apps, docs)
+    outputs = gen.generate_docs_for_files([ok, bad])
+
+    assert set(outputs) == {ok, bad}
+    assert outputs[ok][1] is True
+    assert "MyApp" in outputs[ok][0]
+    assert outputs[bad][1] is False
+    assert "Error Generating Documentation" in outputs[bad][0]
+
+
+def test_generate_all_docs_prefetches_large_batches(tmp_path, monkeypatch):
+    apps = tmp_path / "apps"
+    docs = tmp_path / "docs"
+    apps.mkdir()
+    docs.mkdir()
+    monkeypatch.setenv("PARSER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("PARSE_WORKERS", "2")
+    for i in range(PARALLEL_PARSE_MIN_FILES + 1):
+        (apps / f"app{i}.py").write_text(APP_CODE_OK)
+    (docs / "app0.md").write_text("existing")
+
+    gen = BatchDocGenerator(apps, docs)
+    with patch("server.generators.batch_doc_generator.AppDaemonParser.parse_many") as parse_many:
+        results = gen.generate_all_docs()
+
+    # Only files that will be generated are handed to the workers
+    parse_many.assert_called_once()
+    assert apps / "app0.py" not in parse_many.call_args.args[0]
+    assert len(parse_many.call_args.args[0]) == PARALLEL_PARSE_MIN_FILES
+    assert parse_many.call_args.kwargs["max_workers"] == 2
+    assert results["successful"] == PARALLEL_PARSE_MIN_FILES
+
+    # Small batches and PARSE_WORKERS=1 stay in-process
+    monkeypatch.setenv("PARSE_WORKERS", "1")
+    with patch("server.generators.batch_doc_generator.AppDaemonParser.parse_many") as parse_many:
+        BatchDocGenerator(apps, docs).generate_all_docs(force_regenerate=True)
+        gen.generate_docs_for_files([apps / "app1.py"])
+    parse_many.assert_not_called()
+
+
+def test_generate_index_file_parses_each_file_once(tmp_path, monkeypatch):
+    apps = tmp_path / "apps"
+    docs = tmp_path / "docs"
+    apps.mkdir()
+    docs.mkdir()
+    monkeypatch.setenv("PARSE_WORKERS", "0")
+    (apps / "motion_light.py").write_text('class Motion:\n    """Turns lights on."""\n' + APP_CODE_OK)
+    (apps / "broken_alarm.py").write_text(APP_CODE_BAD)
+
+    gen = BatchDocGenerator(apps, docs)
+    with patch(
+        "server.generators.batch_doc_generator.AppDaemonParser.parse_many",
+        wraps=AppDaemonParser.parse_many,
+    ) as parse_many:
+        index = gen.generate_index_file()
+
+    # One pass over both files, kept in-process for a batch this small
+    parse_many.assert_called_once()
+    assert sorted(p.name for p in parse_many.call_args.args[0]) == ["broken_alarm.py", "motion_light.py"]
+    assert parse_many.call_args.kwargs["max_workers"] == 1
+    assert "- **Total Classes**: 2\n" in index
+    assert ": Turns lights on.\n" in index
+    assert ": Automation module\n" in index
+
+
+def test_parse_files_uses_workers_for_large_batches(tmp_path, monkeypatch):
+    apps = tmp_path / "apps"
+    apps.mkdir()
+    monkeypatch.setenv("PARSE_WORKERS", "3")
+    files = [apps / f"app{i}.py" for i in range(PARALLEL_PARSE_MIN_FILES)]
+    for path in files:
+        path.write_text(APP_CODE_OK)
+
+    gen = BatchDocGenerator(apps, tmp_path / "docs")
+    with patch("server.generators.batch_doc_generator.AppDaemonParser.parse_many") as parse_many:
+        parse_many.side_effect = [OSError("no processes"), ["parsed"] * len(files)]
+        parsed = gen.parse_files(files)
+
+    # A pool failure falls back to parsing in-process
+    assert [call.kwargs["max_workers"] for call in parse_many.call_args_list] == [3, 1]
+    assert parsed == dict.fromkeys(files, "parsed")
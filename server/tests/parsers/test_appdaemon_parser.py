@@ -1,11 +1,18 @@
 """Tests for AppDaemon parser module."""
 
+import ast
 import tempfile
 from pathlib import Path
 
 import pytest
 
-from server.parsers.appdaemon_parser import AppDaemonParser, parse_appdaemon_file
+from server.parsers.appdaemon_parser import (
+    _LEAF_NODE_TYPES,
+    AppDaemonParser,
+    _collect_module_nodes,
+    _walk_nodes,
+    parse_appdaemon_file,
+)
 
 
 class TestAppDaemonParser:
@@ -59,9 +66,9 @@ class TestAutomation(hass.Hass):
         """Test AppDaemonParser initialization."""
         assert parser.current_file == ""
         assert parser.source_lines == []
-        assert isinstance(parser.service_patterns, set)
-        assert isinstance(parser.time_patterns, set)
-        assert isinstance(parser.mqtt_patterns, set)
+        assert isinstance(parser.service_patterns, frozenset)
+        assert isinstance(parser.time_patterns, frozenset)
+        assert isinstance(parser.mqtt_patterns, frozenset)
 
     def test_parse_file_happy_path(self, parser, sample_automation_file):
         """Test basic file parsing."""
@@ -148,6 +155,209 @@ from typing import Any, Dict
         finally:
             Path(temp_path).unlink()
 
+    def test_extract_imports_module_level_only(self, parser):
+        """Test that imports inside try/if blocks are found and function-local imports are skipped."""
+        import_content = """
+import os
+try:
+    import ujson as json
+except ImportError:
+    import json
+if os.name == "nt":
+    from pathlib import WindowsPath
+
+class App:
+    def initialize(self):
+        import datetime
+"""
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
+            f.write(import_content)
+            temp_path = f.name
+
+        try:
+            result = parser.parse_file(temp_path)
+            assert result.imports == [
+                "import os",
+                "import ujson",
+                "from pathlib import WindowsPath",
+                "import json",
+            ]
+        finally:
+            Path(temp_path).unlink()
+
+    def test_extract_imports_statement_lists(self, parser):
+        """Test that else/finally/with bodies are searched in ast.walk order."""
+        tree = ast.parse(
+            """
+with suppress(ImportError):
+    import yaml
+try:
+    pass
+except ImportError:
+    pass
+else:
+    import orjson
+finally:
+    from os import path
+if __import__("sys").version_info < (3, 11):
+    import tomli
+else:
+    import tomllib
+"""
+        )
+
+        assert parser._extract_imports(tree) == [
+            "import yaml",
+            "import orjson",
+            "from os import path",
+            "import tomli",
+            "import tomllib",
+        ]
+
+    def test_collect_module_nodes_single_walk(self, parser):
+        """Test that one walk feeds the constant map and import scan with the same results as separate walks."""
+        tree = ast.parse(
+            """
+import const
+Home.Light = "light.a"
+setattr(Home, "Fan", "fan.a")
+print("not a constant")
+
+class App:
+    from helpers import tools
+    Home.Light = "light.b"
+"""
+        )
+        nodes = _collect_module_nodes(tree)
+
+        assert [c.name for c in nodes.classes] == ["App"]
+        assert parser._imported_module_names(tree, nodes.imports) == parser._imported_module_names(tree)
+        assert parser._imported_module_names(tree, nodes.imports) == ["const", "helpers"]
+        assert parser._extract_constant_value_map(tree, nodes.constants) == parser._extract_constant_value_map(tree)
+        assert parser._extract_constant_value_map(tree, nodes.constants) == {
+            "Home.Light": "light.b",
+            "Home.Fan": "fan.a",
+        }
+        assert parser._extract_module_constant_maps(tree, nodes) == (
+            parser._extract_constant_value_map(tree),
+            parser._extract_class_constant_value_map(tree),
+        )
+
+    def test_class_constant_value_map_nesting_order(self, parser):
+        """Test that nested classes are expanded in place, in source order, with later definitions winning."""
+        tree = ast.parse(
+            """
+class Home:
+    Door = "binary_sensor.door"
+    class Kitchen:
+        Light = "light.kitchen"
+        class Counter:
+            Strip: str = "light.counter"
+        Fan = "fan.kitchen"
+    Alarm = Siren = "siren.home"
+    class Kitchen:
+        Light = "light.kitchen_v2"
+    Count = 3
+
+def helper():
+    class Local:
+        Skipped = "not.a_constant"
+
+class Persons:
+    Me = "person.me"
+"""
+        )
+
+        assert list(parser._extract_class_constant_value_map(tree).items()) == [
+            ("Home.Door", "binary_sensor.door"),
+            ("Home.Kitchen.Light", "light.kitchen_v2"),
+            ("Home.Kitchen.Counter.Strip", "light.counter"),
+            ("Home.Kitchen.Fan", "fan.kitchen"),
+            ("Home.Alarm", "siren.home"),
+            ("Home.Siren", "siren.home"),
+            ("Persons.Me", "person.me"),
+        ]
+
+    def test_walk_nodes_matches_ast_walk(self):
+        """Test that the walker keeps ast.walk order and only drops context and operator nodes."""
+        tree = ast.parse(
+            """
+class App:
+    def initialize(self):
+        if not self.a and self.b < -1:
+            self.handles.append(self.listen_state(self.cb, Home.Light, new="on"))
+        x: int = 1 + 2
+        del self.c
+"""
+        )
+
+        walked = list(_walk_nodes(tree))
+        assert walked == [node for node in ast.walk(tree) if type(node) not in _LEAF_NODE_TYPES]
+        assert not any(isinstance(node, (ast.expr_context, ast.operator, ast.cmpop)) for node in walked)
+        assert sum(isinstance(node, ast.Call) for node in walked) == 2
+
+    def test_constant_value_map_attribute_chains(self, parser):
+        """Test deep attribute chains, non-name roots and malformed setattr calls in the constant map."""
+        tree = ast.parse(
+            """
+Home.Floor.Kitchen.Light.Main = "light." + "main"
+Home.Alarm: str = f"alarm_control_panel.{'home'}"
+get_home().Light = "light.b"
+setattr(Home.Kitchen, "Fan", "fan.a")
+setattr(Home.Kitchen, "Broken")
+setattr(get_home(), "Lamp", "light.c")
+"""
+        )
+
+        assert parser._extract_constant_value_map(tree) == {
+            "Home.Floor.Kitchen.Light.Main": "light.main",
+            "Home.Alarm": "alarm_control_panel.home",
+            ".Light": "light.b",
+            "Home.Kitchen.Fan": "fan.a",
+        }
+
+    def test_attribute_chain_text(self, parser):
+        """Test rendering of deep attribute chains with their longest mapped prefix resolved."""
+        expr = ast.parse("Home.Kitchen.Cabinet.Light.Power", mode="eval").body
+        mapping = {"Home.Kitchen": "area.kitchen", "Home.Kitchen.Cabinet.Light": "light.cabinet", "Home": "house"}
+
+        assert parser._expr_to_text(expr) == "Home.Kitchen.Cabinet.Light.Power"
+        assert parser._expr_to_text(expr, mapping) == "light.cabinet.Power"
+        assert parser._expr_to_text(expr.value.value, mapping) == "area.kitchen.Cabinet"
+        assert parser._expr_to_text(ast.parse("Home.Garage", mode="eval").body, mapping) == "house.Garage"
+        call_root = ast.parse("get(Home).Kitchen.Light", mode="eval").body
+        assert parser._expr_to_text(call_root, mapping) == "get(house).Kitchen.Light"
+
+        assert parser._get_name(expr) == "Home.Kitchen.Cabinet.Light.Power"
+        assert parser._extract_constant_reference(expr) == "Home.Kitchen.Cabinet.Light.Power"
+        assert parser._extract_constant_reference(call_root) is None
+        assert parser._extract_constant_reference(ast.parse("Homes.Light", mode="eval").body) is None
+
+    def test_expr_to_text_dispatch(self, parser):
+        """Test rendering per node type, plus the fallbacks for unknown nodes and renderer errors."""
+        expr = ast.parse("f(x[1:2:3], y.z)[k] if q else f'{a}-b'", mode="eval").body
+        assert parser._expr_to_text(expr.body) == "f(x[1:2:3], y.z)[k]"
+        assert parser._expr_to_text(expr.orelse) == "f'{a}-b'"
+        # No renderer for IfExp or Lambda: fall back to the plain name lookup
+        assert parser._expr_to_text(expr) == ""
+        assert parser._expr_to_text(ast.parse("lambda: 1", mode="eval").body) == ""
+
+        broken = ast.Call(func=ast.Name(id="f"), args=None, keywords=[])
+        assert parser._expr_to_text(broken) == ""
+
+    def test_operator_text(self, parser):
+        """Test operator spellings used by the expression printer, including the unknown-type fallback."""
+        expr = ast.parse("not (a + b) // -c in d and e is not f or ~g", mode="eval").body
+        assert parser._expr_to_text(expr) == "not ((a + b) // -c) in d and e is not f or ~g"
+        assert parser._cmp_op_to_text(ast.NotIn()) == "not in"
+        assert parser._bool_op_to_text(ast.Or()) == "or"
+
+        class Custom(ast.operator):
+            pass
+
+        assert parser._bin_op_to_text(Custom()) == "Custom"
+
     def test_extract_constants(self, parser):
         """Test constants extraction."""
         constants_content = """
@@ -193,6 +403,23 @@ class TestService:
         finally:
             Path(temp_path).unlink()
 
+    def test_direct_service_domains(self, parser):
+        """Test service domains of direct service methods, including ones without a mapping."""
+        call = ast.parse("self.x('light.a', brightness=3)", mode="eval").body
+
+        toggle = parser._parse_direct_service_call(call, "toggle", "cb")
+        notify = parser._parse_direct_service_call(call, "notify", "cb")
+        set_value = parser._parse_direct_service_call(call, "set_value", "cb")
+
+        assert (toggle.service_domain, toggle.service_name, toggle.entity_id) == ("homeassistant", "toggle", "light.a")
+        assert (notify.service_domain, notify.service_name) == ("notify", "notify")
+        assert (set_value.service_domain, set_value.service_name, set_value.entity_id) == (
+            "unknown",
+            "set_value",
+            "light.a",
+        )
+        assert set_value.data == {"brightness": 3}
+
     def test_time_schedule_detection(self, parser):
         """Test detection of time-based scheduling."""
         time_content = """
@@ -2,6 +2,7 @@
 
 import textwrap
 from pathlib import Path
+from unittest.mock import patch
 
 from server.parsers.appdaemon_parser import AppDaemonParser
 
@@ -56,3 +57,159 @@ def test_parse_file_collects_entities_topics_services(tmp_path: Path):
     assert "sensor.temp" in pf.all_entities
     assert "t/1" in pf.all_mqtt_topics
     assert any(s.startswith("homeassistant.") or s.startswith("notify.") for s in pf.all_service_calls)
+
+
+def test_helper_inlining_stops_at_recursive_helpers(tmp_path: Path):
+    py = write_file(
+        tmp_path / "m.py",
+        """
+        class X:
+            def on_change(self, entity, attribute, old, new, kwargs):
+                self._update()
+
+            def _update(self):
+                self.turn_on("light.kitchen")
+                self._retry()
+
+            def _retry(self):
+                self._update()
+        """,
+    )
+
+    methods = {m.name: m for m in AppDaemonParser().parse_file(py).classes[0].methods}
+
+    # Each helper is expanded at most once per analysed method
+    for name in ("on_change", "_update", "_retry"):
+        assert [a.action_type for a in methods[name].actions] == ["device_action"]
+
+
+def test_mqtt_listener_keywords_evaluated_once(tmp_path: Path):
+    py = write_file(
+        tmp_path / "m.py",
+        """
+        class X:
+            def initialize(self):
+                self.listen_event(self.on_mqtt, namespace="mqtt", topic=Topics.door, qos=1, **extra)
+        """,
+    )
+
+    parser = AppDaemonParser()
+    with patch.object(parser, "_call_kwargs", wraps=parser._call_kwargs) as call_kwargs:
+        listener = parser.parse_file(py).classes[0].mqtt_listeners[0]
+
+    assert call_kwargs.call_count == 1
+    assert (listener.namespace, listener.topic, listener.qos) == ("mqtt", "Topics.door", 1)
+    # The ** expansion has no keyword name and is left out of the listener kwargs
+    assert listener.kwargs == {"namespace": "mqtt", "topic": "Topics.door", "qos": 1}
+
+
+def test_non_mqtt_listen_event_reads_only_namespace(tmp_path: Path):
+    py = write_file(
+        tmp_path / "e.py",
+        """
+        class X:
+            def initialize(self):
+                self.listen_event(self.on_button, "zha_event", device_ieee=Devices.button, command="on")
+        """,
+    )
+
+    parser = AppDaemonParser()
+    with (
+        patch.object(parser, "_call_kwargs", wraps=parser._call_kwargs) as call_kwargs,
+        patch.object(parser, "_get_value", wraps=parser._get_value) as get_value,
+    ):
+        parsed = parser.parse_file(py)
+
+    assert parsed.classes[0].mqtt_listeners == []
+    # Only the namespace lookup walked the keywords; none of their values were evaluated
+    assert call_kwargs.call_count == 0
+    assert get_value.call_count == 0
+
+
+def test_mqtt_listener_detected_from_event_name(tmp_path: Path):
+    py = write_file(
+        tmp_path / "m.py",
+        """
+        class X:
+            def initialize(self):
+                self.listen_event(self.on_message, "MQTT_MESSAGE", topic="zigbee/door")
+                self.listen_event(self.on_button, "zha_event")
+                self.listen_event(self.on_other, event_name)
+        """,
+    )
+
+    listeners = AppDaemonParser().parse_file(py).classes[0].mqtt_listeners
+
+    assert [(listener.callback_method, listener.topic) for listener in listeners] == [
+        ("self.on_message", "zigbee/door")
+    ]
+
+
+def test_trigger_entity_inferred_once_per_method(tmp_path: Path):
+    py = write_file(
+        tmp_path / "m.py",
+        """
+        class X:
+            def check_front_door(self):
+                self.turn_on("light.porch")
+                self.turn_on("light.hall")
+                self.toggle("switch.fan")
+
+            def on_motion(self, entity, attribute, old, new, kwargs):
+                self.turn_off("light.porch")
+
+            def refresh(self):
+                self.turn_off("light.attic")
+        """,
+    )
+
+    parser = AppDaemonParser()
+    with patch.object(parser, "_infer_trigger_entity", wraps=parser._infer_trigger_entity) as infer:
+        relationships = parser.parse_file(py).classes[0].device_relationships
+
+    assert [call.args[0].name for call in infer.call_args_list] == ["check_front_door", "on_motion", "refresh"]
+    assert [(r.trigger_entity, r.target_entity) for r in relationships] == [
+        ("door_sensor", "light.porch"),
+        ("door_sensor", "light.hall"),
+        ("door_sensor", "switch.fan"),
+        ("inferred_from_callback", "light.porch"),
+    ]
+
+
+def test_keyword_pattern_analysis(tmp_path: Path):
+    py = write_file(
+        tmp_path / "m.py",
+        """
+        import time
+
+        class X:
+            def initialize(self):
+                self.helpers = self.get_app("helpers")
+                self.helpers.send_notify_telegram("started")
+                self.helpers.log_action("init")
+
+            def on_change(self, entity, attribute, old, new, kwargs):
+                perf_start = time.time()
+                try:
+                    self.turn_on("light.hall")
+                except Exception as error:
+                    self.log(f"Error: {error}")
+                    self.call_service("script.fallback_lights")
+                if (time.time() - perf_start) * 1000 > 300:
+                    self.log("Slow execution")
+        """,
+    )
+
+    parsed = AppDaemonParser().parse_file(py)
+
+    helpers = parsed.helper_injection_patterns
+    assert helpers.has_helpers_injection
+    # Overlapping names are each found, as with one substring check per name
+    assert helpers.helper_methods_used == ["log_action", "notify_telegram", "send_notify"]
+    assert helpers.dependency_injection == ["AppDaemon dependency injection"]
+    errors = parsed.error_handling_patterns
+    assert (errors.has_try_catch, errors.logging_on_error, errors.error_notification) == (True, True, False)
+    assert errors.recovery_mechanisms == ["fallback mechanism in on_change"]
+    method = parsed.classes[0].methods[1]
+    assert method.performance_pattern is not None
+    assert method.performance_pattern.alert_pattern == "⚠️ SLOW EXECUTION"
@@ -0,0 +1,180 @@
+"""Tests for the on-disk parse result cache."""
+
+import ast
+import os
+import textwrap
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from server.parsers.appdaemon_parser import AppDaemonParser, _constant_map_cache, default_parse_cache_dir
+
+
+def write_file(path: Path, content: str) -> Path:
+    path.write_text(textwrap.dedent(content), encoding="utf-8")
+    return path
+
+
+def touch_later(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def apps_dir(tmp_path: Path, monkeypatch) -> Path:
+    apps = tmp_path / "apps"
+    apps.mkdir()
+    monkeypatch.setenv("APPS_DIR", str(apps))
+    write_file(apps / "const.py", 'class Home:\n    Light = "light.kitchen"\n')
+    write_file(
+        apps / "kitchen.py",
+        """
+        from const import Home
+
+        class Kitchen:
+            def initialize(self):
+                self.listen_state(self.on, Home.Light)
+
+            def on(self, entity, attribute, old, new, kwargs):
+                pass
+        """,
+    )
+    return apps
+
+
+def parse_counting(parser: AppDaemonParser, path: Path):
+    with patch.object(parser, "_parse_file_uncached", wraps=parser._parse_file_uncached) as uncached:
+        parsed = parser.parse_file(path)
+    return parsed, uncached.call_count
+
+
+def test_unchanged_file_is_served_from_disk(apps_dir: Path, tmp_path: Path):
+    cache_dir = tmp_path / "cache"
+    first, parses = parse_counting(AppDaemonParser(cache_dir=cache_dir), apps_dir / "kitchen.py")
+    assert parses == 1
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+    # A fresh parser (as after a restart) reuses the persisted result
+    second, parses = parse_counting(AppDaemonParser(cache_dir=cache_dir), apps_dir / "kitchen.py")
+    assert parses == 0
+    assert second == first
+    assert second.classes[0].state_listeners[0].entity == "light.kitchen"
+
+
+def test_source_change_invalidates_entry(apps_dir: Path, tmp_path: Path):
+    cache_dir = tmp_path / "cache"
+    source = apps_dir / "kitchen.py"
+    parse_counting(AppDaemonParser(cache_dir=cache_dir), source)
+
+    source.write_text(source.read_text().replace("class Kitchen", "class Pantry"))
+    touch_later(source)
+    parsed, parses = parse_counting(AppDaemonParser(cache_dir=cache_dir), source)
+
+    assert parses == 1
+    assert parsed.classes[0].name == "Pantry"
+
+
+def test_constant_module_change_invalidates_entry(apps_dir: Path, tmp_path: Path):
+    cache_dir = tmp_path / "cache"
+    parse_counting(AppDaemonParser(cache_dir=cache_dir), apps_dir / "kitchen.py")
+
+    const_py = write_file(apps_dir / "const.py", 'class Home:\n    Light = "light.pantry"\n')
+    touch_later(const_py)
+    parsed, parses = parse_counting(AppDaemonParser(cache_dir=cache_dir), apps_dir / "kitchen.py")
+
+    assert parses == 1
+    assert parsed.classes[0].state_listeners[0].entity == "light.pantry"
+
+
+def test_corrupt_entry_is_ignored(apps_dir: Path, tmp_path: Path):
+    cache_dir = tmp_path / "cache"
+    parse_counting(AppDaemonParser(cache_dir=cache_dir), apps_dir / "kitchen.py")
+    for entry in cache_dir.glob("*.pickle"):
+        entry.write_bytes(b"not a pickle")
+
+    parsed, parses = parse_counting(AppDaemonParser(cache_dir=cache_dir), apps_dir / "kitchen.py")
+
+    assert parses == 1
+    assert parsed.classes[0].name == "Kitchen"
+
+
+def test_default_parse_cache_dir(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("PARSER_CACHE_DIR", "")
+    assert default_parse_cache_dir() is None
+
+    monkeypatch.setenv("PARSER_CACHE_DIR", str(tmp_path / "custom"))
+    assert default_parse_cache_dir() == tmp_path / "custom"
+
+    monkeypatch.delenv("PARSER_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert default_parse_cache_dir() == tmp_path / "xdg" / "appdaemon-docs-server" / "parsed"
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_parse_many_keeps_order_and_reports_failures(apps_dir: Path, tmp_path: Path, max_workers: int):
+    broken = write_file(apps_dir / "broken.py", "def oops(:\n")
+    cache_dir = tmp_path / "cache"
+
+    results = AppDaemonParser.parse_many(
+        [apps_dir / "kitchen.py", broken], cache_dir=cache_dir, max_workers=max_workers
+    )
+
+    assert results[0].classes[0].state_listeners[0].entity == "light.kitchen"
+    assert isinstance(results[1], ValueError)
+    assert "Syntax error" in str(results[1])
+    # Results were persisted, so a later in-process parse is served from disk
+    _, parses = parse_counting(AppDaemonParser(cache_dir=cache_dir), apps_dir / "kitchen.py")
+    assert parses == 0
+
+
+def test_module_constants_persist_across_restarts(apps_dir: Path, tmp_path: Path):
+    cache_dir = tmp_path / "cache"
+    AppDaemonParser(cache_dir=cache_dir).parse_file(apps_dir / "kitchen.py")
+    assert len(list((cache_dir / "modules").glob("*.pickle"))) == 1
+
+    # A new process starts with an empty in-memory module cache but reads the persisted constants
+    _constant_map_cache.clear()
+    source = apps_dir / "kitchen.py"
+    source.write_text(source.read_text().replace("class Kitchen", "class Pantry"))
+    touch_later(source)
+    with patch("server.parsers.appdaemon_parser.ast.parse", wraps=ast.parse) as parse:
+        parsed = AppDaemonParser(cache_dir=cache_dir).parse_file(source)
+
+    assert [call.kwargs.get("filename") for call in parse.call_args_list] == [str(source)]
+    assert parsed.classes[0].state_listeners[0].entity == "light.kitchen"
+
+    # Editing the constant module invalidates its persisted entry
+    _constant_map_cache.clear()
+    write_file(apps_dir / "const.py", 'class Home:\n    Light = "light.pantry"\n')
+    touch_later(apps_dir / "const.py")
+    parsed = AppDaemonParser(cache_dir=cache_dir).parse_file(source)
+    assert parsed.classes[0].state_listeners[0].entity == "light.pantry"
+
+
+def test_imported_module_is_stat_and_resolved_once_per_lookup(apps_dir: Path):
+    _constant_map_cache.clear()
+    with (
+        patch.object(Path, "exists", autospec=True, side_effect=Path.exists) as exists,
+        patch.object(Path, "resolve", autospec=True, side_effect=Path.resolve) as resolve,
+        patch("server.parsers.appdaemon_parser.ast.parse", wraps=ast.parse) as parse,
+    ):
+        parsed = AppDaemonParser().parse_file(apps_dir / "kitchen.py")
+
+    assert parsed.classes[0].state_listeners[0].entity == "light.kitchen"
+    # const.py is found once through the import and once as APPS_DIR/const.py, but parsed only once
+    assert [call.args[0].name for call in exists.call_args_list].count("const.py") == 2
+    assert [call.args[0].name for call in resolve.call_args_list].count("const.py") == 2
+    assert [call.kwargs.get("filename") for call in parse.call_args_list] == [
+        str(apps_dir / "kitchen.py"),
+        str(apps_dir / "const.py"),
+    ]
+
+
+def test_cache_directories_are_private(apps_dir: Path, tmp_path: Path):
+    cache_dir = tmp_path / "cache"
+    AppDaemonParser(cache_dir=cache_dir).parse_file(apps_dir / "kitchen.py")
+
+    # Entries are unpickled on load, so nobody but the service user may write them
+    assert (cache_dir.stat().st_mode & 0o777) == 0o700
+    assert ((cache_dir / "modules").stat().st_mode & 0o777) == 0o700
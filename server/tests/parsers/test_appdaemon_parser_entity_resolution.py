@@ -1,7 +1,10 @@
 """Tests for resolving code constants to real entity ids in parser."""
 
+import ast
+import os
 import textwrap
 from pathlib import Path
+from unittest.mock import patch
 
 from server.parsers.appdaemon_parser import AppDaemonParser
 
@@ -42,3 +45,386 @@ def test_constant_value_map_and_resolution(tmp_path: Path):
     assert cls.state_listeners[0].entity == "light.kitchen"
     # Service call entity resolved
     assert any(sc.entity_id == "light.kitchen" for sc in cls.service_calls)
+
+
+def test_service_payload_entity_ids_resolved(tmp_path: Path):
+    py = write_file(
+        tmp_path / "m.py",
+        """
+        class Home:
+            Light = "light.kitchen"
+            Lamp = "light.lamp"
+
+        class A:
+            def on(self, entity, attribute, old, new, kwargs):
+                self.call_service("light.turn_on", entity_id=[Home.Light, Home.Lamp, "light.raw", 3])
+                self.call_service("light.turn_off", entity_id=Home.Light)
+        """,
+    )
+
+    cls = next(c for c in AppDaemonParser().parse_file(py).classes if c.name == "A")
+
+    turn_on, turn_off = sorted(cls.service_calls, key=lambda sc: sc.line_number)
+    assert turn_on.data["entity_id"] == ["light.kitchen", "light.lamp", "light.raw", 3]
+    assert turn_off.data["entity_id"] == "light.kitchen"
+
+
+def test_resolve_constants_in_text_single_pass():
+    parser = AppDaemonParser()
+    mapping = {"Home.Light": "light.home", "Home.Light.Night": "light.night", "Home.Path": "C:\\lights"}
+
+    text = "Home.Light.Night == Home.Light and not MyHome.Light and Home.Lights"
+    assert parser._resolve_constants_in_text(text, mapping) == (
+        "light.night == light.home and not MyHome.Light and Home.Lights"
+    )
+    # Replacement values are used literally, not as regex templates
+    assert parser._resolve_constants_in_text("Home.Path", mapping) == "C:\\lights"
+
+    # A different key set rebuilds the alternation
+    assert parser._resolve_constants_in_text("Home.Fan", {"Home.Fan": "fan.home"}) == "fan.home"
+    assert parser._resolve_constants_in_text("Home.Light", {}) == "Home.Light"
+
+
+def test_resolve_constants_in_texts_matches_per_text():
+    parser = AppDaemonParser()
+    mapping = {"Home.Light": "light.home", "Home.Fan": "fan.home"}
+    texts = ["turn_on(Home.Light)", "Home.Fan", "MyHome.Light", "", "Home.Lights"]
+
+    with patch.object(parser, "_resolve_constants_in_text", wraps=parser._resolve_constants_in_text) as single:
+        resolved = parser._resolve_constants_in_texts(texts, mapping)
+
+    assert resolved == [parser._resolve_constants_in_text(text, mapping) for text in texts]
+    assert resolved == ["turn_on(light.home)", "fan.home", "MyHome.Light", "", "Home.Lights"]
+    assert single.call_count == 1
+    # Snippets that already contain the separator are resolved one by one
+    assert parser._resolve_constants_in_texts(["a\0Home.Fan", "Home.Light"], mapping) == ["a\0fan.home", "light.home"]
+
+
+def test_conditions_are_naturalized_from_ast(tmp_path: Path):
+    py = write_file(
+        tmp_path / "cond.py",
+        """
+        class Home:
+            class Kitchen:
+                Light = "light.kitchen"
+
+        class A:
+            def initialize(self):
+                if self.get_state(Home.Kitchen.Light) == "on" and self.person.name == "alice":
+                    self.turn_off(Home.Kitchen.Light)
+                elif self.get_state(Home.Kitchen.Light) != self.State.OFF:
+                    self.log("x")
+                if hasattr(self, 'Area'):
+                    self.log("y")
+                if not self.enabled:
+                    self.log("z")
+                while "light.a" in self.pending:
+                    self.log("w")
+                for light in self.lights:
+                    self.turn_on(light)
+        """,
+    )
+
+    parsed = AppDaemonParser().parse_file(py)
+    flows = next(c for c in parsed.classes if c.name == "A").automation_flows
+    conditions = [cond for flow in flows for cond in flow.conditions]
+
+    assert conditions == [
+        "when light.kitchen is on and self.person is alice",
+        "or when light.kitchen is not off",
+        "when self has Area",
+        "when not self.enabled",
+        "while 'light.a' in self.pending",
+        "for each light in self.lights",
+        "when light.kitchen is not off",
+    ]
+
+
+def test_constant_modules_are_parsed_once_until_they_change(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("APPS_DIR", str(tmp_path))
+    const_py = write_file(tmp_path / "const.py", 'class Home:\n    Light = "light.kitchen"  # marker\n')
+    apps = [
+        write_file(
+            tmp_path / f"app{i}.py",
+            "from const import Home\n\nclass A:\n    def initialize(self):\n        self.listen_state(self.cb, Home.Light)\n",
+        )
+        for i in range(3)
+    ]
+
+    def const_parses(parse) -> int:
+        return sum(b"# marker" in call.args[0] for call in parse.call_args_list)
+
+    with patch("server.parsers.appdaemon_parser.ast.parse", wraps=ast.parse) as parse:
+        for app in apps:
+            # Separate parser instances still share the memoized const.py map
+            assert AppDaemonParser().parse_file(app).classes[0].state_listeners[0].entity == "light.kitchen"
+        assert const_parses(parse) == 1
+
+        const_py.write_text('class Home:\n    Light = "light.pantry"  # marker\n', encoding="utf-8")
+        st = const_py.stat()
+        os.utime(const_py, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        parser = AppDaemonParser()
+        assert parser.parse_file(apps[0]).classes[0].state_listeners[0].entity == "light.pantry"
+        assert parser.parse_file(apps[1]).classes[0].state_listeners[0].entity == "light.pantry"
+        assert const_parses(parse) == 2
+
+
+def test_entity_strings_are_shared_across_files(tmp_path: Path):
+    source = 'class A:\n    def initialize(self):\n        self.listen_state(self.cb, "light.porch")\n'
+    first = AppDaemonParser().parse_file(write_file(tmp_path / "a.py", source))
+    second = AppDaemonParser().parse_file(write_file(tmp_path / "b.py", source))
+
+    entity = first.classes[0].state_listeners[0].entity
+    assert entity == "light.porch"
+    assert entity is second.classes[0].state_listeners[0].entity
+    assert first.all_entities[0] is second.all_entities[0]
+
+
+def test_nested_class_methods_scanned_once(tmp_path: Path):
+    py = write_file(
+        tmp_path / "m.py",
+        """
+        class Outer:
+            Light = Home.Kitchen.Light
+
+            class Inner:
+                def helper(self):
+                    self.turn_on(Home.Porch.Light)
+
+            def initialize(self):
+                pass
+        """,
+    )
+
+    parser = AppDaemonParser()
+    with patch.object(parser, "_scan_method", wraps=parser._scan_method) as scan:
+        pf = parser.parse_file(py)
+
+    assert sorted(call.args[0].name for call in scan.call_args_list) == ["helper", "initialize"]
+    outer = next(c for c in pf.classes if c.name == "Outer")
+    inner = next(c for c in pf.classes if c.name == "Inner")
+    # The enclosing class still reports the references made inside its nested classes
+    assert {"Home.Kitchen.Light", "Home.Porch.Light"} <= set(outer.constants_used)
+    assert set(inner.constants_used) <= set(outer.constants_used)
+    assert "Home.Kitchen.Light" not in inner.constants_used
+    assert [c.name for c in pf.classes] == ["Outer", "Inner"]
+
+
+def test_file_without_classes_skips_constant_resolution(tmp_path: Path):
+    py = write_file(
+        tmp_path / "helpers.py",
+        '''
+        """Shared helpers."""
+        import os
+
+        Home.Kitchen.Light = "light.kitchen"
+
+        def helper():
+            return os.getcwd()
+        ''',
+    )
+
+    parser = AppDaemonParser()
+    with patch.object(parser, "_build_constant_value_map", wraps=parser._build_constant_value_map) as build:
+        pf = parser.parse_file(py)
+
+    build.assert_not_called()
+    assert pf.classes == []
+    assert pf.constant_value_map == {}
+    assert pf.module_docstring == "Shared helpers."
+    assert pf.imports == ["import os"]
+
+
+def test_self_scoped_constants_reuse_class_map(tmp_path: Path):
+    py = write_file(
+        tmp_path / "m.py",
+        """
+        class A:
+            MODE = "auto"
+
+            class State:
+                ON = "on"
+                level: str = "high"
+
+                class Sub:
+                    OFF = "off"
+
+            def initialize(self):
+                self.listen_state(self.cb, "light.a", new=self.State.ON)
+        """,
+    )
+
+    parser = AppDaemonParser()
+    with patch.object(
+        parser, "_extract_class_constant_value_map", wraps=parser._extract_class_constant_value_map
+    ) as class_map:
+        pf = parser.parse_file(py)
+
+    assert class_map.call_count == 1
+    assert {key: pf.constant_value_map[key] for key in pf.constant_value_map if key.startswith("self.")} == {
+        "self.State.ON": "on",
+        "self.State.level": "high",
+        "self.State.Sub.OFF": "off",
+    }
+    assert pf.constant_value_map["A.MODE"] == "auto"
+    # Called on its own, the self-scoped map walks the classes itself
+    tree = ast.parse(py.read_text())
+    assert parser._extract_self_class_constant_value_map(tree) == {
+        "self.State.ON": "on",
+        "self.State.level": "high",
+        "self.State.Sub.OFF": "off",
+    }
+
+
+def test_entity_collection_matches_full_walk():
+    parser = AppDaemonParser()
+    tree = ast.parse(
+        textwrap.dedent(
+            """
+            if Home.Kitchen.Light.state == Persons.alice.zone and get(General.Mode).value:
+                self.turn_on(Home.Porch, brightness=Actions.Dim.level, other=self.Home.Hall)
+            for light in Homes.lights + [Home.Hall.Light]:
+                pass
+            """
+        )
+    )
+    if_node, for_node = tree.body
+
+    def walked(node: ast.AST) -> set[str]:
+        return {
+            ref
+            for child in ast.walk(node)
+            if isinstance(child, ast.Attribute) and (ref := parser._extract_constant_reference(child))
+        }
+
+    for node in (if_node, for_node):
+        entities = parser._extract_entities_from_node(node)
+        assert len(entities) == len(set(entities))
+        assert set(entities) == walked(node)
+        assert set(parser._extract_entities_from_flow(node)) == walked(node)
+
+    assert set(parser._extract_entities_from_node(if_node.test)) == {
+        "Home.Kitchen",
+        "Home.Kitchen.Light",
+        "Home.Kitchen.Light.state",
+        "Persons.alice",
+        "Persons.alice.zone",
+        "General.Mode",
+    }
+    assert set(parser._extract_entities_from_node(for_node)) == {"Home.Hall", "Home.Hall.Light"}
+    call = if_node.body[0].value
+    assert sorted(parser._extract_entities_from_call_args(call)) == ["Actions.Dim", "Actions.Dim.level", "Home.Porch"]
+
+
+def test_loop_and_helper_entities_collected_once(tmp_path: Path):
+    py = write_file(
+        tmp_path / "m.py",
+        """
+        class A:
+            def on(self, entity, attribute, old, new, kwargs):
+                self._apply()
+                self._apply()
+
+            def _apply(self):
+                for light in Home.Kitchen.Lights:
+                    self.turn_on(light)
+                if Persons.alice.home:
+                    self.log("home")
+        """,
+    )
+
+    parser = AppDaemonParser()
+    with patch.object(parser, "_extract_entities_from_node", wraps=parser._extract_entities_from_node) as extract:
+        cls = parser.parse_file(py).classes[0]
+
+    walked = [type(call.args[0]).__name__ for call in extract.call_args_list]
+    # Loop (action and flow), if test (action) and if statement (flow), once each
+    assert sorted(walked) == ["Attribute", "For", "If"]
+
+    actions = {m.name: m.actions for m in cls.methods}
+    loops = [a for a in actions["on"] + actions["_apply"] if a.action_type == "loop_iteration"]
+    assert len(loops) == 3
+    assert all(sorted(a.entities_involved) == ["Home.Kitchen", "Home.Kitchen.Lights"] for a in loops)
+    loop_flow = next(f for f in cls.automation_flows if f.flow_type == "sequence")
+    assert sorted(loop_flow.entities_involved) == ["Home.Kitchen", "Home.Kitchen.Lights"]
+    # Records never share a list with each other
+    assert len({id(a.entities_involved) for a in loops} | {id(loop_flow.entities_involved)}) == 4
+
+
+def test_alias_map_built_only_for_methods_that_resolve_aliases(tmp_path: Path):
+    py = write_file(
+        tmp_path / "m.py",
+        """
+        class A:
+            def initialize(self):
+                sensor = "binary_sensor.door"
+                self.listen_state(self.on, sensor)
+
+            def on(self, entity, attribute, old, new, kwargs):
+                light = "light.hall"
+                self.turn_on(light)
+                self.call_service("light.turn_off", entity_id=light)
+
+            def describe(self):
+                text = "idle"
+                self.log(text)
+        """,
+    )
+
+    parser = AppDaemonParser()
+    with patch.object(parser, "_build_alias_map", wraps=parser._build_alias_map) as build:
+        cls = parser.parse_file(py).classes[0]
+
+    assert [call.args[0].name for call in build.call_args_list] == ["initialize", "on"]
+    assert cls.state_listeners[0].entity == "binary_sensor.door"
+    assert [sc.entity_id for sc in cls.service_calls] == ["light.hall", "light.hall"]
+
+
+def test_entities_listed_in_source_order_without_duplicates():
+    parser = AppDaemonParser()
+    node = ast.parse(
+        "if Persons.bob.home and self.get_state(Home.Kitchen.Light) == Home.Kitchen.Light.state:\n"
+        "    self.turn_on(Home.Hall)\n"
+    ).body[0]
+
+    assert parser._extract_entities_from_node(node) == [
+        "Persons.bob.home",
+        "Persons.bob",
+        "Home.Kitchen.Light",
+        "Home.Kitchen",
+        "Home.Kitchen.Light.state",
+        "Home.Hall",
+    ]
+    call = ast.parse("self.turn_on(Home.B, Home.A, entity=Home.B, other=General.C)", mode="eval").body
+    assert parser._extract_entities_from_call_args(call) == ["Home.B", "Home.A", "General.C"]
+
+
+def test_names_and_service_parts_are_shared_across_files(tmp_path: Path):
+    source = textwrap.dedent(
+        """
+        class A:
+            def initialize(self):
+                self.listen_state(self.on_change, "light.porch")
+                self.listen_event(self.on_mqtt, namespace="mqtt", topic="zigbee/porch")
+
+            def on_change(self, entity, attribute, old, new, kwargs):
+                if Home.Porch.Light:
+                    self.call_service("light.turn_on", entity_id="light.porch")
+        """
+    )
+    first, second = (
+        AppDaemonParser().parse_file(write_file(tmp_path / name, source)).classes[0] for name in ("a.py", "b.py")
+    )
+
+    assert first.state_listeners[0].callback_method == "self.on_change"
+    assert first.state_listeners[0].callback_method is second.state_listeners[0].callback_method
+    assert first.mqtt_listeners[0].topic is second.mqtt_listeners[0].topic
+    first_call, second_call = first.service_calls[0], second.service_calls[0]
+    assert (first_call.service_domain, first_call.service_name) == ("light", "turn_on")
+    assert first_call.service_domain is second_call.service_domain
+    assert first_call.service_name is second_call.service_name
+    first_if, second_if = (
+        next(a for a in cls.methods[1].actions if a.action_type == "conditional_logic") for cls in (first, second)
+    )
+    assert first_if.entities_involved[0] == "Home.Porch.Light"
+    assert first_if.entities_involved[0] is second_if.entities_involved[0]
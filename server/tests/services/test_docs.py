@@ -65,6 +65,31 @@ class TestDocumentationService:
         names = [f["name"] for f in files]
         assert names == sorted(names)
 
+    @pytest.mark.asyncio
+    async def test_get_file_list_memoized_until_directory_changes(self, service, temp_docs_dir):
+        """Test file list is reused while the docs directory signature is unchanged."""
+        first = await service.get_file_list()
+        signature = service.get_signature()
+
+        with patch.object(service, "extract_title", side_effect=AssertionError("should use cache")):
+            assert await service.get_file_list() == first
+        assert service.get_signature() == signature
+
+        (temp_docs_dir / "test3.md").write_text("# Test 3")
+        assert service.get_signature() != signature
+        files = await service.get_file_list()
+        assert [f["name"] for f in files] == ["no_header.md", "test1.md", "test2.md", "test3.md"]
+
+    @pytest.mark.asyncio
+    async def test_get_file_list_skips_index_before_reading_it(self, service, temp_docs_dir):
+        """Test the generated README.md index is excluded without extracting its title."""
+        (temp_docs_dir / "README.md").write_text("# Index")
+        with patch.object(service, "extract_title", return_value="T") as extract_title:
+            files = await service.get_file_list()
+
+        assert "README.md" not in [f["name"] for f in files]
+        assert all(call.args[0].name != "README.md" for call in extract_title.await_args_list)
+
     @pytest.mark.asyncio
     async def test_get_file_list_nonexistent_dir(self, mock_markdown_processor):
         """Test getting file list from nonexistent directory."""
@@ -132,6 +157,20 @@ class TestDocumentationService:
         finally:
             os.unlink(temp_path)
 
+    @pytest.mark.asyncio
+    async def test_extract_title_is_cached_until_file_changes(self, service, temp_docs_dir):
+        """Titles are served from the LRU until the file's mtime or size changes."""
+        path = temp_docs_dir / "test1.md"
+        assert await service.extract_title(path) == "Test 1"
+
+        with patch("builtins.open", side_effect=AssertionError("should use cache")):
+            assert await service.extract_title(path) == "Test 1"
+
+        path.write_text("# Renamed Title\n\nNew content")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert await service.extract_title(path) == "Renamed Title"
+
     @pytest.mark.asyncio
     async def test_extract_title_when_no_header(self, service):
         """Test extracting title from file without H1 header."""
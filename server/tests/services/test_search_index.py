@@ -0,0 +1,76 @@
+"""Tests for the documentation search index."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from server.services.search_index import SearchIndex
+
+
+class TestSearchIndex:
+    """Test cases for SearchIndex class."""
+
+    @pytest.fixture
+    def docs_dir(self, tmp_path: Path) -> Path:
+        """Create a docs directory with a few markdown files."""
+        (tmp_path / "alpha.md").write_text("# Alpha\n\nMotion sensor automation for the hallway")
+        (tmp_path / "beta.md").write_text("# Beta\n\nClimate control with a sensor_hub")
+        (tmp_path / "notes.txt").write_text("sensor but not markdown")
+        return tmp_path
+
+    def _names(self, docs) -> set[str]:
+        return {doc.path.name for doc in docs}
+
+    def test_candidates_match_substrings_of_tokens(self, docs_dir):
+        """Query runs match inside longer tokens, preserving substring search."""
+        index = SearchIndex()
+        index.refresh(docs_dir)
+
+        assert len(index) == 2
+        assert self._names(index.candidates("sensor")) == {"alpha.md", "beta.md"}
+        assert self._names(index.candidates("otion sen")) == {"alpha.md"}
+        assert self._names(index.candidates("sor_h")) == {"beta.md"}
+        assert index.candidates("missing") == []
+        # Queries without word characters cannot be narrowed down
+        assert self._names(index.candidates("#")) == {"alpha.md", "beta.md"}
+
+    def test_refresh_picks_up_changes_and_removals(self, docs_dir):
+        """Only changed files are re-read; deleted files drop out of the postings."""
+        index = SearchIndex()
+        index.refresh(docs_dir)
+        first_beta = next(doc for doc in index.documents() if doc.path.name == "beta.md")
+        assert self._names(index.candidates("motion")) == {"alpha.md"}
+
+        alpha = docs_dir / "alpha.md"
+        alpha.write_text("# Alpha\n\nZigbee lights")
+        st = alpha.stat()
+        os.utime(alpha, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        (docs_dir / "beta.md").unlink()
+        index.refresh(docs_dir)
+
+        assert self._names(index.candidates("zigbee")) == {"alpha.md"}
+        version = index.version
+        index.refresh(docs_dir)
+        assert index.version == version
+        assert index.candidates("motion") == []
+        assert index.candidates("climate") == []
+        assert first_beta not in index.documents()
+
+    def test_refresh_resets_when_directory_changes(self, docs_dir, tmp_path_factory):
+        """Pointing the index at another directory drops the old documents."""
+        other = tmp_path_factory.mktemp("other")
+        (other / "gamma.md").write_text("# Gamma\n\nsensor")
+        index = SearchIndex()
+        index.refresh(docs_dir)
+        index.refresh(other)
+
+        assert self._names(index.candidates("sensor")) == {"gamma.md"}
+
+    def test_refresh_missing_directory(self, tmp_path):
+        """A missing directory yields an empty index instead of raising."""
+        index = SearchIndex()
+        index.refresh(tmp_path / "nope")
+
+        assert len(index) == 0
+        assert index.candidates("anything") == []
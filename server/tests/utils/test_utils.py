@@ -228,8 +228,9 @@ class TestGetServerConfig:
             expected = {
                 "host": "127.0.0.1",
                 "port": 8080,
-                "reload": True,
+                "reload": False,
                 "log_level": "info",
+                "ws_per_message_deflate": False,
             }
 
             assert config == expected
@@ -251,6 +252,7 @@ class TestGetServerConfig:
                 "port": 9000,
                 "reload": False,
                 "log_level": "debug",
+                "ws_per_message_deflate": False,
             }
 
             assert config == expected
@@ -261,6 +263,21 @@ class TestGetServerConfig:
             with pytest.raises(ValueError):
                 get_server_config()
 
+    def test_get_server_config_reload_watches_server_python_files(self):
+        """Test that enabling reload restricts the reloader to the server package sources."""
+        with patch.dict(os.environ, {"RELOAD": "true"}, clear=True):
+            config = get_server_config()
+
+            assert config["reload"] is True
+            assert config["reload_includes"] == ["*.py"]
+            assert len(config["reload_dirs"]) == 1
+            assert Path(config["reload_dirs"][0]).name == "server"
+
+    def test_get_server_config_ws_per_message_deflate_opt_in(self):
+        """Test that WebSocket permessage-deflate is off unless explicitly enabled."""
+        with patch.dict(os.environ, {"WS_PER_MESSAGE_DEFLATE": "true"}, clear=True):
+            assert get_server_config()["ws_per_message_deflate"] is True
+
 
 class TestDirectoryStatus:
     """Test cases for DirectoryStatus class."""
@@ -1,10 +1,15 @@
 """Additional coverage tests for utils.py branches."""
 
+import os
 from pathlib import Path
+from unittest.mock import patch
+
+import yaml  # type: ignore[import-untyped]
 
 from server.utils.utils import (
     _check_external_apps_dir,
     _get_windows_docker_path_hint,
+    count_active_apps,
     get_server_config,
 )
 
@@ -32,3 +37,19 @@ def test_get_server_config_env(monkeypatch):
     assert cfg["port"] == 9999
     assert cfg["reload"] is False
     assert cfg["log_level"] == "debug"
+
+
+def test_count_active_apps_reparses_apps_yaml_only_when_it_changes(tmp_path: Path):
+    apps_yaml = tmp_path / "apps.yaml"
+    apps_yaml.write_text("a:\n  module: mod_a\n", encoding="utf-8")
+
+    with patch("server.utils.utils.yaml.load", wraps=yaml.load) as yaml_load:
+        assert count_active_apps(tmp_path, doc_stems=["mod_a", "mod_b"])["active_modules"] == ["mod_a"]
+        assert count_active_apps(tmp_path, doc_stems=["mod_b"])["active_modules"] == []
+        assert yaml_load.call_count == 1
+
+        apps_yaml.write_text("a:\n  module: mod_a\nb:\n  module: mod_b\n", encoding="utf-8")
+        st = apps_yaml.stat()
+        os.utime(apps_yaml, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert count_active_apps(tmp_path, doc_stems=["mod_a", "mod_b"])["active_modules"] == ["mod_a", "mod_b"]
+        assert yaml_load.call_count == 2
@@ -77,3 +77,113 @@ async def test_file_watch_event_handler_mapping(tmp_path, monkeypatch):
             handler._handle_file_event(ev, et)
 
     assert len(calls) >= 3
+
+
+@pytest.mark.asyncio
+async def test_process_events_batches_flushed_events(tmp_path):
+    cfg = WatchConfig(watch_directory=tmp_path, output_directory=tmp_path, max_retry_attempts=0, retry_delay=0)
+    watcher = FileWatcher(cfg)
+
+    batch_calls = []
+
+    def generate_many(paths):
+        batch_calls.append(list(paths))
+        return {p: (f"# {p.stem}", p.stem != "bad") for p in paths}
+
+    watcher.batch_generator.generate_docs_for_files = generate_many
+    watcher.batch_generator.generate_single_file_docs = lambda p: ("# retry", False)
+
+    for name in ("a", "b", "a", "bad"):
+        watcher._processing_queue.put_nowait(FileEvent(tmp_path / f"{name}.py", "modified", 1.0))
+
+    with patch("server.watchers.file_watcher.websocket_manager.broadcast_batch_status", new=AsyncMock()):
+        task = asyncio.create_task(watcher._process_events())
+        await asyncio.wait_for(watcher._processing_queue.join(), timeout=2)
+        task.cancel()
+
+    # Duplicate events collapse and the whole batch is generated in one call
+    assert batch_calls == [[tmp_path / "a.py", tmp_path / "b.py", tmp_path / "bad.py"]]
+    assert (tmp_path / "a.md").read_text() == "# a"
+    assert (tmp_path / "b.md").exists()
+    stats = watcher.get_status()["statistics"]
+    assert stats["successful_generations"] == 2
+    assert stats["failed_generations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_generation_runs_on_persistent_worker_thread(tmp_path):
+    import threading
+
+    cfg = WatchConfig(watch_directory=tmp_path, output_directory=tmp_path)
+    watcher = FileWatcher(cfg)
+    threads = []
+
+    def generate(path):
+        threads.append(threading.current_thread())
+        return "# ok", True
+
+    watcher.batch_generator.generate_single_file_docs = generate
+
+    with patch("server.watchers.file_watcher.websocket_manager.broadcast_batch_status", new=AsyncMock()):
+        for name in ("a", "b"):
+            await watcher._process_single_event(FileEvent(tmp_path / f"{name}.py", "modified", 1.0))
+
+    assert len(threads) == 2
+    assert threads[0] is threads[1]
+    assert threads[0] is not threading.current_thread()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_content_is_not_regenerated(tmp_path):
+    import os
+
+    cfg = WatchConfig(watch_directory=tmp_path, output_directory=tmp_path / "docs")
+    cfg.output_directory.mkdir()
+    watcher = FileWatcher(cfg)
+    calls = []
+
+    def generate(path):
+        calls.append(path)
+        return "# ok", True
+
+    watcher.batch_generator.generate_single_file_docs = generate
+    src = tmp_path / "app.py"
+    src.write_text("x = 1\n")
+
+    def event():
+        return FileEvent(src, "modified", 1.0)
+
+    with patch("server.watchers.file_watcher.websocket_manager.broadcast_batch_status", new=AsyncMock()):
+        await watcher._process_batch([event()])
+        assert len(calls) == 1
+
+        # Same stat: dropped without hashing
+        await watcher._process_batch([event()])
+        # Rewritten with identical content (new mtime): dropped after hashing
+        st = src.stat()
+        os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        await watcher._process_batch([event()])
+        assert len(calls) == 1
+
+        # Real content change is regenerated
+        src.write_text("x = 2\n")
+        await watcher._process_batch([event()])
+        assert len(calls) == 2
+
+        # Docs also depend on shared constants and app config
+        (tmp_path / "const.py").write_text("LIGHT = 'light.a'\n")
+        await watcher._process_batch([event()])
+        assert len(calls) == 3
+        await watcher._process_batch([event()])
+        assert len(calls) == 3
+
+        # A missing generated doc is recreated
+        (cfg.output_directory / "app.md").unlink()
+        await watcher._process_batch([event()])
+        assert len(calls) == 4
+        assert (cfg.output_directory / "app.md").exists()
+
+        # Forced regeneration never skips
+        cfg.force_regenerate = True
+        await watcher._process_batch([event()])
+        assert len(calls) == 5
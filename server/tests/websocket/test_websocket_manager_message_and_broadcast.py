@@ -1,6 +1,8 @@
+import asyncio
 import json
 from unittest.mock import AsyncMock, patch
 
+import orjson
 import pytest
 from fastapi import WebSocketDisconnect
 
@@ -80,3 +82,59 @@ def test_stats_and_info_accessors():
     stats = mgr.get_stats()
     assert "active_connections" in info
     assert "events_sent" in stats
+
+
+@pytest.mark.asyncio
+async def test_broadcast_many_fans_out_concurrently_and_drops_slow_clients():
+    mgr = WebSocketManager()
+    fast, slow = AsyncMock(), AsyncMock()
+
+    async def hang(_message):
+        await asyncio.sleep(10)
+
+    slow.send_text.side_effect = hang
+    mgr._connections.update({fast, slow})
+    events = [
+        WebSocketEvent(event_type=EventType.BATCH_STARTED, data={"n": 1}),
+        WebSocketEvent(event_type=EventType.BATCH_COMPLETED, data={"n": 2}),
+    ]
+
+    with patch("server.websocket.websocket_manager.SEND_TIMEOUT", 0.05):
+        sent = await asyncio.wait_for(mgr.broadcast_many(events), timeout=1.0)
+
+    assert sent == 1
+    assert [json.loads(call.args[0])["data"]["n"] for call in fast.send_text.await_args_list] == [1, 2]
+    assert slow not in mgr._connections
+    assert mgr.stats["events_sent"] == 2
+
+
+@pytest.mark.asyncio
+async def test_broadcast_many_yields_between_chunks():
+    mgr = WebSocketManager()
+    clients = [AsyncMock() for _ in range(5)]
+    mgr._connections.update(clients)
+    event = WebSocketEvent(event_type=EventType.SYSTEM_STATUS, data={})
+
+    with (
+        patch("server.websocket.websocket_manager.BROADCAST_CHUNK_SIZE", 2),
+        patch("server.websocket.websocket_manager.asyncio.sleep", new=AsyncMock()) as sleep,
+    ):
+        assert await mgr.broadcast_many([event]) == 5
+
+    assert all(client.send_text.await_count == 1 for client in clients)
+    assert [call.args for call in sleep.await_args_list] == [(0,), (0,)]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_serializes_payload_once_for_all_clients():
+    mgr = WebSocketManager()
+    clients = [AsyncMock() for _ in range(3)]
+    mgr._connections.update(clients)
+    event = WebSocketEvent(event_type=EventType.SYSTEM_STATUS, data={"message": "hi"})
+
+    with patch("server.websocket.websocket_manager.orjson.dumps", wraps=orjson.dumps) as dumps:
+        assert await mgr.broadcast(event) == 3
+
+    assert dumps.call_count == 1
+    payloads = {client.send_text.await_args.args[0] for client in clients}
+    assert payloads == {event.to_json()}
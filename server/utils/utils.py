@@ -8,6 +8,9 @@ import yaml  # type: ignore[import-untyped]
 from pathlib import Path
 from typing import Any
 
+# Prefer the libyaml-backed safe loader; falls back to the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def _sanitize_yaml_error(exc: yaml.YAMLError, file_path: Path) -> str:
     """
@@ -88,6 +91,70 @@ def count_documentation_files(docs_dir: Path) -> int:
     return len(list(docs_dir.glob("*.md")))
 
 
+# Parsed apps.yaml module sets keyed by path, validated against (mtime_ns, size)
+_active_modules_cache: dict[str, tuple[int, int, frozenset[str]]] = {}
+
+
+def _load_active_modules(apps_yaml_path: Path) -> frozenset[str]:
+    """
+    Return the enabled modules configured in apps.yaml, reparsing only when the file changes.
+
+    Args:
+        apps_yaml_path: Path to apps.yaml
+
+    Returns:
+        Set of module names that are neither disabled nor explicitly not enabled
+
+    Raises:
+        yaml.YAMLError: If the file is not valid YAML
+        OSError: If the file cannot be read
+        ValueError: If the top level of the file is not a mapping
+    """
+    key = str(apps_yaml_path)
+    try:
+        stat = os.stat(apps_yaml_path)
+    except OSError:
+        stat = None
+    if stat is not None:
+        cached = _active_modules_cache.get(key)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+    with open(apps_yaml_path, "r", encoding="utf-8") as f:
+        apps_config = yaml.load(f, Loader=_YAML_LOADER)
+
+    # Treat empty YAML (None) as empty mapping
+    if apps_config is None:
+        apps_config = {}
+
+    # Validate that YAML loaded content is a dictionary
+    if not isinstance(apps_config, dict):
+        # Security: Don't log YAML content as it may contain PII/secrets
+        error_msg = (
+            f"Invalid apps.yaml format: expected dictionary, got {type(apps_config).__name__}. File: {apps_yaml_path}"
+        )
+        logging.error(error_msg)
+        raise ValueError(error_msg)
+
+    # Get unique modules configured in apps.yaml
+    active_modules = set()
+    for app, config in apps_config.items():
+        if isinstance(config, dict) and config.get("module"):
+            # Check if app is disabled or explicitly enabled
+            is_disabled = config.get("disable", False)
+            is_enabled = config.get("enabled", True)  # Default to enabled if not specified
+
+            # Only include module if it's not disabled and is enabled
+            if not is_disabled and is_enabled:
+                # Normalize module to string to be defensive against non-string YAML values
+                active_modules.add(str(config["module"]))
+
+    result = frozenset(active_modules)
+    if stat is not None:
+        _active_modules_cache[key] = (stat.st_mtime_ns, stat.st_size, result)
+    return result
+
+
 def count_active_apps(
     apps_dir: Path, docs_dir: Path | None = None, doc_stems: list[str] | None = None
 ) -> dict[str, int | list[str]]:
@@ -126,35 +193,7 @@ def count_active_apps(
         }
 
     try:
-        with open(apps_yaml_path, "r", encoding="utf-8") as f:
-            apps_config = yaml.safe_load(f)
-
-        # Treat empty YAML (None) as empty mapping
-        if apps_config is None:
-            apps_config = {}
-
-        # Validate that YAML loaded content is a dictionary
-        if not isinstance(apps_config, dict):
-            # Security: Don't log YAML content as it may contain PII/secrets
-            error_msg = (
-                f"Invalid apps.yaml format: expected dictionary, got {type(apps_config).__name__}. "
-                f"File: {apps_yaml_path}"
-            )
-            logging.error(error_msg)
-            raise ValueError(error_msg)
-
-        # Get unique modules configured in apps.yaml
-        active_modules = set()
-        for app, config in apps_config.items():
-            if isinstance(config, dict) and config.get("module"):
-                # Check if app is disabled or explicitly enabled
-                is_disabled = config.get("disable", False)
-                is_enabled = config.get("enabled", True)  # Default to enabled if not specified
-
-                # Only include module if it's not disabled and is enabled
-                if not is_disabled and is_enabled:
-                    # Normalize module to string to be defensive against non-string YAML values
-                    active_modules.add(str(config["module"]))
+        active_modules = _load_active_modules(apps_yaml_path)
 
         # Use set operations for efficient filtering
         doc_stems_set = set(doc_files)
@@ -231,15 +270,24 @@ def get_server_config() -> dict[str, Any]:
     """
     Get server configuration values for uvicorn.
 
+    Auto-reload is opt-in. When enabled, the reloader only watches the server
+    package's Python files so that regenerated docs never trigger a restart.
+
     Returns:
         Dictionary of server configuration values
     """
-    return {
+    config: dict[str, Any] = {
         "host": os.getenv("HOST", "127.0.0.1"),
         "port": int(os.getenv("PORT", "8080")),
-        "reload": parse_boolean_env("RELOAD", "true"),
+        "reload": parse_boolean_env("RELOAD", "false"),
         "log_level": os.getenv("LOG_LEVEL", "info").lower(),
+        # Broadcast payloads are small JSON events; per-connection deflate would recompress each one N times
+        "ws_per_message_deflate": parse_boolean_env("WS_PER_MESSAGE_DEFLATE", "false"),
     }
+    if config["reload"]:
+        config["reload_dirs"] = [str(Path(__file__).resolve().parent.parent)]
+        config["reload_includes"] = ["*.py"]
+    return config
 
 
 def _check_external_apps_dir(apps_dir: Path) -> tuple[bool, bool]:
@@ -7,14 +7,17 @@ and comprehensive logging.
 """
 
 import asyncio
+import hashlib
 import logging
 import os
 import time
 import shutil
 from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, TypeVar
 from weakref import WeakSet
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
@@ -24,6 +27,13 @@ from server.generators.batch_doc_generator import BatchDocGenerator
 from server.utils.progress_callbacks import ProgressCallbackManager
 from server.websocket.websocket_manager import websocket_manager, EventType
 
+T = TypeVar("T")
+
+# Files every generated doc depends on besides its own source (app config and shared constants)
+_GENERATION_DEPENDENCIES = ("apps.yaml", "const.py")
+# (mtime_ns, size, digest) of a source file plus the stat keys of its generation dependencies
+_Fingerprint = tuple[int, int, bytes, tuple[tuple[int, int] | None, ...]]
+
 
 @dataclass
 class WatchConfig:
@@ -290,6 +300,9 @@ class FileWatcher:
         self._processing_task: asyncio.Task[None] | None = None
         self.loop: asyncio.AbstractEventLoop | None = None
 
+        # Long-lived worker that runs regeneration jobs off the event loop
+        self._generation_executor: ThreadPoolExecutor | None = None
+
         # Status tracking
         self.is_watching = False
         self.start_time: float | None = None
@@ -312,6 +325,9 @@ class FileWatcher:
         self.error_counts: dict[Path, int] = defaultdict(int)
         self.last_errors: dict[Path, str] = {}
 
+        # (mtime_ns, size, blake2b digest) of each file as of its last successful generation
+        self._file_fingerprints: dict[Path, _Fingerprint] = {}
+
         # Callbacks for external integration
         self._generation_callbacks: WeakSet[Callable[[GenerationResult], None]] = WeakSet()
 
@@ -336,6 +352,13 @@ class FileWatcher:
         """Add a callback to be called when generation completes."""
         self._generation_callbacks.add(callback)
 
+    async def _run_generation(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking generation job on the persistent generation worker."""
+        if self._generation_executor is None:
+            self._generation_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="doc-generator")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._generation_executor, partial(func, *args))
+
     def _should_process_file(self, file_path: Path) -> bool:
         """Check if a file should be processed for documentation generation."""
         # Check file extension
@@ -394,8 +417,19 @@ class FileWatcher:
         while True:
             try:
                 event = await self._processing_queue.get()
-                await self._process_single_event(event)
-                self._processing_queue.task_done()
+
+                # Drain everything flushed while the previous batch was running so a
+                # burst of saves is regenerated in a single generator pass
+                batch = [event]
+                while True:
+                    try:
+                        batch.append(self._processing_queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+
+                await self._process_batch(batch)
+                for _ in batch:
+                    self._processing_queue.task_done()
 
             except asyncio.CancelledError:
                 break
@@ -403,12 +437,113 @@ class FileWatcher:
                 self.logger.error(f"Error in event processing loop: {e}")
                 await asyncio.sleep(1)  # Brief pause before continuing
 
-    async def _process_single_event(self, event: FileEvent) -> None:
-        """Process a single file event with retry logic."""
-        file_path = event.file_path
-        max_retries = self.config.max_retry_attempts
+    async def _process_batch(self, events: list[FileEvent]) -> None:
+        """Process a batch of flushed file events, regenerating all affected files together."""
+        # Keep only the latest event per file
+        latest: dict[Path, FileEvent] = {}
+        for event in events:
+            latest[event.file_path] = event
+
+        # Drop files whose content and dependencies are unchanged since their last generation
+        # (editor save storms), unless regeneration is forced or the generated doc went missing
+        fingerprints: dict[Path, _Fingerprint] = {}
+        dependencies = self._generation_dependency_stamp()
+        for file_path, event in list(latest.items()):
+            if event.event_type == "deleted":
+                self._file_fingerprints.pop(file_path, None)
+                continue
+            previous = self._file_fingerprints.get(file_path)
+            current = self._file_fingerprint(file_path, previous, dependencies)
+            if current is None:
+                continue
+            if (
+                previous is not None
+                and current[1:] == previous[1:]
+                and not self.config.force_regenerate
+                and (self.config.output_directory / f"{file_path.stem}.md").exists()
+            ):
+                self._file_fingerprints[file_path] = current
+                del latest[file_path]
+                self.logger.debug(f"Skipping {file_path.name}: content unchanged")
+                continue
+            fingerprints[file_path] = current
+
+        if not latest:
+            return
+
+        if len(latest) == 1:
+            await self._process_single_event(next(iter(latest.values())))
+        else:
+            await self._regenerate_batch(latest)
+
+        # Remember what was generated so identical rewrites can be cancelled next time
+        for file_path, fingerprint in fingerprints.items():
+            if file_path not in self.last_errors:
+                self._file_fingerprints[file_path] = fingerprint
+
+    def _file_fingerprint(
+        self,
+        file_path: Path,
+        previous: _Fingerprint | None,
+        dependencies: tuple[tuple[int, int] | None, ...],
+    ) -> _Fingerprint | None:
+        """Return a file's fingerprint, reusing the previous digest when its stat is unchanged."""
+        try:
+            stat = file_path.stat()
+            if previous is not None and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+                return previous[0], previous[1], previous[2], dependencies
+            digest = hashlib.blake2b(file_path.read_bytes(), digest_size=8).digest()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, digest, dependencies
+
+    def _generation_dependency_stamp(self) -> tuple[tuple[int, int] | None, ...]:
+        """Stat keys of the apps.yaml and const.py files in the generation and watched directories."""
+        directories = dict.fromkeys(
+            directory
+            for directory in (self.config.generation_directory, self.config.watch_directory)
+            if directory is not None
+        )
+        stamp: list[tuple[int, int] | None] = []
+        for directory in directories:
+            for name in _GENERATION_DEPENDENCIES:
+                try:
+                    stat = (directory / name).stat()
+                except OSError:
+                    stamp.append(None)
+                else:
+                    stamp.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(stamp)
+
+    async def _regenerate_batch(self, latest: dict[Path, FileEvent]) -> None:
+        """Regenerate several files with a single generator call."""
+        self.logger.info(f"Generating docs for batch of {len(latest)} files")
+
+        for event in latest.values():
+            self._sync_app_source(event)
+            await self._broadcast_generation_started(event.file_path)
+
+        start_time = time.time()
+        outputs = await self._run_generation(self.batch_generator.generate_docs_for_files, list(latest))
+        generation_time = (time.time() - start_time) / len(latest)
+
+        for file_path, event in latest.items():
+            docs, success = outputs.get(file_path, ("", False))
+            if success:
+                try:
+                    output_file = self.config.output_directory / f"{file_path.stem}.md"
+                    output_file.write_text(docs, encoding="utf-8")
+                    await self._record_success(file_path, output_file, generation_time, attempt=0)
+                    continue
+                except OSError as e:
+                    self.logger.warning(f"Failed to write docs for {file_path.name}: {e}")
+
+            # Fall back to the per-file path so failures get the usual retry handling
+            await self._generate_with_retries(event)
 
-        # Opportunistically sync source .py file for read-only viewing on create/modify
+    def _sync_app_source(self, event: FileEvent) -> None:
+        """Opportunistically sync a source .py file for read-only viewing on create/modify."""
+        file_path = event.file_path
         try:
             if file_path.suffix == ".py" and event.event_type in {"created", "modified", "moved"}:
                 dest_base = Path(os.getenv("APP_SOURCES_DIR", "data/app-sources")).resolve()
@@ -433,67 +568,83 @@ class FileWatcher:
             # Do not fail the main processing due to sync errors
             self.logger.debug(f"Source sync skipped for {file_path}: {sync_err}")
 
-        # Broadcast generation started event
+    async def _broadcast_generation_started(self, file_path: Path) -> None:
+        """Broadcast that documentation generation started for a file."""
         await websocket_manager.broadcast_batch_status(
             EventType.DOC_GENERATION_STARTED,
             f"Starting documentation generation for {file_path.name}",
             {"file_path": str(file_path), "current_file": file_path.name},
         )
 
-        for attempt in range(max_retries + 1):
-            try:
-                start_time = time.time()
+    async def _record_success(self, file_path: Path, output_file: Path, generation_time: float, attempt: int) -> None:
+        """Record a successful generation, broadcast it and notify callbacks."""
+        result = GenerationResult(
+            success=True,
+            file_path=file_path,
+            output_path=output_file,
+            generation_time=generation_time,
+            retry_count=attempt,
+        )
 
-                self.logger.info(f"Generating docs for {file_path.name} (attempt {attempt + 1})")
+        self.stats["files_processed"] += 1
+        self.stats["successful_generations"] += 1
+        if attempt > 0:
+            self.stats["retry_attempts"] += attempt
 
-                # Generate documentation
-                docs, success = self.batch_generator.generate_single_file_docs(file_path)
+        # Clear error tracking for this file
+        self.error_counts.pop(file_path, None)
+        self.last_errors.pop(file_path, None)
 
-                if success:
-                    # Write to output file
-                    output_file = self.config.output_directory / f"{file_path.stem}.md"
-                    output_file.write_text(docs, encoding="utf-8")
+        self.logger.info(f"✅ Generated docs for {file_path.name} in {generation_time:.2f}s")
 
-                    generation_time = time.time() - start_time
+        # Broadcast success event
+        await websocket_manager.broadcast_batch_status(
+            EventType.DOC_GENERATION_COMPLETED,
+            f"Successfully generated documentation for {file_path.name}",
+            {
+                "file_path": str(file_path),
+                "output_path": str(output_file),
+                "generation_time": generation_time,
+                "current_file": file_path.name,
+            },
+        )
 
-                    result = GenerationResult(
-                        success=True,
-                        file_path=file_path,
-                        output_path=output_file,
-                        generation_time=generation_time,
-                        retry_count=attempt,
-                    )
+        # Record result and notify callbacks
+        self.recent_results.append(result)
+        self._notify_callbacks(result)
 
-                    self.stats["files_processed"] += 1
-                    self.stats["successful_generations"] += 1
-                    if attempt > 0:
-                        self.stats["retry_attempts"] += attempt
+    async def _process_single_event(self, event: FileEvent) -> None:
+        """Process a single file event with retry logic."""
+        self._sync_app_source(event)
 
-                    # Clear error tracking for this file
-                    self.error_counts.pop(file_path, None)
-                    self.last_errors.pop(file_path, None)
+        # Broadcast generation started event
+        await self._broadcast_generation_started(event.file_path)
 
-                    self.logger.info(f"✅ Generated docs for {file_path.name} in {generation_time:.2f}s")
+        await self._generate_with_retries(event)
 
-                    # Broadcast success event
-                    await websocket_manager.broadcast_batch_status(
-                        EventType.DOC_GENERATION_COMPLETED,
-                        f"Successfully generated documentation for {file_path.name}",
-                        {
-                            "file_path": str(file_path),
-                            "output_path": str(output_file),
-                            "generation_time": generation_time,
-                            "current_file": file_path.name,
-                        },
-                    )
+    async def _generate_with_retries(self, event: FileEvent) -> None:
+        """Generate documentation for a single file, retrying on failure."""
+        file_path = event.file_path
+        max_retries = self.config.max_retry_attempts
 
-                else:
+        for attempt in range(max_retries + 1):
+            try:
+                start_time = time.time()
+
+                self.logger.info(f"Generating docs for {file_path.name} (attempt {attempt + 1})")
+
+                # Generate documentation
+                docs, success = await self._run_generation(self.batch_generator.generate_single_file_docs, file_path)
+
+                if not success:
                     # Generation failed but no exception
                     raise RuntimeError("Documentation generation returned failure status")
 
-                # Record result and notify callbacks
-                self.recent_results.append(result)
-                self._notify_callbacks(result)
+                # Write to output file
+                output_file = self.config.output_directory / f"{file_path.stem}.md"
+                output_file.write_text(docs, encoding="utf-8")
+
+                await self._record_success(file_path, output_file, time.time() - start_time, attempt)
 
                 return  # Success, exit retry loop
 
@@ -626,6 +777,11 @@ class FileWatcher:
                 except asyncio.QueueEmpty:
                     break
 
+            # Release the generation worker; a new one is created on the next start
+            if self._generation_executor is not None:
+                self._generation_executor.shutdown(wait=False, cancel_futures=True)
+                self._generation_executor = None
+
             self.is_watching = False
 
             uptime = time.time() - self.start_time if self.start_time else 0
@@ -9,14 +9,20 @@ Manages WebSocket connections and provides real-time notifications for:
 
 import json
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 import time
 
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
 import asyncio
 
+# Upper bound in seconds for delivering one broadcast message to a single client
+SEND_TIMEOUT = 5.0
+# Number of clients sent to concurrently before yielding back to the event loop
+BROADCAST_CHUNK_SIZE = 50
+
 
 class EventType(Enum):
     """Types of WebSocket events."""
@@ -53,6 +59,8 @@ class WebSocketEvent:
     event_type: EventType
     data: dict[str, Any]
     timestamp: float | None = None
+    # Serialized payload, built on first send and reused for every client
+    _json: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Set timestamp if not provided."""
@@ -67,6 +75,12 @@ class WebSocketEvent:
             "timestamp": self.timestamp,
         }
 
+    def to_json(self) -> str:
+        """Serialize the event once; broadcasts send the same string to every client."""
+        if self._json is None:
+            self._json = orjson.dumps(self.to_dict(), option=orjson.OPT_NON_STR_KEYS).decode()
+        return self._json
+
 
 class WebSocketManager:
     """
@@ -292,46 +306,80 @@ class WebSocketManager:
         Returns:
             Number of clients that received the event
         """
-        successful_sends = 0
-        failed_connections = set()
+        return await self.broadcast_many([event])
 
-        for websocket in self._connections.copy():
-            try:
-                await self._send_to_client(websocket, event)
-                successful_sends += 1
+    async def broadcast_many(self, events: list[WebSocketEvent]) -> int:
+        """
+        Broadcast events, in order, to all connected clients concurrently.
 
-            except Exception as e:
-                self.logger.warning(f"Failed to send event to WebSocket client: {e}")
-                failed_connections.add(websocket)
-                self.stats["broadcast_errors"] += 1
+        Every client is served by its own task and each send is bounded by
+        SEND_TIMEOUT, so one slow client cannot hold up the others. Clients are
+        served BROADCAST_CHUNK_SIZE at a time with a yield between chunks.
 
-        # Clean up failed connections
+        Args:
+            events: The events to broadcast
+
+        Returns:
+            Number of clients that received every event
+        """
+        if not events:
+            return 0
+
+        connections = list(self._connections)
+        results: list[BaseException | None] = []
+        # Fan out in chunks, yielding to the event loop in between so large broadcasts don't starve HTTP requests
+        for start in range(0, len(connections), BROADCAST_CHUNK_SIZE):
+            if start:
+                await asyncio.sleep(0)
+            chunk = connections[start : start + BROADCAST_CHUNK_SIZE]
+            results.extend(
+                await asyncio.gather(
+                    *(self._send_events(websocket, events) for websocket in chunk), return_exceptions=True
+                )
+            )
+
+        # Collect failed connections from the results and clean them up in one pass
+        failed_connections = []
+        for websocket, result in zip(connections, results):
+            if isinstance(result, BaseException):
+                self.logger.warning(f"Failed to send event to WebSocket client: {result!r}")
+                failed_connections.append(websocket)
+                self.stats["broadcast_errors"] += 1
         for websocket in failed_connections:
             await self.disconnect(websocket)
 
+        successful_sends = len(connections) - len(failed_connections)
         if successful_sends > 0:
-            self.stats["events_sent"] += successful_sends
-            self.logger.debug(f"Broadcast event {event.event_type.value} to {successful_sends} clients")
+            self.stats["events_sent"] += successful_sends * len(events)
+            self.logger.debug(
+                f"Broadcast {', '.join(event.event_type.value for event in events)} to {successful_sends} clients"
+            )
 
-        # Increment event count for each broadcast (regardless of successful sends)
-        self._event_count += 1
+        # Increment event count for each broadcast event (regardless of successful sends)
+        self._event_count += len(events)
 
         # Also publish to SSE subscribers regardless of WebSocket clients
-        try:
-            await self._sse_broker.publish(event.to_dict())
-        except Exception as e:
-            self.logger.warning(f"Failed to publish event to SSE broker: {e}")
-            self.stats["broadcast_errors"] += 1
-
-            # Detect fail-fast condition: no WebSocket clients AND SSE failure
-            if successful_sends == 0:
-                self.logger.error(
-                    f"Critical broadcast failure: No WebSocket clients connected AND SSE publish failed. "
-                    f"Event {event.event_type.value} could not be delivered to any subscribers. Error: {e}"
-                )
+        for event in events:
+            try:
+                await self._sse_broker.publish(event.to_dict())
+            except Exception as e:
+                self.logger.warning(f"Failed to publish event to SSE broker: {e}")
+                self.stats["broadcast_errors"] += 1
+
+                # Detect fail-fast condition: no WebSocket clients AND SSE failure
+                if successful_sends == 0:
+                    self.logger.error(
+                        f"Critical broadcast failure: No WebSocket clients connected AND SSE publish failed. "
+                        f"Event {event.event_type.value} could not be delivered to any subscribers. Error: {e}"
+                    )
 
         return successful_sends
 
+    async def _send_events(self, websocket: WebSocket, events: list[WebSocketEvent]) -> None:
+        """Send events to one client in order, failing if any single send exceeds SEND_TIMEOUT."""
+        for event in events:
+            await asyncio.wait_for(self._send_to_client(websocket, event), timeout=SEND_TIMEOUT)
+
     async def _send_to_client(self, websocket: WebSocket, event: WebSocketEvent) -> None:
         """
         Send an event to a specific WebSocket client.
@@ -341,8 +389,7 @@ class WebSocketManager:
             event: The event to send
         """
         try:
-            message = json.dumps(event.to_dict())
-            await websocket.send_text(message)
+            await websocket.send_text(event.to_json())
 
         except WebSocketDisconnect:
             # Client disconnected, this is normal